@@ -1,17 +1,34 @@
-from flask import Flask, render_template, jsonify, send_file, request
+from flask import Flask, Response, g, render_template, jsonify, send_file, request
 from flask_cors import CORS
-import feedparser
-import requests
-from transformers import pipeline
-from TTS.api import TTS
 import os
 import hashlib
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import partial
 import threading
 import time
 import logging
 from config import config
+from feeds import FeedFetcher
+from feed_schedule import FeedScheduler
+from article_bodies import BodyFetcher
+from refresher import NewsRefresher
+from summary_cache import SummaryCache, summary_key
+from summarization import BatchSummarizer, strip_html
+from models import default_registry
+from model_server import ModelClient, RemoteScheduler, RemoteSummarizer, RemoteTTS
+from audio_stream import render_wav, stream_tts
+from audio_formats import AUDIO_FORMATS, negotiate_format, transcode
+from bulletin import BulletinBuilder, bulletin_name
+from prerender import PrerenderQueue
+from scheduler import InferenceScheduler, QueueFull
+from singleflight import SingleFlight, StreamFlight
+from events import EventHub
+from audio_cache import AudioCache
+from dedup import cluster_articles
+from article_store import ArticleStore
+import metrics
+from news_index import NewsIndex, CompressedBodyCache, choose_encoding, dumps, make_etag, parse_since
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -24,88 +41,142 @@ CORS(app)
 config_name = os.environ.get('FLASK_CONFIG', 'default')
 app.config.from_object(config[config_name])
 config[config_name].init_app(app)
+metrics.REGISTRY.configure(app.config['METRICS_ENABLED'], app.config['METRICS_DIR'],
+                           app.config['METRICS_FLUSH_INTERVAL'])
 
-# Initialize models
+# Initialize models (loaded lazily through the registry; see initialize_models)
+model_registry = default_registry(app.config)
 summarizer = None
+summarizer_model_name = None
 tts_model = None
+voice_bank = None
+model_server_models = None  # per-model status reported by the model server
 model_loading_status = {'summarizer': False, 'tts': False}
 
+# Shared feed fetcher (pooled HTTP session + conditional GET state), polling each feed on its own schedule
+feed_fetcher = FeedFetcher(
+    timeout=app.config['FEED_TIMEOUT'],
+    max_workers=app.config['FEED_MAX_WORKERS'],
+    schedule=FeedScheduler(
+        initial_interval=app.config['NEWS_REFRESH_INTERVAL'],
+        min_interval=app.config['FEED_MIN_INTERVAL'],
+        max_interval=app.config['FEED_MAX_INTERVAL'],
+        backoff_base=app.config['FEED_BACKOFF_BASE'],
+        max_backoff=app.config['FEED_MAX_BACKOFF'],
+        breaker_threshold=app.config['FEED_BREAKER_THRESHOLD'],
+        breaker_cooldown=app.config['FEED_BREAKER_COOLDOWN']
+    )
+)
+
+model_client = ModelClient(app.config['MODEL_SERVER_SOCKET'], app.config['SECRET_KEY'].encode())
+
+# Every model call runs here, most urgent job class first, so a burst of audio requests
+# cannot take all the cores from request handling. With the model server the scheduler
+# lives there, and admission and priority span every worker on the host.
+if app.config['MODEL_SERVER_ENABLED']:
+    inference_scheduler = RemoteScheduler(model_client)
+else:
+    inference_scheduler = InferenceScheduler(
+        workers=app.config['INFERENCE_WORKERS'],
+        queue_limits={
+            'interactive': app.config['INFERENCE_QUEUE_INTERACTIVE'],
+            'summarize': app.config['INFERENCE_QUEUE_SUMMARIZE'],
+            'prerender': app.config['INFERENCE_QUEUE_PRERENDER']
+        }
+    )
+
+# Concurrent identical summary/audio requests share one computation
+summary_flight = SingleFlight()
+audio_flight = SingleFlight()
+# Concurrent listeners of the same streamed render share one synthesis
+audio_streams = StreamFlight()
+
+# Byte budget and LRU eviction over static/audio, enforced host-wide
+audio_cache = AudioCache(
+    app.config['AUDIO_FOLDER'],
+    app.config['AUDIO_CACHE_INDEX_PATH'],
+    max_bytes=app.config['AUDIO_CACHE_MAX_MB'] * 1024 * 1024,
+    max_age_hours=app.config['CACHE_CLEANUP_HOURS'],
+    compact_interval=app.config['AUDIO_CACHE_COMPACT_INTERVAL']
+)
+
+# Persistent summary cache shared by every worker on this host
+summary_cache = SummaryCache(
+    app.config['SUMMARY_CACHE_PATH'],
+    max_entries=app.config['SUMMARY_CACHE_MAX_ENTRIES'],
+    ttl_hours=app.config['SUMMARY_CACHE_TTL_HOURS']
+) if app.config['SUMMARY_CACHE_ENABLED'] else None
+
 def initialize_models():
-    """Initialize AI models in a separate thread to avoid blocking startup"""
-    global summarizer, tts_model, model_loading_status
+    """Warm-up hook: load AI models in a separate thread to avoid blocking startup"""
+    global summarizer, summarizer_model_name, tts_model, voice_bank, model_loading_status
     
-    logger.info("Initializing summarization model...")
-    try:
-        summarizer = pipeline(
-            "summarization", 
-            model=app.config['SUMMARIZATION_MODEL'],
-            max_length=app.config['SUMMARY_MAX_LENGTH'],
-            min_length=app.config['SUMMARY_MIN_LENGTH'],
-            do_sample=False
-        )
-        model_loading_status['summarizer'] = True
-        logger.info("Summarization model loaded successfully!")
-    except Exception as e:
-        logger.error(f"Error loading primary summarization model: {e}")
-        try:
-            # Fallback to simpler model
-            summarizer = pipeline("summarization", model=app.config['SUMMARIZATION_FALLBACK'])
-            model_loading_status['summarizer'] = True
-            logger.info("Fallback summarization model loaded!")
-        except Exception as e2:
-            logger.error(f"Failed to load fallback summarization model: {e2}")
+    if app.config['MODEL_SERVER_ENABLED']:
+        connect_model_server()
+    else:
+        summarizer = model_registry.get('summarizer')
+        summarizer_model_name = model_registry.model_name('summarizer')
+        model_loading_status['summarizer'] = summarizer is not None
+        publish_model_status()
+        
+        tts_model = model_registry.get('tts')
+        # Speaker latents for every voice are computed (or read from disk) before TTS is reported ready
+        voice_bank = model_registry.get('voices')
+        model_loading_status['tts'] = tts_model is not None
+        publish_model_status()
     
-    logger.info("Initializing TTS model...")
-    try:
-        tts_model = TTS(model_name=app.config['TTS_MODEL_PRIMARY'])
-        model_loading_status['tts'] = True
-        logger.info("TTS model loaded successfully!")
-    except Exception as e:
-        logger.error(f"Error loading primary TTS model: {e}")
+    # Rebuild the news snapshot now that real summaries are available
+    if model_loading_status['summarizer']:
+        news_refresher.trigger()
+
+def connect_model_server():
+    """Use the shared model server instead of loading models in this worker"""
+    global summarizer, summarizer_model_name, tts_model, model_server_models
+    
+    deadline = time.time() + app.config['MODEL_LOADING_TIMEOUT']
+    logger.info(f"Waiting for model server at {app.config['MODEL_SERVER_SOCKET']}...")
+    
+    while time.time() < deadline:
         try:
-            # Fallback to simpler TTS
-            tts_model = TTS(model_name=app.config['TTS_MODEL_FALLBACK'])
+            status = model_client.status()
+        except Exception as e:
+            logger.debug(f"Model server not reachable yet: {e}")
+            time.sleep(2)
+            continue
+        
+        if status['summarizer'] and not summarizer:
+            summarizer_model_name = status['summarizer_model']
+            summarizer = RemoteSummarizer(model_client, status['summarizer_max_tokens'])
+            model_loading_status['summarizer'] = True
+            publish_model_status()
+        if status['tts'] and not tts_model:
+            tts_model = RemoteTTS(model_client)
             model_loading_status['tts'] = True
-            logger.info("Fallback TTS model loaded!")
-        except Exception as e2:
-            logger.error(f"Failed to load fallback TTS model: {e2}")
-
-def cleanup_old_audio_files():
-    """Clean up old audio files to save disk space"""
-    if not app.config['AUDIO_CACHE_ENABLED']:
-        return
+            publish_model_status()
         
-    try:
-        audio_dir = app.config['AUDIO_FOLDER']
-        if not os.path.exists(audio_dir):
+        if not status['loading']:
+            model_server_models = status['models']
+            logger.info(f"Connected to model server (pid {status['pid']})")
             return
-            
-        cutoff_time = datetime.now() - timedelta(hours=app.config['CACHE_CLEANUP_HOURS'])
-        
-        for filename in os.listdir(audio_dir):
-            filepath = os.path.join(audio_dir, filename)
-            if os.path.isfile(filepath):
-                file_time = datetime.fromtimestamp(os.path.getctime(filepath))
-                if file_time < cutoff_time:
-                    os.remove(filepath)
-                    logger.info(f"Cleaned up old audio file: {filename}")
-    except Exception as e:
-        logger.error(f"Error during audio cleanup: {e}")
+        time.sleep(2)
+    
+    logger.error("Timed out waiting for the model server")
 
 def fetch_news():
-    """Fetch news from multiple RSS feeds"""
+    """Fetch news from the RSS feeds that are due (the others contribute their last good copy)"""
     all_articles = []
     
-    for feed_url in app.config['RSS_FEEDS']:
+    for feed_url, feed in feed_fetcher.poll(app.config['RSS_FEEDS']):
+        if feed is None:
+            continue
+        
+        if feed.bozo:
+            logger.warning(f"Feed parsing warning for {feed_url}: {feed.bozo_exception}")
+        
         try:
-            logger.info(f"Fetching from: {feed_url}")
-            feed = feedparser.parse(feed_url)
-            
-            if feed.bozo:
-                logger.warning(f"Feed parsing warning for {feed_url}: {feed.bozo_exception}")
-            
             for entry in feed.entries[:app.config['ARTICLES_PER_FEED']]:
                 article = {
+                    'guid': getattr(entry, 'id', entry.link),
                     'title': entry.title,
                     'summary': getattr(entry, 'summary', entry.title),
                     'link': entry.link,
@@ -115,88 +186,438 @@ def fetch_news():
                 }
                 all_articles.append(article)
         except Exception as e:
-            logger.error(f"Error fetching from {feed_url}: {e}")
+            logger.error(f"Error reading entries from {feed_url}: {e}")
     
     logger.info(f"Fetched {len(all_articles)} articles total")
     return all_articles
 
-def summarize_text(text, max_length=None):
-    """Summarize text using Hugging Face model"""
+def truncate_text(text):
+    """Fallback summary used when the model is unavailable or fails"""
+    text = strip_html(text)
+    return text[:200] + "..." if len(text) > 200 else text
+
+def summarize_texts(texts, max_length=None, fallback=truncate_text):
+    """Summarize a list of texts in batches, returning summaries in input order.
+
+    Texts the model could not summarize get fallback(text), or None when fallback is None.
+    """
     if not summarizer:
-        return text[:200] + "..." if len(text) > 200 else text
+        return [fallback(text) if fallback else None for text in texts]
     
     max_length = max_length or app.config['SUMMARY_MAX_LENGTH']
+    min_length = app.config['SUMMARY_MIN_LENGTH']
+    results = [None] * len(texts)
     
     try:
-        # Clean and prepare text
-        text = text.strip()
-        if len(text) < 50:
-            return text
-        
-        # Summarize
-        summary = summarizer(
-            text, 
-            max_length=max_length, 
-            min_length=app.config['SUMMARY_MIN_LENGTH'], 
-            do_sample=False
-        )
-        return summary[0]['summary_text']
+        # Cleaned text -> (cache key, positions still needing the model)
+        pending = {}
+        for i, text in enumerate(texts):
+            text = strip_html(text)
+            if len(text) < 50:
+                results[i] = text
+                continue
+            
+            key = summary_key(text, summarizer_model_name, min_length, max_length, app.config['SUMMARY_CHUNK_TOKENS'])
+            
+            # Check the persistent cache before running the model
+            if summary_cache:
+                cached = summary_cache.get(key)
+                if cached is not None:
+                    results[i] = cached
+                    continue
+            
+            pending.setdefault(text, (key, []))[1].append(i)
+        
+        # Texts another thread is already summarizing are awaited, not recomputed
+        owned = {}
+        followed = []
+        for text, (key, positions) in pending.items():
+            call, leader = summary_flight.begin(key)
+            if leader:
+                owned[text] = key
+            else:
+                followed.append((call, positions))
+        
+        summaries = [None] * len(owned)
+        try:
+            if owned:
+                batcher = BatchSummarizer(summarizer, app.config['SUMMARY_BATCH_SIZE'],
+                                          app.config['SUMMARY_CHUNK_TOKENS'],
+                                          schedule=partial(inference_scheduler.run, 'summarize'))
+                # Background work waits for a slot rather than falling back to truncation
+                with inference_scheduler.admit('summarize', block=True):
+                    summaries = batcher.summarize(list(owned), max_length, min_length)
+        finally:
+            # Failures are shared as None, so every caller applies its own fallback
+            for (text, key), summary in zip(owned.items(), summaries):
+                if summary is not None and summary_cache:
+                    summary_cache.put(key, summarizer_model_name, summary)
+                summary_flight.finish(key, result=summary)
+                for i in pending[text][1]:
+                    results[i] = summary
+        
+        for call, positions in followed:
+            summary = call.wait()
+            for i in positions:
+                results[i] = summary
     except Exception as e:
         logger.error(f"Error in summarization: {e}")
-        return text[:200] + "..." if len(text) > 200 else text
+    
+    if fallback is None:
+        return results
+    return [result if result is not None else fallback(text) for result, text in zip(results, texts)]
 
-def generate_audio(text, voice_style="default"):
-    """Generate audio from text using TTS"""
+def summarize_text(text, max_length=None):
+    """Summarize text using Hugging Face model"""
+    return summarize_texts([text], max_length)[0]
+
+def prepare_audio_text(text):
+    """Apply the same length limit as /api/audio so prerendered files hit the cache"""
+    if len(text) > 1000:  # Limit text length
+        text = text[:1000] + "..."
+    return text
+
+def audio_cache_path(text, voice_style):
+    """Cache location of the WAV for this text and voice"""
+    text_hash = hashlib.md5(text.encode()).hexdigest()
+    return os.path.join(app.config['AUDIO_FOLDER'], f"{text_hash}_{voice_style}.wav")
+
+def generate_audio(text, voice_style="default", job_class='interactive'):
+    """Generate audio from text using TTS (raises QueueFull when the job class is saturated)"""
     if not tts_model:
         logger.warning("TTS model not available")
         return None
     
     try:
         # Generate unique filename
-        text_hash = hashlib.md5(text.encode()).hexdigest()
-        audio_file = os.path.join(app.config['AUDIO_FOLDER'], f"{text_hash}_{voice_style}.wav")
+        audio_file = audio_cache_path(text, voice_style)
         
         # Check if audio already exists and caching is enabled
-        if app.config['AUDIO_CACHE_ENABLED'] and os.path.exists(audio_file):
+        if app.config['AUDIO_CACHE_ENABLED'] and audio_cache.lookup(audio_file):
             logger.info(f"Using cached audio: {audio_file}")
             return audio_file
         
-        # Generate audio
-        logger.info(f"Generating audio for voice style: {voice_style}")
-        tts_model.tts_to_file(
-            text=text,
-            file_path=audio_file
-        )
+        # A listener is already streaming this render: wait for it to finish rather than synthesize twice
+        streaming = audio_streams.follow(audio_file)
+        if streaming is not None:
+            try:
+                for _ in streaming:
+                    pass
+            except Exception as e:
+                logger.warning(f"In-flight audio stream failed, rendering again: {e}")
+            if os.path.exists(audio_file):
+                return audio_file
         
-        logger.info(f"Audio generated: {audio_file}")
-        return audio_file
+        # Concurrent requests for the same text and voice wait on one synthesis
+        return audio_flight.do(audio_file, render_audio_file, text, voice_style, audio_file, job_class)
+    except QueueFull:
+        raise
     except Exception as e:
         logger.error(f"Error generating audio: {e}")
         return None
 
+def render_audio_file(text, voice_style, audio_file, job_class='interactive'):
+    """Synthesize to a temp file and atomically rename it, so readers never see a partial WAV"""
+    # Admitted once per render; its sentences then queue behind more urgent work
+    with inference_scheduler.admit(job_class):
+        logger.info(f"Generating audio for voice style: {voice_style}")
+        render_wav(tts_model, text, audio_file, voice_style, voice_bank,
+                   schedule=partial(inference_scheduler.run, job_class))
+    audio_cache.add(audio_file)
+    
+    logger.info(f"Audio generated: {audio_file}")
+    return audio_file
+
+def record_article_audio(article_id, voice_style, audio_file):
+    """Remember a finished cache file as the article's audio in this voice"""
+    if audio_file and os.path.exists(audio_file):
+        article_store.record_audio(article_id, voice_style, audio_file)
+
+# Multi-story bulletins stitched from the per-article audio files
+bulletin_builder = BulletinBuilder(
+    app.config['AUDIO_FOLDER'],
+    segment_path=audio_cache_path,
+    render_segment=generate_audio,
+    on_written=audio_cache.add,
+    discard=audio_cache.discard,
+    intro_sting=app.config['BULLETIN_INTRO_STING'],
+    transition_sting=app.config['BULLETIN_TRANSITION_STING'],
+    max_workers=app.config['BULLETIN_RENDER_WORKERS']
+)
+
 @app.route('/')
 def index():
     """Main page"""
     return render_template('index.html')
 
+# Every processed article, kept across polls (and restarts) for incremental summarization and search
+article_store = ArticleStore(app.config['ARTICLE_STORE_PATH'], retention_days=app.config['ARTICLE_STORE_RETENTION_DAYS'])
+
+# Optional full-text stage: fetch each article's page so the summarizer sees more than the teaser
+body_fetcher = BodyFetcher(
+    app.config['ARTICLE_BODY_CACHE_PATH'],
+    timeout=app.config['ARTICLE_BODY_TIMEOUT'],
+    max_workers=app.config['ARTICLE_BODY_MAX_WORKERS'],
+    per_host=app.config['ARTICLE_BODY_PER_HOST'],
+    refetch_hours=app.config['ARTICLE_BODY_REFETCH_HOURS'],
+    max_chars=app.config['ARTICLE_BODY_MAX_CHARS']
+) if app.config['ARTICLE_BODY_ENABLED'] else None
+
+def build_articles():
+    """Fetch and summarize the current article set (runs in the background refresher)"""
+    articles = fetch_news()
+    
+    # Merge the same story from different feeds so it is only summarized and voiced once
+    if app.config['DEDUP_ENABLED']:
+        fetched = len(articles)
+        articles = cluster_articles(articles, app.config['DEDUP_SIMILARITY'])
+        logger.info(f"Deduplicated {fetched} articles into {len(articles)} stories")
+    
+    if body_fetcher:
+        body_fetcher.fetch_all(articles)
+    
+    for article in articles:
+        article['id'] = hashlib.md5(article['title'].encode()).hexdigest()
+    
+    # Only new or changed articles go through the summarizer (in one batched pass); truncation
+    # fallbacks are stored without a model, so they are summarized again on the next cycle.
+    # Changing the summary lengths or chunk size counts as a change too.
+    settings = (app.config['SUMMARY_MIN_LENGTH'], app.config['SUMMARY_MAX_LENGTH'], app.config['SUMMARY_CHUNK_TOKENS'])
+    article_store.sync(articles, partial(summarize_texts, fallback=None), model=summarizer_model_name,
+                       fallback=truncate_text, settings=settings)
+    
+    return articles
+
+def refresh_details():
+    """Refresher state the other workers report in /api/status"""
+    return {
+        'feeds': feed_fetcher.health(app.config['RSS_FEEDS']),
+        'store_cycles': {key: value for key, value in article_store.stats().items() if key in ('last_cycle', 'totals')},
+        'bodies': body_fetcher.stats() if body_fetcher else None
+    }
+
+# One worker per host polls, summarizes and stores; the others follow the snapshot it shares
+news_refresher = NewsRefresher(build_articles, app.config['NEWS_REFRESH_INTERVAL'], build_index=NewsIndex,
+                               next_refresh=lambda: feed_fetcher.due_in(app.config['RSS_FEEDS']),
+                               lock_path=os.path.join(app.config['CACHE_FOLDER'], 'refresher.lock'),
+                               shared_path=os.path.join(app.config['CACHE_FOLDER'], 'news_snapshot.json'),
+                               details=refresh_details)
+compressed_bodies = CompressedBodyCache()
+
+# Background audio pre-rendering for the newest articles
+prerender_queue = PrerenderQueue(
+    render=partial(generate_audio, job_class='prerender'),
+    is_cached=lambda text, voice: audio_cache.contains(audio_cache_path(text, voice)),
+    lock_path=os.path.join(app.config['CACHE_FOLDER'], 'prerender.lock'),
+    state_path=app.config['PRERENDER_STATE_PATH'],
+    top_articles=app.config['PRERENDER_TOP_ARTICLES'],
+    top_voices=app.config['PRERENDER_TOP_VOICES'],
+    cpu_budget=app.config['PRERENDER_CPU_BUDGET'],
+    on_rendered=record_article_audio
+)
+prerender_enabled = app.config['PRERENDER_ENABLED'] and app.config['AUDIO_CACHE_ENABLED']
+
+def schedule_prerender(snapshot):
+    """Queue audio for the new snapshot once the TTS model is available"""
+    if model_loading_status['tts']:
+        prerender_queue.schedule(snapshot.articles, prepare_audio_text)
+
+if prerender_enabled:
+    news_refresher.add_listener(schedule_prerender)
+
+# Server-sent events for /api/stream
+event_hub = EventHub(history=app.config['SSE_HISTORY'], heartbeat=app.config['SSE_HEARTBEAT'])
+published_articles = {}  # article id -> lean JSON last announced to clients
+announced_audio = set()  # (article id, voice) already announced as ready
+
+def model_status():
+    return {
+        'summarizer_loaded': model_loading_status['summarizer'],
+        'tts_loaded': model_loading_status['tts'],
+        'models_ready': all(model_loading_status.values())
+    }
+
+def publish_model_status():
+    event_hub.publish('models', model_status())
+
+def publish_news_delta(snapshot):
+    """Announce the articles a new snapshot added, changed or dropped, reusing its pre-encoded JSON"""
+    global published_articles
+    current = {article['id']: snapshot.index.lean[position] for position, article in enumerate(snapshot.articles)}
+    added = [encoded for article_id, encoded in current.items() if article_id not in published_articles]
+    updated = [encoded for article_id, encoded in current.items()
+               if article_id in published_articles and published_articles[article_id] != encoded]
+    removed = [article_id for article_id in published_articles if article_id not in current]
+    published_articles = current
+    
+    if added or updated or removed:
+        event_hub.publish('articles', b''.join([
+            b'{"generation":', str(snapshot.generation).encode(),
+            b',"added":[', b','.join(added), b'],"updated":[', b','.join(updated),
+            b'],"removed":', dumps(removed), b'}'
+        ]))
+
+news_refresher.add_listener(publish_news_delta)
+
+def ready_audio():
+    """(article id, voice) pairs among the prerender targets whose audio is already cached"""
+    return {(article_id, voice) for article_id, text, voice in prerender_queue.targets
+            if audio_cache.contains(audio_cache_path(text, voice))}
+
+def watch_audio():
+    """Announce prerendered audio as it lands on disk, whichever worker rendered it"""
+    global announced_audio
+    while True:
+        time.sleep(app.config['SSE_AUDIO_POLL_INTERVAL'])
+        if not event_hub.clients:
+            continue
+        try:
+            ready = ready_audio()
+            for article_id, voice in sorted(ready - announced_audio):
+                event_hub.publish('audio', {'id': article_id, 'voice': voice})
+            announced_audio = ready
+        except Exception as e:
+            logger.error(f"Error checking prerendered audio: {e}")
+
+background_lock = threading.Lock()
+background_started = False
+
+def start_background_services():
+    """Start model loading and the news refresher once per process (unless disabled, e.g. for benchmarks)"""
+    global background_started
+    
+    with background_lock:
+        if background_started or not app.config['BACKGROUND_SERVICES_ENABLED']:
+            return
+        background_started = True
+    
+    # Initialize models in background
+    model_thread = threading.Thread(target=initialize_models)
+    model_thread.daemon = True
+    model_thread.start()
+    
+    inference_scheduler.start()
+    news_refresher.start()
+    metrics.REGISTRY.start()
+    
+    if app.config['AUDIO_CACHE_ENABLED']:
+        audio_cache.start()
+    
+    if prerender_enabled:
+        prerender_queue.start()
+        threading.Thread(target=watch_audio, name='audio-ready-events', daemon=True).start()
+
+@app.before_request
+def ensure_background_services():
+    """Gunicorn workers never run __main__, so start services on their first request"""
+    start_background_services()
+    if metrics.REGISTRY.enabled:
+        g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Per-route latency (time to the first byte for streamed responses)"""
+    started = g.get('request_started')
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, route, request.method, response.status_code)
+    return response
+
+def model_load_seconds():
+    models = model_server_models if app.config['MODEL_SERVER_ENABLED'] else model_registry.status()
+    return {(name,): model['load_seconds'] for name, model in (models or {}).items()}
+
+def cache_counter(cache, name):
+    """Scrape-time reader for a summary/audio cache's hit or miss counter (no stats() query)"""
+    return lambda: getattr(cache, name) if cache else None
+
+def cache_hit_ratio(name):
+    """Hit ratio from the host-wide hit and miss counters"""
+    def ratio():
+        hits = metrics.REGISTRY.total(f'newsbreeze_{name}_cache_hits_total') or 0
+        lookups = hits + (metrics.REGISTRY.total(f'newsbreeze_{name}_cache_misses_total') or 0)
+        return round(hits / lookups, 3) if lookups else None
+    return ratio
+
+metrics.CallbackMetric(metrics.REGISTRY, 'newsbreeze_model_load_seconds', 'Model load duration',
+                       model_load_seconds, ['model'])
+
+def feed_health(key):
+    """Scrape-time reader for one per-feed health field, as reported by the worker that polls the feeds"""
+    return lambda: {(url,): feed[key] for url, feed in (news_refresher.details or {}).get('feeds', {}).items()}
+
+metrics.CallbackMetric(metrics.REGISTRY, 'newsbreeze_feed_poll_interval_seconds', 'Current polling interval per feed',
+                       feed_health('interval'), ['feed'])
+metrics.CallbackMetric(metrics.REGISTRY, 'newsbreeze_feed_consecutive_failures', 'Consecutive failed polls per feed',
+                       feed_health('consecutive_failures'), ['feed'])
+metrics.CallbackMetric(metrics.REGISTRY, 'newsbreeze_inference_queue_depth', 'Inference jobs waiting per job class',
+                       lambda: {(job_class,): queue['depth']
+                                for job_class, queue in inference_scheduler.stats()['queues'].items()}, ['job'])
+for name, cache in (('summary', summary_cache), ('audio', audio_cache)):
+    metrics.CallbackMetric(metrics.REGISTRY, f'newsbreeze_{name}_cache_hits_total', f'{name.title()} cache hits',
+                           cache_counter(cache, 'hits'), kind='counter', shared=True)
+    metrics.CallbackMetric(metrics.REGISTRY, f'newsbreeze_{name}_cache_misses_total', f'{name.title()} cache misses',
+                           cache_counter(cache, 'misses'), kind='counter', shared=True)
+    metrics.CallbackMetric(metrics.REGISTRY, f'newsbreeze_{name}_cache_hit_ratio',
+                           f'{name.title()} cache hit ratio since start', cache_hit_ratio(name))
+
 @app.route('/api/news')
 def get_news():
-    """API endpoint to get summarized news"""
+    """API endpoint to get the latest precomputed news snapshot (paginated and filterable)"""
     try:
-        articles = fetch_news()
+        snapshot = news_refresher.snapshot
+        if not snapshot.generation:
+            # Only the very first requests after startup wait for a snapshot
+            news_refresher.wait_ready(app.config['NEWS_SNAPSHOT_WAIT'])
+            snapshot = news_refresher.snapshot
         
-        # Summarize articles
-        for article in articles:
-            original_summary = article['summary']
-            article['ai_summary'] = summarize_text(original_summary)
-            article['id'] = hashlib.md5(article['title'].encode()).hexdigest()
+        limit = min(request.args.get('limit', app.config['NEWS_PAGE_SIZE'], type=int), app.config['NEWS_MAX_PAGE_SIZE'])
+        cursor = request.args.get('cursor')
+        source = request.args.get('source')
+        since = request.args.get('since')
+        full = request.args.get('full', '').lower() in ('1', 'true')
         
-        return jsonify({
+        try:
+            since_ts = parse_since(since) if since else None
+            positions, total, next_cursor = snapshot.index.query(max(limit, 1), cursor, source, since_ts)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': f"Invalid query: {e}"}), 400
+        
+        # Bodies depend only on the snapshot and the query, so the ETag can be strong;
+        # each content-coding is its own representation and gets its own tag
+        etag = make_etag(snapshot.generation, snapshot.built_at, limit, cursor, source and source.lower(), since_ts, full)
+        headers = {
+            'Cache-Control': 'no-cache',
+            'X-Snapshot-Age': str(news_refresher.snapshot_age(snapshot) or 0),
+            'Vary': 'Accept-Encoding'
+        }
+        
+        envelope = dumps({
             'success': True,
-            'articles': articles,
-            'timestamp': datetime.now().isoformat(),
-            'total_articles': len(articles)
+            'generated_at': snapshot.timestamp,
+            'generation': snapshot.generation,
+            'total_articles': total,
+            'next_cursor': next_cursor
         })
+        body = envelope[:-1] + b',"articles":' + snapshot.index.encode_page(positions, full) + b'}'
+        
+        encoding = choose_encoding(request.accept_encodings)
+        if not (encoding and len(body) >= app.config['NEWS_COMPRESS_MIN_BYTES']):
+            encoding = None
+        representation_etag = f"{etag}-{encoding}" if encoding else etag
+        
+        if request.if_none_match.contains(representation_etag):
+            response = app.response_class(status=304, headers=headers)
+            response.set_etag(representation_etag)
+            return response
+        
+        if encoding:
+            body = compressed_bodies.get(etag, encoding, body)
+            headers['Content-Encoding'] = encoding
+        
+        response = app.response_class(body, mimetype='application/json', headers=headers)
+        response.set_etag(representation_etag)
+        return response
     except Exception as e:
         logger.error(f"Error in get_news: {e}")
         return jsonify({
@@ -204,6 +625,51 @@ def get_news():
             'error': str(e)
         }), 500
 
+@app.route('/api/search')
+def search_articles():
+    """Full-text search over the article history (title, AI summary and feed summary)"""
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'success': False, 'error': 'No query provided'}), 400
+        
+        limit = min(request.args.get('limit', app.config['NEWS_PAGE_SIZE'], type=int), app.config['NEWS_MAX_PAGE_SIZE'])
+        since = request.args.get('since')
+        try:
+            since_ts = parse_since(since) if since else None
+        except ValueError as e:
+            return jsonify({'success': False, 'error': f"Invalid query: {e}"}), 400
+        
+        results = article_store.search(query, max(limit, 1), request.args.get('source'), since_ts)
+        return jsonify({
+            'success': True,
+            'query': query,
+            'total_results': len(results),
+            'articles': results
+        })
+    except Exception as e:
+        logger.error(f"Error in search_articles: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/stream')
+def stream_events():
+    """Server-sent events: article deltas, model readiness and prerendered audio"""
+    snapshot = news_refresher.snapshot
+    hello = {
+        'generation': snapshot.generation,
+        'models': model_status(),
+        'audio': [{'id': article_id, 'voice': voice} for article_id, voice in sorted(ready_audio())]
+    }
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    
+    response = Response(event_hub.stream(last_event_id, hello), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # don't let a proxy buffer the stream
+    return response
+
 @app.route('/api/audio/<article_id>')
 def get_audio(article_id):
     """Generate and serve audio for an article"""
@@ -213,36 +679,213 @@ def get_audio(article_id):
         
         if not text:
             return jsonify({'error': 'No text provided'}), 400
+        if voice_style not in app.config['CELEBRITY_VOICES']:
+            return jsonify({'error': f'Unknown voice: {voice_style}'}), 400
+        
+        text = prepare_audio_text(text)
+        prerender_queue.record_request(voice_style)
         
-        if len(text) > 1000:  # Limit text length
-            text = text[:1000] + "..."
+        audio_format = negotiate_format(request.args.get('format'), request.accept_mimetypes,
+                                        app.config['AUDIO_DEFAULT_FORMAT'])
         
-        audio_file = generate_audio(text, voice_style)
+        if request.args.get('stream', '').lower() in ('1', 'true'):
+            return stream_audio(article_id, text, voice_style, audio_format)
+        
+        with prerender_queue.interactive():
+            audio_file = generate_audio(text, voice_style)
+            
+            # Another worker may have evicted the file since it was looked up
+            if audio_file and not os.path.exists(audio_file):
+                audio_cache.discard(audio_file)
+                audio_file = generate_audio(text, voice_style)
         
         if audio_file and os.path.exists(audio_file):
-            return send_file(audio_file, mimetype='audio/wav')
+            record_article_audio(article_id, voice_style, audio_file)
+            return send_audio_file(audio_file, audio_format)
         else:
             return jsonify({'error': 'Audio generation failed'}), 500
     
+    except QueueFull as e:
+        return busy_response(e)
     except Exception as e:
         logger.error(f"Error in get_audio: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/bulletin')
+def get_bulletin():
+    """One continuous audio bulletin of the top stories in a voice"""
+    try:
+        voice_style = request.args.get('voice', 'default')
+        if voice_style not in app.config['CELEBRITY_VOICES']:
+            return jsonify({'error': f'Unknown voice: {voice_style}'}), 400
+        
+        snapshot = news_refresher.snapshot
+        if not snapshot.generation:
+            news_refresher.wait_ready(app.config['NEWS_SNAPSHOT_WAIT'])
+            snapshot = news_refresher.snapshot
+        
+        limit = min(request.args.get('limit', app.config['BULLETIN_ARTICLES'], type=int), app.config['BULLETIN_MAX_ARTICLES'])
+        positions, _, _ = snapshot.index.query(max(limit, 1), None, None, None)
+        articles = [snapshot.articles[position] for position in positions]
+        texts = [prepare_audio_text(article['ai_summary']) for article in articles]
+        if not texts:
+            return jsonify({'error': 'No news available yet'}), 503
+        
+        prerender_queue.record_request(voice_style)
+        audio_format = negotiate_format(request.args.get('format'), request.accept_mimetypes,
+                                        app.config['AUDIO_DEFAULT_FORMAT'])
+        
+        with prerender_queue.interactive():
+            bulletin_file, segments = build_bulletin(texts, voice_style)
+        if not bulletin_file:
+            return jsonify({'error': 'Audio generation failed'}), 500
+        for article, text in zip(articles, texts):
+            record_article_audio(article['id'], voice_style, audio_cache_path(text, voice_style))
+        
+        response = send_audio_file(bulletin_file, audio_format)
+        response.headers['X-Bulletin-Segments'] = str(len(segments))
+        return response
+    
+    except QueueFull as e:
+        return busy_response(e)
+    except Exception as e:
+        logger.error(f"Error in get_bulletin: {e}")
+        return jsonify({'error': str(e)}), 500
+
+def build_bulletin(texts, voice_style):
+    """(bulletin path, segment paths), or (None, segments) when no audio could be produced"""
+    is_cached = lambda path: app.config['AUDIO_CACHE_ENABLED'] and audio_cache.lookup(path)
+    
+    # Another worker may evict a segment or the bulletin between lookup and use; rebuild once if so
+    for attempt in range(2):
+        segments = bulletin_builder.segments(texts, voice_style, is_cached)
+        if not segments:
+            return None, segments
+        
+        # Keyed by the ordered segments: repeat listeners get the assembled file straight from the cache
+        bulletin_file = os.path.join(app.config['AUDIO_FOLDER'],
+                                     bulletin_name(segments, voice_style, bulletin_builder.sting_id))
+        try:
+            if not is_cached(bulletin_file):
+                audio_flight.do(bulletin_file, bulletin_builder.assemble, segments, bulletin_file)
+        except FileNotFoundError:
+            if attempt:
+                raise
+            continue
+        
+        if os.path.exists(bulletin_file):
+            return bulletin_file, segments
+        audio_cache.discard(bulletin_file)
+    return None, segments
+
+def busy_response(error):
+    """429 for a saturated inference queue, telling the client when to retry"""
+    logger.warning(f"{error}; rejecting request (retry after {error.retry_after}s)")
+    response = jsonify({'error': 'Server busy, please retry', 'retry_after': error.retry_after})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def send_audio_file(audio_file, audio_format):
+    """Serve a cached WAV in the requested format, with Range support for seeking"""
+    try:
+        variant = transcode(audio_file, audio_format)
+        if variant != audio_file:
+            audio_cache.add(variant)
+            audio_file = variant
+    except Exception as e:
+        logger.error(f"Error transcoding audio to {audio_format}, serving WAV: {e}")
+        audio_format = 'wav'
+    
+    # send_file resolves relative paths against the app package, not the working directory
+    return send_file(os.path.abspath(audio_file), mimetype=AUDIO_FORMATS[audio_format]['mimetype'],
+                     conditional=True)
+
+def stream_audio(article_id, text, voice_style, audio_format):
+    """Stream audio sentence by sentence so playback starts after the first sentence"""
+    audio_file = audio_cache_path(text, voice_style)
+    if app.config['AUDIO_CACHE_ENABLED'] and audio_cache.lookup(audio_file):
+        if os.path.exists(audio_file):
+            logger.info(f"Using cached audio: {audio_file}")
+            record_article_audio(article_id, voice_style, audio_file)
+            return send_audio_file(audio_file, audio_format)
+        # Another worker evicted it since the lookup
+        audio_cache.discard(audio_file)
+    
+    if not tts_model:
+        logger.warning("TTS model not available")
+        return jsonify({'error': 'Audio generation failed'}), 500
+    
+    # A non-streamed render of the same file is under way: serve its result once it lands
+    rendering = audio_flight.get(audio_file)
+    if rendering is not None:
+        rendered = rendering.wait()
+        if rendered and os.path.exists(rendered):
+            record_article_audio(article_id, voice_style, rendered)
+            return send_audio_file(rendered, audio_format)
+    
+    # Progressive output is always WAV; compressed variants are served once cached.
+    # Concurrent listeners of the same file share one synthesis, each receiving it from the start.
+    chunks, leader = audio_streams.open(audio_file, partial(start_audio_stream, article_id, text, voice_style, audio_file))
+    if leader:
+        logger.info(f"Streaming audio for voice style: {voice_style}")
+    else:
+        logger.info(f"Joining in-flight audio stream: {audio_file}")
+    return Response(chunks, mimetype='audio/wav', headers={'Cache-Control': 'no-store'})
+
+def start_audio_stream(article_id, text, voice_style, audio_file):
+    """Leader side of a streamed render; admitted before the response starts (QueueFull -> 429)"""
+    ticket = inference_scheduler.admit('interactive')
+    cache_path = audio_file if app.config['AUDIO_CACHE_ENABLED'] else None
+    
+    def on_cached(path):
+        audio_cache.add(path)
+        record_article_audio(article_id, voice_style, path)
+    
+    chunks = stream_tts(tts_model, text, cache_path, on_cached, voice_style, voice_bank,
+                        schedule=partial(inference_scheduler.run, 'interactive'))
+    return interactive_stream(chunks, ticket)
+
+def interactive_stream(chunks, ticket):
+    """Hold the admission slot and keep prerendering back until the synthesis has finished"""
+    with ticket, prerender_queue.interactive():
+        yield from chunks
+
 @app.route('/api/voices')
 def get_voices():
     """Get available voice options"""
-    return jsonify(app.config['CELEBRITY_VOICES'])
+    return jsonify({key: voice['name'] for key, voice in app.config['CELEBRITY_VOICES'].items()})
 
 @app.route('/api/status')
 def get_status():
     """Get system status"""
+    refresher_details = news_refresher.details
     return jsonify({
         'summarizer_loaded': model_loading_status['summarizer'],
         'tts_loaded': model_loading_status['tts'],
         'models_ready': all(model_loading_status.values()),
+        'models': model_registry.status() if not app.config['MODEL_SERVER_ENABLED'] else None,
+        'voices': voice_bank.status() if voice_bank else None,
+        'news': {
+            'generation': news_refresher.snapshot.generation,
+            'snapshot_age': news_refresher.snapshot_age(),
+            'refresh_interval': app.config['NEWS_REFRESH_INTERVAL'],
+            'refresher': 'leader' if news_refresher.leader else 'follower',
+            'store': dict(article_store.stats(), **refresher_details.get('store_cycles', {})),
+            'feeds': refresher_details.get('feeds', {}),
+            'bodies': refresher_details.get('bodies')
+        },
+        'summary_cache': summary_cache.stats() if summary_cache else None,
+        'audio_cache': audio_cache.stats() if app.config['AUDIO_CACHE_ENABLED'] else None,
+        'prerender': prerender_queue.status() if prerender_enabled else None,
+        'events': event_hub.stats(),
+        'inference': inference_scheduler.stats(),
         'config': {
             'articles_per_feed': app.config['ARTICLES_PER_FEED'],
+            'summarization_backend': app.config['SUMMARIZATION_BACKEND'],
             'cache_enabled': app.config['AUDIO_CACHE_ENABLED'],
+            'audio_formats': list(AUDIO_FORMATS),
+            'default_audio_format': app.config['AUDIO_DEFAULT_FORMAT'],
             'total_feeds': len(app.config['RSS_FEEDS'])
         },
         'timestamp': datetime.now().isoformat()
@@ -257,6 +900,13 @@ def health_check():
         'version': '1.0.0'
     })
 
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus text exposition of the host's metrics (every worker and the model server)"""
+    if not metrics.REGISTRY.enabled:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Not found'}), 404
@@ -266,15 +916,8 @@ def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
-    # Initialize models in background
-    model_thread = threading.Thread(target=initialize_models)
-    model_thread.daemon = True
-    model_thread.start()
-    
-    # Start cleanup thread
-    cleanup_thread = threading.Thread(target=cleanup_old_audio_files)
-    cleanup_thread.daemon = True
-    cleanup_thread.start()
+    # Initialize models and start the news refresher in background
+    start_background_services()
     
     logger.info("Starting NewsBreeze server...")
     logger.info("Note: AI models are loading in the background...")
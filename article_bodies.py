@@ -0,0 +1,199 @@
+"""
+NewsBreeze - Full article bodies
+Fetches each article's page concurrently (per-host limits, robots.txt, timeouts),
+extracts the main text and caches it by URL with HTTP validators
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from itertools import zip_longest
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+from bs4 import BeautifulSoup
+
+from pools import USER_AGENT, HTTPWorkers, SQLiteConnections
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bodies (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bodies_fetched_at ON bodies(fetched_at);
+"""
+
+# Page furniture that never belongs to the article text
+BOILERPLATE_TAGS = ['script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form',
+                    'figure', 'iframe', 'svg', 'button']
+# Paragraphs shorter than this are captions, bylines and share links
+MIN_PARAGRAPH_CHARS = 40
+ROBOTS_TTL = 24 * 3600
+
+
+def extract_main_text(html, max_chars=20000):
+    """Main text of an article page: the <article>, or the block with the most paragraph text"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for tag in soup(BOILERPLATE_TAGS):
+        tag.decompose()
+
+    candidates = soup.find_all('article')
+    if not candidates and soup.find('main'):
+        candidates = [soup.find('main')]
+    if not candidates:
+        # Score each paragraph's parent by the amount of paragraph text it holds
+        scores = {}
+        for paragraph in soup.find_all('p'):
+            parent = paragraph.parent
+            scores[parent] = scores.get(parent, 0) + len(paragraph.get_text(strip=True))
+        candidates = [max(scores, key=scores.get)] if scores else []
+
+    paragraphs = []
+    for candidate in candidates:
+        for paragraph in candidate.find_all('p'):
+            text = ' '.join(paragraph.get_text(' ', strip=True).split())
+            if len(text) >= MIN_PARAGRAPH_CHARS:
+                paragraphs.append(text)
+    return '\n'.join(paragraphs)[:max_chars]
+
+
+class BodyFetcher(HTTPWorkers):
+    """Fetch and extract article bodies in parallel; cached in SQLite by URL, revalidated by ETag"""
+
+    def __init__(self, cache_path, timeout=10, max_workers=8, per_host=2, refetch_hours=6,
+                 max_age_hours=168, max_chars=20000):
+        self.cache_path = cache_path
+        self.timeout = timeout
+        self.per_host = per_host
+        self.refetch_after = refetch_hours * 3600
+        self.max_age = max_age_hours * 3600
+        self.max_chars = max_chars
+        self.counts = {'fetched': 0, 'not_modified': 0, 'cached': 0, 'disallowed': 0, 'failed': 0}
+
+        super().__init__(max_workers, 'body-fetch')
+        self._lock = threading.Lock()
+        self._host_slots = {}  # host -> BoundedSemaphore(per_host)
+        self._robots = {}  # origin -> (RobotFileParser, fetched_at)
+        self._robots_flight = SingleFlight()
+        self._db = SQLiteConnections(cache_path, SCHEMA)
+
+    def _count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def _slot(self, host):
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    def _load_robots(self, origin):
+        parser = RobotFileParser(origin + '/robots.txt')
+        try:
+            response = self.session.get(origin + '/robots.txt', timeout=self.timeout)
+            if response.status_code in (401, 403):
+                parser.disallow_all = True
+            elif response.status_code >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse(response.text.splitlines())
+        except requests.RequestException as e:
+            logger.warning(f"Could not read {origin}/robots.txt, assuming allowed: {e}")
+            parser.allow_all = True
+        with self._lock:
+            self._robots[origin] = (parser, time.time())
+        return parser
+
+    def allowed(self, url):
+        """robots.txt check, one robots fetch per origin per day"""
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            parser, fetched_at = self._robots.get(origin, (None, 0))
+        if parser is None or time.time() - fetched_at > ROBOTS_TTL:
+            parser = self._robots_flight.do(origin, self._load_robots, origin)
+        return parser.can_fetch(USER_AGENT, url)
+
+    def fetch_body(self, url):
+        """Extracted body text for url ('' if unavailable), from cache when fresh"""
+        row = self._db.connection().execute(
+            'SELECT etag, last_modified, body, fetched_at FROM bodies WHERE url = ?', (url,)
+        ).fetchone()
+        if row and time.time() - row[3] < self.refetch_after:
+            self._count('cached')
+            return row[2]
+
+        if not self.allowed(url):
+            self._count('disallowed')
+            return ''
+
+        headers = {}
+        if row:
+            if row[0]:
+                headers['If-None-Match'] = row[0]
+            if row[1]:
+                headers['If-Modified-Since'] = row[1]
+
+        with self._slot(urlsplit(url).netloc):
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and row:
+            self._count('not_modified')
+            body, etag, modified = row[2], row[0], row[1]
+        else:
+            response.raise_for_status()
+            body = extract_main_text(response.text, self.max_chars)
+            etag, modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+            self._count('fetched')
+
+        self._db.connection().execute(
+            'INSERT OR REPLACE INTO bodies (url, etag, last_modified, body, fetched_at) VALUES (?, ?, ?, ?, ?)',
+            (url, etag, modified, body, time.time())
+        )
+        return body
+
+    def _fetch_safe(self, url):
+        try:
+            return self.fetch_body(url)
+        except Exception as e:
+            logger.warning(f"Error fetching article body {url}: {e}")
+            self._count('failed')
+            return ''
+
+    def fetch_all(self, articles):
+        """Set article['body'] for every article whose page yielded text"""
+        # Interleave hosts so workers are not all parked on one site's per-host limit
+        by_host = {}
+        for article in articles:
+            by_host.setdefault(urlsplit(article['link']).netloc, []).append(article)
+        ordered = [article for round_ in zip_longest(*by_host.values()) for article in round_ if article]
+
+        bodies = self._executor.map(self._fetch_safe, [article['link'] for article in ordered])
+        found = 0
+        for article, body in zip(ordered, bodies):
+            if body:
+                article['body'] = body
+                found += 1
+        logger.info(f"Extracted bodies for {found}/{len(articles)} articles")
+        self.evict()
+        return articles
+
+    def evict(self):
+        """Drop bodies not refreshed within max_age"""
+        try:
+            self._db.connection().execute('DELETE FROM bodies WHERE fetched_at < ?', (time.time() - self.max_age,))
+        except sqlite3.Error as e:
+            logger.error(f"Article body cache eviction failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {'counts': dict(self.counts), 'robots_origins': len(self._robots)}
@@ -0,0 +1,306 @@
+"""
+NewsBreeze - Persistent article store
+SQLite (WAL) history of every processed article with its summary and rendered audio.
+Remembers articles between polls so only new or changed entries are summarized,
+and keeps an FTS5 index over the history for /api/search.
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import time
+
+from news_index import published_timestamp
+from pools import SQLiteConnections
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    key TEXT PRIMARY KEY,
+    id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    source TEXT NOT NULL,
+    published TEXT NOT NULL,
+    published_ts REAL NOT NULL,
+    summary TEXT NOT NULL,
+    ai_summary TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    model TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS articles_id ON articles(id);
+CREATE INDEX IF NOT EXISTS articles_published ON articles(published_ts);
+CREATE INDEX IF NOT EXISTS articles_active ON articles(active, last_seen);
+CREATE TABLE IF NOT EXISTS audio (
+    article_id TEXT NOT NULL,
+    voice TEXT NOT NULL,
+    path TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (article_id, voice)
+);
+"""
+
+# External-content FTS5 index kept in step with the articles table by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, ai_summary, summary, content='articles', content_rowid='rowid', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, ai_summary, summary)
+    VALUES (new.rowid, new.title, new.ai_summary, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, ai_summary, summary)
+    VALUES ('delete', old.rowid, old.title, old.ai_summary, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, ai_summary, summary ON articles
+WHEN old.title IS NOT new.title OR old.ai_summary IS NOT new.ai_summary OR old.summary IS NOT new.summary BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, ai_summary, summary)
+    VALUES ('delete', old.rowid, old.title, old.ai_summary, old.summary);
+    INSERT INTO articles_fts(rowid, title, ai_summary, summary)
+    VALUES (new.rowid, new.title, new.ai_summary, new.summary);
+END;
+"""
+
+UPSERT = """
+INSERT INTO articles (key, id, title, link, source, published, published_ts, summary, ai_summary,
+                      fingerprint, model, first_seen, last_seen, active)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+ON CONFLICT(key) DO UPDATE SET
+    id = excluded.id, title = excluded.title, link = excluded.link, source = excluded.source,
+    published = excluded.published, published_ts = excluded.published_ts, summary = excluded.summary,
+    ai_summary = excluded.ai_summary, fingerprint = excluded.fingerprint, model = excluded.model,
+    last_seen = excluded.last_seen, active = 1
+"""
+
+RESULT_COLUMNS = 'a.id, a.title, a.link, a.source, a.published, a.ai_summary, a.first_seen, a.last_seen, a.active'
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+# Column weights for ranking: a hit in the title counts most
+BM25_WEIGHTS = (10.0, 4.0, 1.0)
+# Only the newest this many matches are ranked, so common words stay as cheap as rare ones
+SEARCH_CANDIDATES = 500
+
+
+def article_key(article):
+    """Stable identity for an entry: its GUID, else its link"""
+    return article.get('guid') or article['link']
+
+
+def summary_source(article):
+    """Text the summarizer works from: the full body when it was fetched, else the feed summary"""
+    return article.get('body') or article.get('summary', '')
+
+
+def content_fingerprint(article, settings=()):
+    """Hash of the fields that feed into the summary, and the summarizer settings that shape it"""
+    payload = '\x1f'.join([*map(str, settings), article['title'], summary_source(article)])
+    return hashlib.md5(payload.encode('utf-8')).hexdigest()
+
+
+def match_expression(query):
+    """FTS5 query for free text: every word must match, the last one as a prefix.
+
+    Words are quoted, so user input can never form FTS syntax (operators, columns, quotes).
+    """
+    words = re.findall(r'\w+', query)
+    if not words:
+        return None
+    return ' '.join(f'"{word}"' for word in words) + '*'
+
+
+class ArticleStore:
+    """Processed articles keyed by GUID/link, shared by all workers on a host.
+
+    Written once per poll cycle by each refresher in a single transaction; readers
+    (search, status) never block on it thanks to WAL.
+    """
+
+    def __init__(self, path, retention_days=0):
+        self.path = path
+        self.retention = retention_days * 86400
+        self.last_cycle = {'new': 0, 'changed': 0, 'unchanged': 0, 'retired': 0, 'pruned': 0}
+        self.totals = dict(self.last_cycle)
+        self._db = SQLiteConnections(path, SCHEMA)
+        conn = self._db.connection()
+        try:
+            conn.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite has no FTS5 ({e}); search falls back to substring matching")
+            self.fts = False
+
+    def _previous(self, keys):
+        """key -> (fingerprint, model, ai_summary) for the keys already stored"""
+        conn = self._db.connection()
+        previous = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[start:start + LOOKUP_CHUNK]
+            rows = conn.execute(
+                f"SELECT key, fingerprint, model, ai_summary FROM articles "
+                f"WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            )
+            previous.update((row[0], row[1:]) for row in rows)
+        return previous
+
+    def sync(self, articles, summarize, model=None, fallback=None, settings=()):
+        """Fill in ai_summary for articles, summarizing only new or changed ones.
+
+        summarize(list_of_texts) -> list_of_summaries, None where summarizing failed. Those
+        get fallback(text) and are stored without a model, like everything summarized by a
+        different model, so they count as changed and are summarized again next cycle.
+        settings (lengths, chunk size) are part of each fingerprint, so changing them does too.
+        Entries no longer present in articles are retired but kept as history.
+        Articles need their 'id' set before syncing.
+        """
+        counts = {'new': 0, 'changed': 0, 'unchanged': 0, 'retired': 0, 'pruned': 0}
+        now = time.time()
+        keys = [article_key(article) for article in articles]
+        fingerprints = [content_fingerprint(article, settings) for article in articles]
+        try:
+            previous = self._previous(keys)
+        except sqlite3.Error as e:
+            logger.error(f"Article store read failed: {e}")
+            previous = {}
+
+        pending = []
+        fallbacks = set()
+        for article, key, fingerprint in zip(articles, keys, fingerprints):
+            stored = previous.get(key)
+            if stored and stored[0] == fingerprint and stored[1] == model:
+                article['ai_summary'] = stored[2]
+                counts['unchanged'] += 1
+            else:
+                counts['changed' if stored else 'new'] += 1
+                pending.append(article)
+
+        if pending:
+            summaries = summarize([summary_source(article) for article in pending])
+            for article, summary in zip(pending, summaries):
+                if summary is None:
+                    fallbacks.add(article_key(article))
+                    source = summary_source(article)
+                    summary = fallback(source) if fallback else source
+                article['ai_summary'] = summary
+
+        rows = [
+            (key, article['id'], article['title'], article['link'], article.get('source', ''),
+             article.get('published', ''), published_timestamp(article), article.get('summary', ''),
+             article['ai_summary'], fingerprint, None if key in fallbacks else model, now, now)
+            for article, key, fingerprint in zip(articles, keys, fingerprints)
+        ]
+        try:
+            counts['retired'], counts['pruned'] = self._write_cycle(rows, now)
+        except sqlite3.Error as e:
+            logger.error(f"Article store write failed: {e}")
+
+        self.last_cycle = counts
+        for name, value in counts.items():
+            self.totals[name] += value
+        logger.info(f"Article store: {counts['new']} new, {counts['changed']} changed, "
+                    f"{counts['unchanged']} unchanged, {counts['retired']} retired")
+        return articles
+
+    def _write_cycle(self, rows, now):
+        """Upsert the whole poll in one transaction; returns (retired, pruned) counts"""
+        conn = self._db.connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(UPSERT, rows)
+            retired = conn.execute('UPDATE articles SET active = 0 WHERE active = 1 AND last_seen < ?',
+                                   (now,)).rowcount
+            pruned = 0
+            if self.retention:
+                cutoff = now - self.retention
+                pruned = conn.execute('DELETE FROM articles WHERE active = 0 AND last_seen < ?', (cutoff,)).rowcount
+                conn.execute('DELETE FROM audio WHERE article_id NOT IN (SELECT id FROM articles)')
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return retired, pruned
+
+    def record_audio(self, article_id, voice, path):
+        """Remember where an article's audio was rendered for a voice"""
+        try:
+            self._db.connection().execute(
+                'INSERT OR REPLACE INTO audio (article_id, voice, path, created_at) VALUES (?, ?, ?, ?)',
+                (article_id, voice, path, time.time())
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Article store audio write failed: {e}")
+
+    def search(self, query, limit=20, source=None, since=None):
+        """Best matches for free text across the history, each with the voices it was rendered in.
+
+        Results are ranked by BM25 among the most recent SEARCH_CANDIDATES matches.
+        """
+        filters, params = [], []
+        if source:
+            filters.append('a.source = ? COLLATE NOCASE')
+            params.append(source)
+        if since is not None:
+            filters.append('a.published_ts >= ?')
+            params.append(since)
+        where = ''.join(f' AND {condition}' for condition in filters)
+
+        conn = self._db.connection()
+        if self.fts:
+            expression = match_expression(query)
+            if expression is None:
+                return []
+            # rowid follows insertion order, which the FTS index can walk newest first without sorting
+            rows = conn.execute(
+                f"SELECT {RESULT_COLUMNS} FROM ("
+                f"  SELECT f.rowid AS match_rowid, bm25(articles_fts, ?, ?, ?) AS score "
+                f"  FROM articles_fts f JOIN articles a ON a.rowid = f.rowid "
+                f"  WHERE articles_fts MATCH ?{where} ORDER BY f.rowid DESC LIMIT ?"
+                f") m JOIN articles a ON a.rowid = m.match_rowid ORDER BY m.score LIMIT ?",
+                list(BM25_WEIGHTS) + [expression] + params + [SEARCH_CANDIDATES, limit]
+            ).fetchall()
+        else:
+            pattern = f"%{query.strip()}%"
+            rows = conn.execute(
+                f"SELECT {RESULT_COLUMNS} FROM articles a WHERE (a.title LIKE ? OR a.ai_summary LIKE ?){where} "
+                f"ORDER BY a.published_ts DESC LIMIT ?",
+                [pattern, pattern] + params + [limit]
+            ).fetchall()
+
+        results = [
+            {
+                'id': row[0], 'title': row[1], 'link': row[2], 'source': row[3], 'published': row[4],
+                'ai_summary': row[5], 'first_seen': row[6], 'last_seen': row[7], 'active': bool(row[8]),
+                'audio': []
+            }
+            for row in rows
+        ]
+        if results:
+            by_id = {result['id']: result for result in results}
+            audio = conn.execute(
+                f"SELECT article_id, voice FROM audio WHERE article_id IN ({','.join('?' * len(by_id))}) "
+                f"ORDER BY voice", list(by_id)
+            )
+            for article_id, voice in audio:
+                by_id[article_id]['audio'].append(voice)
+        return results
+
+    def stats(self):
+        try:
+            total, active = self._db.connection().execute(
+                'SELECT COUNT(*), COALESCE(SUM(active), 0) FROM articles'
+            ).fetchone()
+        except sqlite3.Error:
+            total = active = None
+        return {
+            'articles': active,
+            'history': total,
+            'full_text_search': self.fts,
+            'last_cycle': dict(self.last_cycle),
+            'totals': dict(self.totals)
+        }
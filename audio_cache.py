@@ -0,0 +1,270 @@
+"""
+NewsBreeze - Audio cache manager
+Shared SQLite index over static/audio with a byte budget, LRU eviction and periodic compaction
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from pools import SQLiteConnections
+
+logger = logging.getLogger(__name__)
+
+# Leftover temp files from interrupted renders are removed after this long
+STALE_PART_SECONDS = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audio_files (
+    path TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS audio_files_key ON audio_files (key);
+"""
+
+# Entries (a WAV and its variants) oldest access first; keep sorts last
+ENTRIES_BY_AGE = """
+SELECT key, SUM(size), MAX(last_access) FROM audio_files GROUP BY key
+ORDER BY key = ?, MAX(last_access)
+"""
+
+
+def entry_key(path):
+    """Cache entries group a WAV and its transcoded variants: {hash}_{voice}"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def is_temp_file(name):
+    return name.endswith('.part') or name.endswith('.part.wav')
+
+
+class AudioCache:
+    """Index of cached audio files keyed by {hash}_{voice}, shared by every worker on a host.
+
+    Sizes and access times live in SQLite rather than in the files' mtimes, which stay
+    those of the render so the served ETag and Last-Modified never change. The budget is
+    checked against the index total and eviction runs in a write transaction, so it holds
+    host-wide; the directory is only scanned to reconcile at startup.
+    """
+
+    def __init__(self, directory, index_path, max_bytes, max_age_hours=24, compact_interval=600):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age_hours * 3600
+        self.compact_interval = compact_interval
+        # Per-process counters; the index is shared
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._timer = None
+        self._db = SQLiteConnections(index_path, SCHEMA)
+
+    def _transaction(self, fn):
+        """Run fn(conn) in a write transaction; the write lock excludes every other process"""
+        conn = self._db.connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = fn(conn)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return result
+
+    def load(self):
+        """Reconcile the index with the directory: index files written without it, forget deleted ones"""
+        on_disk = {}
+        os.makedirs(self.directory, exist_ok=True)
+        for item in os.scandir(self.directory):
+            if item.name.startswith('.') or is_temp_file(item.name):
+                continue
+            try:
+                if item.is_file():
+                    stat = item.stat()
+                    on_disk[item.path] = (stat.st_size, stat.st_mtime)
+            except FileNotFoundError:
+                continue
+
+        def reconcile(conn):
+            indexed = {row[0] for row in conn.execute('SELECT path FROM audio_files')}
+            gone = [(path,) for path in indexed - on_disk.keys()]
+            conn.executemany('DELETE FROM audio_files WHERE path = ?', gone)
+            conn.executemany('INSERT INTO audio_files (path, key, size, last_access) VALUES (?, ?, ?, ?)',
+                             [(path, entry_key(path), size, mtime)
+                              for path, (size, mtime) in on_disk.items() if path not in indexed])
+            return len(gone)
+
+        gone = self._transaction(reconcile)
+        stats = self.stats()
+        logger.info(f"Audio cache index loaded: {stats['entries']} entries, {stats['bytes_used'] / 1e6:.1f} MB"
+                    + (f" ({gone} missing files forgotten)" if gone else ''))
+        self.evict()
+
+    def contains(self, path):
+        """Membership test without hit/miss accounting"""
+        try:
+            return self._db.connection().execute(
+                'SELECT 1 FROM audio_files WHERE path = ?', (path,)).fetchone() is not None
+        except sqlite3.Error as e:
+            logger.error(f"Audio cache index read failed: {e}")
+            return False
+
+    def lookup(self, path):
+        """Record an access to path's entry; returns True if path is cached"""
+        try:
+            found = self._db.connection().execute(
+                'UPDATE audio_files SET last_access = ? WHERE key = ? '
+                'AND EXISTS (SELECT 1 FROM audio_files WHERE path = ?)',
+                (time.time(), entry_key(path), path)
+            ).rowcount > 0
+        except sqlite3.Error as e:
+            logger.error(f"Audio cache index update failed: {e}")
+            found = False
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return found
+
+    def add(self, path, touch=True):
+        """Index a newly written file and enforce the byte budget"""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        key = entry_key(path)
+        now = time.time()
+        try:
+            conn = self._db.connection()
+            conn.execute(
+                'INSERT INTO audio_files (path, key, size, last_access) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(path) DO UPDATE SET size = excluded.size, last_access = '
+                + ('excluded.last_access' if touch else 'audio_files.last_access'),
+                (path, key, size, now)
+            )
+            if touch:
+                conn.execute('UPDATE audio_files SET last_access = ? WHERE key = ?', (now, key))
+            bytes_used = conn.execute('SELECT COALESCE(SUM(size), 0) FROM audio_files').fetchone()[0]
+            if bytes_used > self.max_bytes:
+                self.evict(keep=key)
+        except sqlite3.Error as e:
+            logger.error(f"Audio cache index write failed: {e}")
+
+    def discard(self, path):
+        """Forget an entry whose files went missing underneath us, removing what is left of it"""
+        try:
+            self._transaction(lambda conn: self._remove(conn, entry_key(path)))
+        except sqlite3.Error as e:
+            logger.error(f"Audio cache index write failed: {e}")
+
+    def _remove(self, conn, key):
+        """Delete an entry's rows and files inside a write transaction"""
+        paths = [row[0] for row in conn.execute('SELECT path FROM audio_files WHERE key = ?', (key,))]
+        conn.execute('DELETE FROM audio_files WHERE key = ?', (key,))
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove cached audio {path}: {e}")
+
+    def evict(self, keep=None):
+        """Remove least recently used entries until the index total is under the byte budget.
+
+        keep is an entry just written, which is only evicted if it alone exceeds the budget.
+        """
+        def evict_lru(conn):
+            bytes_used = conn.execute('SELECT COALESCE(SUM(size), 0) FROM audio_files').fetchone()[0]
+            if bytes_used <= self.max_bytes:
+                return 0
+            victims = []
+            for key, size, _ in conn.execute(ENTRIES_BY_AGE, (keep,)).fetchall():
+                if bytes_used <= self.max_bytes:
+                    break
+                victims.append(key)
+                bytes_used -= size
+            for key in victims:
+                self._remove(conn, key)
+            return len(victims)
+
+        removed = self._transaction(evict_lru)
+        with self._lock:
+            self.evictions += removed
+        if removed:
+            logger.info(f"Audio cache evicted {removed} LRU entries")
+        return removed
+
+    def compact(self):
+        """Expire entries not accessed within max_age, clear stale temp files, enforce the budget"""
+        now = time.time()
+        cutoff = now - self.max_age
+
+        def expire(conn):
+            expired = [row[0] for row in conn.execute(
+                'SELECT key FROM audio_files GROUP BY key HAVING MAX(last_access) < ?', (cutoff,))]
+            for key in expired:
+                self._remove(conn, key)
+            return len(expired)
+
+        expired = self._transaction(expire)
+
+        for name in os.listdir(self.directory):
+            if is_temp_file(name):
+                path = os.path.join(self.directory, name)
+                try:
+                    if os.path.getmtime(path) < now - STALE_PART_SECONDS:
+                        os.remove(path)
+                except OSError:
+                    pass
+
+        if expired:
+            with self._lock:
+                self.evictions += expired
+            logger.info(f"Cleaned up {expired} expired audio entries")
+        self.evict()
+
+    def start(self):
+        """Reconcile the index in the background, then compact on a timer"""
+        thread = threading.Thread(target=self._load_and_schedule, name='audio-cache-index', daemon=True)
+        thread.start()
+
+    def _load_and_schedule(self):
+        try:
+            self.load()
+        except Exception as e:
+            logger.error(f"Error loading audio cache index: {e}")
+        self._schedule()
+
+    def _schedule(self):
+        self._timer = threading.Timer(self.compact_interval, self._compact_and_reschedule)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _compact_and_reschedule(self):
+        try:
+            self.compact()
+        except Exception as e:
+            logger.error(f"Error during audio cache compaction: {e}")
+        self._schedule()
+
+    def stats(self):
+        entries, bytes_used = self._db.connection().execute(
+            'SELECT COUNT(DISTINCT key), COALESCE(SUM(size), 0) FROM audio_files').fetchone()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': entries,
+                'bytes_used': bytes_used,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,72 @@
+"""
+NewsBreeze - Compressed audio variants
+Transcodes cached WAVs to Opus/MP3 and caches the result next to the source file
+"""
+
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+AUDIO_FORMATS = {
+    'opus': {
+        'extension': 'opus',
+        'mimetype': 'audio/ogg',
+        'export': {'format': 'ogg', 'codec': 'libopus', 'bitrate': '32k'}
+    },
+    'mp3': {
+        'extension': 'mp3',
+        'mimetype': 'audio/mpeg',
+        'export': {'format': 'mp3', 'bitrate': '64k'}
+    },
+    'wav': {
+        'extension': 'wav',
+        'mimetype': 'audio/wav',
+        'export': None
+    }
+}
+
+
+def negotiate_format(requested, accept_mimetypes, default='mp3'):
+    """Pick an output format from ?format=, then the Accept header, then the default"""
+    if requested in AUDIO_FORMATS:
+        return requested
+
+    candidates = [default] + [name for name in ('opus', 'mp3', 'wav') if name != default]
+    for name in candidates:
+        if accept_mimetypes.quality(AUDIO_FORMATS[name]['mimetype']) > 0:
+            return name
+    return default
+
+
+def variant_path(wav_path, audio_format):
+    """Path of a transcoded variant; shares the content hash of the source WAV"""
+    base, _ = os.path.splitext(wav_path)
+    return f"{base}.{AUDIO_FORMATS[audio_format]['extension']}"
+
+
+def transcode(wav_path, audio_format):
+    """Return the path of wav_path in audio_format, transcoding once and caching it"""
+    if audio_format == 'wav':
+        return wav_path
+
+    target = variant_path(wav_path, audio_format)
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(wav_path):
+        return target
+
+    from pydub import AudioSegment
+
+    # Write to a temp file first so concurrent readers never see a partial variant
+    fd, temp_path = tempfile.mkstemp(suffix='.part', dir=os.path.dirname(target))
+    os.close(fd)
+    try:
+        AudioSegment.from_wav(wav_path).export(temp_path, **AUDIO_FORMATS[audio_format]['export'])
+        os.replace(temp_path, target)
+    except Exception:
+        os.remove(temp_path)
+        raise
+
+    logger.info(f"Transcoded {os.path.basename(wav_path)} to {audio_format} "
+                f"({os.path.getsize(wav_path)} -> {os.path.getsize(target)} bytes)")
+    return target
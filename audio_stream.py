@@ -0,0 +1,126 @@
+"""
+NewsBreeze - Streaming speech synthesis
+Synthesizes text sentence by sentence and streams it as a progressive WAV
+"""
+
+import logging
+import os
+import re
+import struct
+import tempfile
+import time
+
+from metrics import REGISTRY, TTS_SECONDS, TTS_SECONDS_PER_CHAR
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])["\')\]]*\s+')
+# Placeholder chunk size for headers written before the total length is known
+STREAMING_SIZE = 0xFFFFFFFF
+
+
+def split_sentences(text):
+    """Split text into sentences, keeping very short fragments attached to the previous one"""
+    sentences = []
+    for part in SENTENCE_BOUNDARY.split(text.strip()):
+        part = part.strip()
+        if not part:
+            continue
+        if sentences and len(part) < 20:
+            sentences[-1] = f"{sentences[-1]} {part}"
+        else:
+            sentences.append(part)
+    return sentences
+
+
+def wav_header(sample_rate, data_size=STREAMING_SIZE, channels=1, bits=16):
+    """44-byte PCM WAV header; sizes default to the 'unknown length' streaming value"""
+    riff_size = STREAMING_SIZE if data_size == STREAMING_SIZE else 36 + data_size
+    block_align = channels * bits // 8
+    return (b'RIFF' + struct.pack('<I', riff_size) + b'WAVE'
+            + b'fmt ' + struct.pack('<IHHIIHH', 16, 1, channels, sample_rate,
+                                    sample_rate * block_align, block_align, bits)
+            + b'data' + struct.pack('<I', data_size))
+
+
+def synthesize_pcm(tts_model, text, voice=None, voices=None):
+    """Synthesize one chunk of text; returns (sample_rate, 16-bit mono PCM bytes)"""
+    # Through the model server proxy the synthesis is timed where it runs, in the server
+    if not REGISTRY.enabled or hasattr(tts_model, 'synthesize_pcm'):
+        return _synthesize_pcm(tts_model, text, voice, voices)
+
+    started = time.perf_counter()
+    result = _synthesize_pcm(tts_model, text, voice, voices)
+    elapsed = time.perf_counter() - started
+    TTS_SECONDS.observe(elapsed, voice or 'default')
+    TTS_SECONDS_PER_CHAR.observe(elapsed / max(1, len(text)), voice or 'default')
+    return result
+
+
+def _synthesize_pcm(tts_model, text, voice, voices):
+    if hasattr(tts_model, 'synthesize_pcm'):
+        # Remote model server proxy does the conversion (and voice lookup) server-side
+        return tts_model.synthesize_pcm(text, voice)
+
+    import numpy as np
+
+    samples = voices.synthesize(text, voice) if voices else tts_model.tts(text=text)
+    samples = np.asarray(samples, dtype=np.float32)
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+    return tts_model.synthesizer.output_sample_rate, pcm
+
+
+def stream_tts(tts_model, text, cache_path=None, on_cached=None, voice=None, voices=None, schedule=None):
+    """Yield a WAV stream sentence by sentence, saving the finished file to cache_path.
+
+    schedule(fn, *args), when given, runs each sentence's synthesis (e.g. on the inference scheduler).
+    """
+    temp_file = None
+    temp_path = None
+    data_size = 0
+    sample_rate = None
+    completed = False
+
+    try:
+        for sentence in split_sentences(text):
+            if schedule:
+                rate, pcm = schedule(synthesize_pcm, tts_model, sentence, voice, voices)
+            else:
+                rate, pcm = synthesize_pcm(tts_model, sentence, voice, voices)
+            if sample_rate is None:
+                sample_rate = rate
+                header = wav_header(sample_rate)
+                if cache_path:
+                    fd, temp_path = tempfile.mkstemp(suffix='.part', dir=os.path.dirname(cache_path))
+                    temp_file = os.fdopen(fd, 'wb')
+                    temp_file.write(header)
+                yield header
+
+            if temp_file:
+                temp_file.write(pcm)
+            data_size += len(pcm)
+            yield pcm
+        completed = sample_rate is not None
+    finally:
+        if temp_file:
+            if completed:
+                # Patch the real sizes in so the cached copy is a normal seekable WAV
+                temp_file.seek(0)
+                temp_file.write(wav_header(sample_rate, data_size))
+                temp_file.close()
+                os.replace(temp_path, cache_path)
+                logger.info(f"Streamed audio cached: {cache_path}")
+                if on_cached:
+                    on_cached(cache_path)
+            else:
+                temp_file.close()
+                os.remove(temp_path)
+
+
+def render_wav(tts_model, text, path, voice=None, voices=None, schedule=None):
+    """Synthesize text to a complete WAV at path (written to a temp file, then renamed)"""
+    for _ in stream_tts(tts_model, text, path, voice=voice, voices=voices, schedule=schedule):
+        pass
+    if not os.path.exists(path):
+        raise RuntimeError("No audio was synthesized")
+    return path
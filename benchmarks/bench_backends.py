@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze - Summarization backend benchmark
+Compares the fp32 torch pipeline with the int8 and ONNX Runtime backends:
+latency, throughput, peak memory and ROUGE drift against the fp32 summaries
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_summarization import make_articles
+from config import Config
+
+
+def rouge_n(reference, candidate, n=1):
+    """ROUGE-N F1 over lowercase word n-grams"""
+    def grams(text):
+        words = text.lower().split()
+        return [tuple(words[i:i + n]) for i in range(len(words) - n + 1)]
+
+    ref, cand = grams(reference), grams(candidate)
+    if not ref or not cand:
+        return 0.0
+    remaining = list(ref)
+    overlap = 0
+    for gram in cand:
+        if gram in remaining:
+            remaining.remove(gram)
+            overlap += 1
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / len(cand), overlap / len(ref)
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_l(reference, candidate):
+    """ROUGE-L F1 from the longest common subsequence of words"""
+    ref, cand = reference.lower().split(), candidate.lower().split()
+    if not ref or not cand:
+        return 0.0
+    previous = [0] * (len(cand) + 1)
+    for word in ref:
+        current = [0]
+        for j, other in enumerate(cand):
+            current.append(previous[j] + 1 if word == other else max(previous[j + 1], current[j]))
+        previous = current
+    lcs = previous[-1]
+    if not lcs:
+        return 0.0
+    precision, recall = lcs / len(cand), lcs / len(ref)
+    return 2 * precision * recall / (precision + recall)
+
+
+def run_backend(backend, model, count, batch_size):
+    """Measure one backend in this process; prints a JSON result line"""
+    from models import build_summarization_pipeline
+    from summarization import BatchSummarizer
+
+    texts = make_articles(count)
+    max_length, min_length = Config.SUMMARY_MAX_LENGTH, Config.SUMMARY_MIN_LENGTH
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    summarizer = build_summarization_pipeline(model, backend, os.path.join(ROOT, Config.CACHE_FOLDER, 'onnx'))
+    load_seconds = time.perf_counter() - start
+
+    # Warm up so the first measurement doesn't pay lazy initialisation
+    summarizer(texts[0], max_length=max_length, min_length=min_length, do_sample=False)
+
+    latencies = []
+    summaries = []
+    for text in texts:
+        started = time.perf_counter()
+        output = summarizer(text, max_length=max_length, min_length=min_length, do_sample=False, truncation=True)
+        latencies.append(time.perf_counter() - started)
+        summaries.append(output[0]['summary_text'])
+
+    batcher = BatchSummarizer(summarizer, batch_size)
+    start = time.perf_counter()
+    batcher.summarize(texts, max_length, min_length)
+    throughput = len(texts) / (time.perf_counter() - start)
+
+    latencies.sort()
+    print(json.dumps({
+        'backend': backend,
+        'load_seconds': load_seconds,
+        'latency_p50_ms': statistics.median(latencies) * 1000,
+        'latency_p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        'throughput': throughput,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'model_rss_mb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss) / 1024,
+        'summaries': summaries
+    }))
+
+
+def measure(backend, args):
+    """Run a backend in a fresh interpreter so peak RSS is its own"""
+    command = [sys.executable, os.path.abspath(__file__), '--worker', backend, '--model', args.model,
+               '--articles', str(args.articles), '--batch-size', str(args.batch_size)]
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {'backend': backend, 'error': completed.stderr.strip().splitlines()[-1:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', default=Config.SUMMARIZATION_MODEL)
+    parser.add_argument('--backends', default='torch,int8,onnx')
+    parser.add_argument('--articles', type=int, default=24)
+    parser.add_argument('--batch-size', type=int, default=Config.SUMMARY_BATCH_SIZE)
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_backend(args.worker, args.model, args.articles, args.batch_size)
+        return
+
+    print("⚖️  NewsBreeze summarization backend benchmark")
+    print("=" * 40)
+    print(f"   Model: {args.model}, {args.articles} articles, batch size {args.batch_size}")
+
+    backends = args.backends.split(',')
+    results = {backend: measure(backend, args) for backend in ['torch'] + [b for b in backends if b != 'torch']}
+    baseline = results['torch'].get('summaries')
+
+    for backend, result in results.items():
+        if 'error' in result:
+            print(f"   {backend:6s} failed: {' '.join(result['error'])}")
+            continue
+        if baseline:
+            result['rouge1_vs_fp32'] = statistics.mean(map(rouge_n, baseline, result['summaries']))
+            result['rougeL_vs_fp32'] = statistics.mean(map(rouge_l, baseline, result['summaries']))
+        print(f"   {backend:6s} p50 {result['latency_p50_ms']:7.1f} ms  p95 {result['latency_p95_ms']:7.1f} ms  "
+              f"{result['throughput']:6.2f} articles/sec  peak {result['peak_rss_mb']:6.0f} MB  "
+              f"ROUGE-1 {result.get('rouge1_vs_fp32', float('nan')):.3f}  "
+              f"ROUGE-L {result.get('rougeL_vs_fp32', float('nan')):.3f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze - Feed fetching benchmark
+Compares sequential feedparser.parse() with the concurrent FeedFetcher against a local stub server
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import feedparser
+
+from benchmarks.stub_feed_server import StubFeedServer
+from feeds import FeedFetcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--feeds', type=int, default=7, help='number of stub feeds')
+    parser.add_argument('--delay', type=float, default=0.2, help='per-feed latency in seconds')
+    parser.add_argument('--slow-delay', type=float, default=0.6, help='latency of the slowest feed')
+    args = parser.parse_args()
+
+    names = [f"feed{i}" for i in range(args.feeds)]
+    delays = {name: args.delay for name in names}
+    delays[names[-1]] = args.slow_delay
+
+    print("📡 NewsBreeze feed fetch benchmark")
+    print("=" * 40)
+    print(f"   {args.feeds} feeds, {args.delay:.2f}s each, slowest {args.slow_delay:.2f}s")
+
+    with StubFeedServer(feeds=names, delays=delays) as stub:
+        urls = stub.feed_urls()
+
+        start = time.perf_counter()
+        sequential = [feedparser.parse(url) for url in urls]
+        sequential_time = time.perf_counter() - start
+
+        fetcher = FeedFetcher(timeout=10, max_workers=args.feeds)
+        start = time.perf_counter()
+        cold = fetcher.fetch_all(urls)
+        cold_time = time.perf_counter() - start
+
+        served_before = stub.not_modified_served
+        start = time.perf_counter()
+        warm = fetcher.fetch_all(urls)
+        warm_time = time.perf_counter() - start
+        not_modified = stub.not_modified_served - served_before
+        fetcher.close()
+
+    entries = sum(len(feed.entries) for feed in sequential)
+    assert entries == sum(len(feed.entries) for _, feed in cold if feed is not None)
+    assert entries == sum(len(feed.entries) for _, feed in warm if feed is not None)
+
+    print(f"   Sequential:            {sequential_time:.3f}s")
+    print(f"   Concurrent (cold):     {cold_time:.3f}s")
+    print(f"   Concurrent (304 warm): {warm_time:.3f}s ({not_modified}/{len(urls)} not modified)")
+    print(f"   Speedup (cold):        {sequential_time / cold_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze - Article store benchmark
+Fills a throwaway store with months of synthetic poll cycles, then times per-cycle upserts
+and /api/search queries against the full history
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from email.utils import formatdate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_store import ArticleStore
+
+WORDS = ('election budget climate storm market shares central bank inflation court ruling minister '
+         'vaccine trial football final championship startup funding outage satellite launch wildfire '
+         'earthquake summit treaty strike union housing energy prices technology privacy regulation').split()
+QUERIES = ['climate', 'central bank', 'inflation prices', 'football final', 'satellite laun', 'court']
+
+
+def synthetic_article(rng, number, published):
+    title = ' '.join(rng.choice(WORDS) for _ in range(8)).capitalize()
+    summary = ' '.join(rng.choice(WORDS) for _ in range(60))
+    return {
+        'id': f"{number:08x}",
+        'guid': f"urn:bench:{number}",
+        'title': f"{title} {number}",
+        'link': f"https://example.com/{number}",
+        'source': f"Feed {number % 7}",
+        'published': formatdate(published),
+        'summary': summary
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--days', type=int, default=90, help='days of history')
+    parser.add_argument('--cycles-per-day', type=int, default=24)
+    parser.add_argument('--new-per-cycle', type=int, default=8, help='articles first seen each cycle')
+    parser.add_argument('--live', type=int, default=70, help='articles present in each poll')
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    print("🔎 NewsBreeze article store benchmark")
+    print("=" * 40)
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as directory:
+        store = ArticleStore(os.path.join(directory, 'articles.sqlite3'))
+        summarize = lambda texts: [text[:200] for text in texts]
+
+        cycles = args.days * args.cycles_per_day
+        started_at = time.time() - args.days * 86400
+        live, number, sync_seconds = [], 0, []
+        for cycle in range(cycles):
+            published = started_at + cycle * 86400 / args.cycles_per_day
+            for _ in range(args.new_per_cycle):
+                live.append(synthetic_article(rng, number, published))
+                number += 1
+            live = live[-args.live:]
+            began = time.perf_counter()
+            store.sync(list(live), summarize, model='bench')
+            sync_seconds.append(time.perf_counter() - began)
+
+        search_seconds = []
+        for i in range(args.queries):
+            began = time.perf_counter()
+            store.search(QUERIES[i % len(QUERIES)], limit=20)
+            search_seconds.append(time.perf_counter() - began)
+
+        stats = store.stats()
+        size_mb = os.path.getsize(store.path) / 1e6
+
+    search_seconds.sort()
+    print(f"   History:      {stats['history']} articles over {args.days} days ({size_mb:.1f} MB)")
+    print(f"   Poll upsert:  median {statistics.median(sync_seconds) * 1000:.2f} ms "
+          f"for {args.live} articles")
+    print(f"   Search:       median {statistics.median(search_seconds) * 1000:.2f} ms, "
+          f"p95 {search_seconds[int(len(search_seconds) * 0.95) - 1] * 1000:.2f} ms "
+          f"(full-text index: {stats['full_text_search']})")
+
+
+if __name__ == '__main__':
+    main()
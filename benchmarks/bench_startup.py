@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze - Startup benchmark
+Measures import time and RSS of app.py in a fresh interpreter, and time to first /api/health.
+Background services stay off and the probe runs in a temp directory, so no models load, no
+feeds are fetched and nothing is written into the checkout.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, resource, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+health = client.get('/api/health')
+voices = client.get('/api/voices')
+answered = time.perf_counter()
+print(json.dumps({
+    'import_seconds': imported - start,
+    'first_health_seconds': answered - start,
+    'health_status': health.status_code,
+    'voices_status': voices.status_code,
+    'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'heavy_modules': sorted(m for m in ('torch', 'transformers', 'TTS') if m in sys.modules)
+}))
+"""
+
+
+def probe():
+    env = dict(os.environ, BACKGROUND_SERVICES_ENABLED='False', PRERENDER_ENABLED='False',
+               PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    with tempfile.TemporaryDirectory(prefix='newsbreeze-startup-') as directory:
+        output = subprocess.run([sys.executable, '-c', PROBE], cwd=directory, env=env,
+                                capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    print("🚀 NewsBreeze startup benchmark")
+    print("=" * 40)
+
+    runs = [probe() for _ in range(args.runs)]
+    result = {
+        'runs': args.runs,
+        'import_seconds_median': statistics.median(r['import_seconds'] for r in runs),
+        'first_health_seconds_median': statistics.median(r['first_health_seconds'] for r in runs),
+        'rss_mb_max': max(r['rss_mb'] for r in runs),
+        'heavy_modules': runs[-1]['heavy_modules'],
+        'status_codes': [runs[-1]['health_status'], runs[-1]['voices_status']]
+    }
+
+    print(f"   import app:           {result['import_seconds_median'] * 1000:.0f} ms (median of {args.runs})")
+    print(f"   first /api/health:    {result['first_health_seconds_median'] * 1000:.0f} ms after start")
+    print(f"   RSS after import:     {result['rss_mb_max']:.0f} MB")
+    print(f"   Heavy modules loaded: {', '.join(result['heavy_modules']) or 'none'}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze - Summarization throughput benchmark
+Compares articles/sec for per-article calls against BatchSummarizer at several batch sizes
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from summarization import BatchSummarizer
+
+SENTENCES = [
+    "The city council approved a revised budget on Monday after weeks of debate over transit funding.",
+    "Officials said the plan adds late-night bus service and freezes fares for the next two years.",
+    "Opposition members argued the spending depends on optimistic forecasts for property tax revenue.",
+    "Business groups welcomed the infrastructure measures but warned about rising construction costs.",
+    "The mayor is expected to sign the budget into law before the start of the fiscal year.",
+    "Analysts noted that similar programmes in neighbouring regions took several years to pay off.",
+]
+
+
+def make_articles(count):
+    """Deterministic articles of varying length, like a mixed set of RSS summaries"""
+    articles = []
+    for i in range(count):
+        sentences = 1 + i % len(SENTENCES)
+        articles.append(' '.join(SENTENCES[(i + j) % len(SENTENCES)] for j in range(sentences)))
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', default=Config.SUMMARIZATION_MODEL)
+    parser.add_argument('--articles', type=int, default=32)
+    parser.add_argument('--batch-sizes', default='2,4,8,16')
+    args = parser.parse_args()
+
+    from transformers import pipeline
+
+    print("🤖 NewsBreeze summarization benchmark")
+    print("=" * 40)
+    print(f"   Model: {args.model}, {args.articles} articles")
+
+    summarizer = pipeline("summarization", model=args.model)
+    texts = make_articles(args.articles)
+    max_length, min_length = Config.SUMMARY_MAX_LENGTH, Config.SUMMARY_MIN_LENGTH
+
+    # Warm up so the first measurement doesn't pay lazy initialisation
+    summarizer(texts[0], max_length=max_length, min_length=min_length, do_sample=False)
+
+    start = time.perf_counter()
+    for text in texts:
+        summarizer(text, max_length=max_length, min_length=min_length, do_sample=False, truncation=True)
+    sequential = len(texts) / (time.perf_counter() - start)
+    print(f"   Sequential:      {sequential:6.2f} articles/sec")
+
+    for batch_size in [int(size) for size in args.batch_sizes.split(',')]:
+        batcher = BatchSummarizer(summarizer, batch_size)
+        start = time.perf_counter()
+        results = batcher.summarize(texts, max_length, min_length)
+        throughput = len(texts) / (time.perf_counter() - start)
+        failed = sum(result is None for result in results)
+        print(f"   Batch size {batch_size:3d}:  {throughput:6.2f} articles/sec "
+              f"({throughput / sequential:.2f}x, {failed} failed)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+NewsBreeze - Fake models for benchmarks
+Deterministic stand-ins for the summarization pipeline and Coqui TTS with configurable latency
+"""
+
+import math
+import time
+
+
+class FakeSummarizer:
+    """Callable like a transformers summarization pipeline; returns the leading words of each text"""
+
+    def __init__(self, batch_latency=0.05, item_latency=0.02):
+        self.batch_latency = batch_latency
+        self.item_latency = item_latency
+
+    def __call__(self, texts, max_length=100, **kwargs):
+        if isinstance(texts, str):
+            texts = [texts]
+        time.sleep(self.batch_latency + self.item_latency * len(texts))
+        return [{'summary_text': ' '.join(text.split()[:max(5, max_length // 2)])} for text in texts]
+
+
+class _Synthesizer:
+    def __init__(self, sample_rate):
+        self.output_sample_rate = sample_rate
+
+
+class FakeTTS:
+    """Coqui TTS lookalike; produces a tone whose length follows the text"""
+
+    is_multi_speaker = False
+    is_multi_lingual = False
+
+    def __init__(self, char_latency=0.002, sample_rate=16000, seconds_per_char=0.06):
+        self.char_latency = char_latency
+        self.seconds_per_char = seconds_per_char
+        self.synthesizer = _Synthesizer(sample_rate)
+
+    def tts(self, text, **kwargs):
+        import numpy as np
+
+        time.sleep(self.char_latency * len(text))
+        count = int(len(text) * self.seconds_per_char * self.synthesizer.output_sample_rate)
+        return 0.3 * np.sin(np.arange(count, dtype=np.float32) * (2 * math.pi * 220 / self.synthesizer.output_sample_rate))
+
+
+def install(registry, summary_latency=(0.05, 0.02), tts_char_latency=0.002):
+    """Replace the registry's real model loaders with the fakes"""
+    registry.register('summarizer', lambda settings: (FakeSummarizer(*summary_latency), 'fake-summarizer'))
+    registry.register('tts', lambda settings: (FakeTTS(tts_char_latency), 'fake-tts'))
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze - Offline load test
+Serves fixture feeds locally, runs the app with fake models of configurable latency,
+drives /api/news and /api/audio at a given concurrency and reports latency percentiles,
+requests per second and the server's peak RSS. Results can be saved and compared.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import fake_models
+from benchmarks.stub_feed_server import StubFeedServer
+
+
+def serve(args):
+    """Child process: the app with fake models on an ephemeral port"""
+    import logging
+
+    # Keep cache/ and static/ out of the working tree
+    os.chdir(tempfile.mkdtemp(prefix='newsbreeze-load-'))
+    os.environ.update(
+        MODEL_SERVER_ENABLED='False',
+        ARTICLE_BODY_ENABLED='False',
+        PRERENDER_ENABLED=str(args.prerender),
+        NEWS_REFRESH_INTERVAL='3600'
+    )
+
+    import app as newsbreeze
+    from werkzeug.serving import make_server
+
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    fake_models.install(newsbreeze.model_registry, (args.summary_batch_latency, args.summary_item_latency),
+                        args.tts_char_latency)
+    newsbreeze.app.config['RSS_FEEDS'] = args.feed_urls.split(',')
+    newsbreeze.start_background_services()
+
+    def report_and_exit(signum, frame):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(json.dumps({'peak_rss_mb': peak}), flush=True)
+        os._exit(0)
+
+    signal.signal(signal.SIGTERM, report_and_exit)
+    server = make_server('127.0.0.1', 0, newsbreeze.app, threaded=True)
+    print(json.dumps({'port': server.port}), flush=True)
+    server.serve_forever()
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def summarize_latencies(samples, wall_seconds):
+    latencies = sorted(sample['seconds'] for sample in samples if sample['ok'])
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if not sample['ok']),
+        'rps': round(len(samples) / wall_seconds, 2) if wall_seconds else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None
+    }
+
+
+def wait_ready(base_url, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            status = requests.get(f"{base_url}/api/status", timeout=5).json()
+            if status['models_ready'] and status['news']['generation']:
+                return status
+        except (requests.RequestException, ValueError):
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not become ready in time")
+
+
+def build_plan(args, articles, sources):
+    """Deterministic request mix: (endpoint, path) pairs"""
+    rng = random.Random(args.seed)
+    audio_articles = articles[:args.audio_articles]
+    plan = []
+    for _ in range(args.warmup + args.requests):
+        if audio_articles and rng.random() < args.audio_ratio:
+            article = rng.choice(audio_articles)
+            voice = rng.choice(args.voices.split(','))
+            plan.append(('audio', f"/api/audio/{article['id']}",
+                         {'text': article['ai_summary'], 'voice': voice, 'format': args.audio_format}))
+        else:
+            params = rng.choice([{}, {'limit': 5}, {'source': rng.choice(sources)} if sources else {}])
+            plan.append(('news', '/api/news', params))
+    return plan
+
+
+def run_load(base_url, plan, concurrency, warmup):
+    local = threading.local()
+
+    def session():
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        return local.session
+
+    def execute(item):
+        endpoint, path, params = item
+        started = time.perf_counter()
+        try:
+            response = session().get(base_url + path, params=params, timeout=120)
+            ok = response.status_code == 200 and len(response.content) > 0
+        except requests.RequestException:
+            ok = False
+        return {'endpoint': endpoint, 'ok': ok, 'seconds': time.perf_counter() - started}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(execute, plan[:warmup]))
+        started = time.perf_counter()
+        samples = list(executor.map(execute, plan[warmup:]))
+        wall_seconds = time.perf_counter() - started
+    return samples, wall_seconds
+
+
+def compare(result, baseline, tolerance):
+    """Regressions: p95 up or throughput down by more than tolerance"""
+    regressions = []
+    for name, current in result['endpoints'].items():
+        before = baseline.get('endpoints', {}).get(name)
+        if not before:
+            continue
+        if before['p95_ms'] and current['p95_ms'] and current['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name} p95 {before['p95_ms']} -> {current['p95_ms']} ms")
+        if before['rps'] and current['rps'] and current['rps'] < before['rps'] * (1 - tolerance):
+            regressions.append(f"{name} rps {before['rps']} -> {current['rps']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--audio-ratio', type=float, default=0.2, help='share of requests hitting /api/audio')
+    parser.add_argument('--audio-articles', type=int, default=5, help='distinct articles voiced (controls cache hits)')
+    parser.add_argument('--audio-format', default='wav')
+    parser.add_argument('--voices', default='default')
+    parser.add_argument('--feeds', type=int, default=5)
+    parser.add_argument('--items', type=int, default=10, help='items per stub feed')
+    parser.add_argument('--summary-batch-latency', type=float, default=0.05)
+    parser.add_argument('--summary-item-latency', type=float, default=0.02)
+    parser.add_argument('--tts-char-latency', type=float, default=0.002)
+    parser.add_argument('--prerender', action='store_true', help='leave background pre-rendering on')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--compare', help='baseline results JSON; exit 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--feed-urls', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return 0
+
+    print("🏋️  NewsBreeze load test")
+    print("=" * 40)
+    print(f"   {args.requests} requests at concurrency {args.concurrency}, "
+          f"{args.audio_ratio:.0%} audio, {args.feeds} feeds x {args.items} items")
+
+    names = [f"feed{i}" for i in range(args.feeds)]
+    with StubFeedServer(feeds=names, items=args.items) as stub:
+        command = [sys.executable, os.path.abspath(__file__), '--serve', '--feed-urls', ','.join(stub.feed_urls()),
+                   '--summary-batch-latency', str(args.summary_batch_latency),
+                   '--summary-item-latency', str(args.summary_item_latency),
+                   '--tts-char-latency', str(args.tts_char_latency)]
+        if args.prerender:
+            command.append('--prerender')
+        server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+        try:
+            port = json.loads(server.stdout.readline())['port']
+            base_url = f"http://127.0.0.1:{port}"
+            started = time.perf_counter()
+            wait_ready(base_url, timeout=120)
+            ready_seconds = time.perf_counter() - started
+
+            articles = requests.get(f"{base_url}/api/news", params={'limit': 100, 'full': 1}).json()['articles']
+            sources = sorted({article['source'] for article in articles})
+            plan = build_plan(args, articles, sources)
+            samples, wall_seconds = run_load(base_url, plan, args.concurrency, args.warmup)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            output = server.communicate(timeout=30)[0]
+        server_stats = json.loads(output.strip().splitlines()[-1]) if output.strip() else {}
+
+    result = {
+        'config': {key: value for key, value in vars(args).items() if key not in ('serve', 'feed_urls', 'json', 'compare')},
+        'ready_seconds': round(ready_seconds, 2),
+        'overall': summarize_latencies(samples, wall_seconds),
+        'endpoints': {
+            endpoint: summarize_latencies([s for s in samples if s['endpoint'] == endpoint], wall_seconds)
+            for endpoint in sorted({sample['endpoint'] for sample in samples})
+        },
+        'server_peak_rss_mb': server_stats.get('peak_rss_mb'),
+        'timestamp': time.time()
+    }
+
+    print(f"   Ready after {result['ready_seconds']}s, server peak RSS {result['server_peak_rss_mb'] or 0:.0f} MB")
+    for name, stats in [('overall', result['overall'])] + list(result['endpoints'].items()):
+        print(f"   {name:8s} {stats['requests']:5d} req  {stats['rps'] or 0:8.1f} req/s  "
+              f"p50 {stats['p50_ms'] or 0:8.1f} ms  p95 {stats['p95_ms'] or 0:8.1f} ms  "
+              f"p99 {stats['p99_ms'] or 0:8.1f} ms  errors {stats['errors']}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"   ❌ Regression: {regression}")
+        if regressions:
+            return 1
+        print(f"   ✅ No regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
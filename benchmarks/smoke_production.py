@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze - Production smoke check
+Runs the production layout (one model server, gunicorn with gevent workers) against local
+fixture feeds and fake models, and checks that summaries, streamed and cached audio,
+status and metrics all make it through the model server. Needs gunicorn and gevent installed.
+"""
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import fake_models
+from benchmarks.stub_feed_server import StubFeedServer
+
+# Seconds for every process to have written its metrics (METRICS_FLUSH_INTERVAL is 1 here)
+METRICS_SETTLE = 2
+# Worker log lines that mean a request path is broken even if the endpoint answered
+LOG_FAILURES = ('Traceback', 'BlockingIOError', 'Error in summarization', 'Error generating audio')
+
+
+def create_app():
+    """gunicorn entry point: the app, polling the stub feeds"""
+    import app as newsbreeze
+
+    newsbreeze.app.config['RSS_FEEDS'] = os.environ['SMOKE_FEED_URLS'].split(',')
+    return newsbreeze.app
+
+
+def serve_models():
+    """Child process: the model server with fake models"""
+    import logging
+
+    from config import config
+    from model_server import ModelServer
+
+    logging.basicConfig(level=logging.WARNING)
+    settings = config['production']
+    settings = {key: getattr(settings, key) for key in dir(settings) if key.isupper()}
+    server = ModelServer(settings)
+    fake_models.install(server.registry)
+    server.serve_forever()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(base_url, workers, timeout):
+    """Status once every worker has the models and a news snapshot.
+
+    Each worker only starts connecting to the model server on its first request, so status
+    is polled with several concurrent requests until a whole round answers ready.
+    """
+    def status(_):
+        try:
+            return requests.get(f"{base_url}/api/status", timeout=5).json()
+        except (requests.RequestException, ValueError):
+            return None
+
+    deadline = time.time() + timeout
+    with ThreadPoolExecutor(max_workers=workers * 4) as executor:
+        while time.time() < deadline:
+            answers = list(executor.map(status, range(workers * 4)))
+            if all(answer and answer['models_ready'] and answer['news']['generation'] for answer in answers):
+                return answers[0]
+            time.sleep(0.5)
+    raise RuntimeError("Server did not become ready in time")
+
+
+def wait_summarized(base_url, timeout):
+    """Articles once the model has summarized all of them (a snapshot built before the
+    models loaded is rebuilt with model summaries)"""
+    deadline = time.time() + timeout
+    while True:
+        articles = requests.get(f"{base_url}/api/news", params={'limit': 100, 'full': 1}, timeout=30).json()['articles']
+        # The truncation fallback ends in '...'; the fake summarizer never does
+        if articles and not any(article['ai_summary'].endswith('...') for article in articles):
+            return articles
+        if time.time() > deadline:
+            return None
+        time.sleep(0.5)
+
+
+def fetch_audio(base_url, article, stream):
+    params = {'text': article['ai_summary'], 'voice': 'default', 'format': 'wav'}
+    if stream:
+        params['stream'] = '1'
+    response = requests.get(f"{base_url}/api/audio/{article['id']}", params=params, timeout=120)
+    return response.status_code == 200 and response.content[:4] == b'RIFF'
+
+
+def run_checks(base_url, workers, concurrency):
+    """(name, passed) for each check against the running server"""
+    status = wait_ready(base_url, workers, timeout=120)
+    checks = [('model server status over IPC', status['models_ready'])]
+
+    articles = wait_summarized(base_url, timeout=60)
+    checks.append(("articles summarized by the model", articles is not None))
+    articles = articles or []
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        streamed = list(executor.map(lambda article: fetch_audio(base_url, article, True), articles[:concurrency]))
+        cached = list(executor.map(lambda article: fetch_audio(base_url, article, False), articles[:concurrency]))
+    checks.append((f"{concurrency} concurrent streamed renders", all(streamed)))
+    checks.append((f"{concurrency} concurrent cached/complete renders", all(cached)))
+
+    # TTS is timed in the model server and requests in every worker; any worker reports them all
+    time.sleep(METRICS_SETTLE)
+    body = requests.get(f"{base_url}/metrics", timeout=10).text
+    audio_requests = sum(float(line.rsplit(' ', 1)[1]) for line in body.splitlines()
+                         if line.startswith('newsbreeze_request_seconds_count{route="/api/audio/<article_id>"'))
+    checks.append(("host-wide metrics from any worker",
+                   'newsbreeze_tts_seconds_count' in body and audio_requests >= 2 * len(articles[:concurrency])))
+    return checks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--feeds', type=int, default=3)
+    parser.add_argument('--model-server', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.model_server:
+        serve_models()
+        return 0
+
+    print("🔥 NewsBreeze production smoke check")
+    print("=" * 40)
+
+    directory = tempfile.mkdtemp(prefix='newsbreeze-smoke-')
+    port = free_port()
+    log_path = os.path.join(directory, 'gunicorn.log')
+    names = [f"feed{i}" for i in range(args.feeds)]
+
+    with StubFeedServer(feeds=names, items=5) as stub:
+        env = dict(
+            os.environ,
+            FLASK_CONFIG='production',
+            MODEL_SERVER_ENABLED='True',
+            MODEL_SERVER_SOCKET=os.path.join(directory, 'models.sock'),
+            ARTICLE_BODY_ENABLED='False',
+            NEWS_REFRESH_INTERVAL='3600',
+            METRICS_FLUSH_INTERVAL='1',
+            SMOKE_FEED_URLS=','.join(stub.feed_urls())
+        )
+        # Same layout as run.py in production, with everything written under the temp directory
+        model_server = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--model-server'],
+                                        cwd=directory, env=env)
+        with open(log_path, 'w') as log:
+            web = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-w', str(args.workers), '-k', 'gevent',
+                                    '--pythonpath', ROOT, '-b', f"127.0.0.1:{port}",
+                                    'benchmarks.smoke_production:create_app()'],
+                                   cwd=directory, env=env, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            checks = run_checks(f"http://127.0.0.1:{port}", args.workers, args.concurrency)
+        except (RuntimeError, requests.RequestException, ValueError) as e:
+            checks = [(f"server answered ({e})", False)]
+        finally:
+            # Workers first, so background renders do not log the model server going away
+            web.send_signal(signal.SIGTERM)
+            web.wait(timeout=30)
+            model_server.terminate()
+            model_server.wait(timeout=30)
+
+    with open(log_path) as log:
+        failures = [line.rstrip() for line in log if any(marker in line for marker in LOG_FAILURES)]
+    checks.append(("no errors in the worker log", not failures))
+
+    for name, passed in checks:
+        print(f"   {'✅' if passed else '❌'} {name}")
+    for line in failures[:10]:
+        print(f"      {line}")
+    print(f"   Logs: {log_path}")
+    return 0 if all(passed for _, passed in checks) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
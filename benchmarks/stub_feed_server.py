@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze - Local stub RSS server
+Serves deterministic fixture feeds with configurable latency and ETag support
+"""
+
+import hashlib
+import random
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RSS_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+<channel>
+<title>{title}</title>
+<link>http://localhost/{name}</link>
+<description>Stub feed {name}</description>
+<ttl>5</ttl>
+{items}
+</channel>
+</rss>
+"""
+
+ITEM_TEMPLATE = """<item>
+<title>{title}</title>
+<link>{link}</link>
+<guid>{link}</guid>
+<description>{body}</description>
+<pubDate>{published}</pubDate>
+<author>desk@{name}.example</author>
+</item>"""
+
+
+VOCABULARY = ("officials council transit plan service routes ticketing network minister budget "
+              "election vote court ruling appeal storm flooding coast rescue market shares "
+              "investors rates inflation hospital patients vaccine study researchers climate "
+              "emissions energy wind solar grid strike workers union wages talks summit leaders "
+              "border trade tariffs exports factory jobs school teachers students exams police "
+              "investigation suspect charges airline flights delays airport festival crowd").split()
+
+
+def story_body(name, generation, index, words=60):
+    """Deterministic pseudo-article text, distinct for every feed/edition/item"""
+    rng = random.Random(f"{name}-{generation}-{index}")
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(words)).capitalize() + '.'
+
+
+def build_feed(name, items=10, generation=0):
+    """Build a fixture RSS document for the named feed"""
+    published = formatdate(usegmt=True)
+    entries = []
+    for i in range(items):
+        link = f"http://localhost/{name}/story-{generation}-{i}"
+        entries.append(ITEM_TEMPLATE.format(
+            title=f"{name.title()} story {i} (edition {generation})",
+            link=link,
+            body=story_body(name, generation, i, words=40 + 20 * (i % 3)),
+            published=published,
+            name=name
+        ))
+    return RSS_TEMPLATE.format(title=f"{name.title()} Stub News", name=name, items='\n'.join(entries))
+
+
+class StubFeedServer:
+    """Threaded HTTP server that serves fixture feeds at /feeds/<name>.xml"""
+
+    def __init__(self, feeds=None, delays=None, items=10, host='127.0.0.1', port=0):
+        self.feeds = {name: build_feed(name, items) for name in (feeds or ['alpha', 'beta', 'gamma'])}
+        self.delays = delays or {}
+        self.requests_served = 0
+        self.not_modified_served = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                name = self.path.strip('/').split('/')[-1].replace('.xml', '')
+                document = server.feeds.get(name)
+                with server._lock:
+                    server.requests_served += 1
+                if document is None:
+                    self.send_error(404)
+                    return
+
+                time.sleep(server.delays.get(name, 0))
+
+                body = document.encode('utf-8')
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    with server._lock:
+                        server.not_modified_served += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def feed_urls(self):
+        return [f"{self.base_url}/feeds/{name}.xml" for name in self.feeds]
+
+    def update_feed(self, name, generation, items=10):
+        """Publish a new edition of a feed (changes its ETag)"""
+        self.feeds[name] = build_feed(name, items, generation)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == '__main__':
+    with StubFeedServer() as stub:
+        print(f"Serving stub feeds at {stub.base_url}")
+        for url in stub.feed_urls():
+            print(f"   {url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
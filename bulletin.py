@@ -0,0 +1,168 @@
+"""
+NewsBreeze - Audio bulletins
+Joins the per-article audio segments for the top stories into one WAV with an intro sting
+and short transitions. A bulletin is cached under a hash of its ordered segments, so it is
+only assembled again when the story list, a summary or the stings change.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+from audio_stream import wav_header
+
+logger = logging.getLogger(__name__)
+
+# Bump when the generated stings or the assembly format change, so cached bulletins are rebuilt
+ASSEMBLY_VERSION = '1'
+# Rising major triad for the intro, a single soft note between stories (Hz, seconds)
+INTRO_NOTES = ((523.25, 0.18), (659.25, 0.18), (783.99, 0.36))
+TRANSITION_NOTES = ((880.0, 0.12),)
+PAUSE_SECONDS = 0.35
+
+
+def bulletin_name(segment_paths, voice, sting_id):
+    """File name of a bulletin: hash of the ordered segments; the voice suffix keeps audio cache keys uniform"""
+    digest = hashlib.sha1(ASSEMBLY_VERSION.encode())
+    digest.update(sting_id.encode())
+    for path in segment_paths:
+        digest.update(b'\x1f' + os.path.basename(path).encode())
+    return f"bulletin-{digest.hexdigest()[:24]}_{voice}.wav"
+
+
+def chime(sample_rate, notes, volume=0.25):
+    """16-bit mono PCM for a sequence of softly enveloped sine notes"""
+    import numpy as np
+
+    parts = []
+    for frequency, seconds in notes:
+        t = np.arange(int(sample_rate * seconds), dtype=np.float32) / sample_rate
+        envelope = np.minimum(1.0, t / 0.01) * np.exp(-3.0 * t / seconds)
+        parts.append(np.sin(2 * np.pi * frequency * t) * envelope * volume)
+    samples = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+
+
+def silence(sample_rate, seconds):
+    return b'\x00\x00' * int(sample_rate * seconds)
+
+
+def load_pcm(path, sample_rate):
+    """16-bit mono PCM of an audio file at sample_rate; matching WAVs are read directly, anything else via ffmpeg"""
+    try:
+        with wave.open(path, 'rb') as source:
+            if (source.getframerate(), source.getnchannels(), source.getsampwidth()) == (sample_rate, 1, 2):
+                return source.readframes(source.getnframes())
+    except (wave.Error, EOFError):
+        pass
+
+    from pydub import AudioSegment
+
+    segment = AudioSegment.from_file(path)
+    return segment.set_frame_rate(sample_rate).set_channels(1).set_sample_width(2).raw_data
+
+
+class BulletinBuilder:
+    """Assemble bulletins from cached or freshly rendered article segments"""
+
+    def __init__(self, directory, segment_path, render_segment, on_written=None, discard=None,
+                 intro_sting=None, transition_sting=None, max_workers=4):
+        self.directory = directory
+        self.segment_path = segment_path  # (text, voice) -> WAV path of the article's segment
+        self.render_segment = render_segment  # (text, voice) -> rendered path or None
+        self.on_written = on_written  # called with each bulletin file written
+        self.discard = discard  # called with a cached segment that vanished before use
+        self.intro_sting = intro_sting
+        self.transition_sting = transition_sting
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bulletin')
+        self._stings = {}  # sample rate -> (intro PCM, transition PCM)
+
+    @property
+    def sting_id(self):
+        """Identity of the stings in use, part of every bulletin's cache key"""
+        parts = []
+        for path in (self.intro_sting, self.transition_sting):
+            if path and os.path.isfile(path):
+                parts.append(f"{os.path.basename(path)}:{os.path.getmtime(path)}")
+            else:
+                parts.append('chime')
+        return '|'.join(parts)
+
+    def segments(self, texts, voice, is_cached):
+        """Segment paths in order, rendering the missing ones in parallel; failed renders are left out.
+
+        A segment that was cached when looked up but has gone since (evicted by another
+        worker) is discarded and rendered again rather than silently dropped.
+        """
+        paths = [self.segment_path(text, voice) for text in texts]
+        missing = [i for i, path in enumerate(paths) if not is_cached(path)]
+        for attempt in range(2):
+            if missing:
+                logger.info(f"Bulletin: rendering {len(missing)} of {len(texts)} segments")
+                rendered = self._executor.map(lambda i: self.render_segment(texts[i], voice), missing)
+                for i, path in zip(missing, rendered):
+                    paths[i] = path
+            missing = [i for i, path in enumerate(paths) if path and not os.path.exists(path)]
+            if not missing or attempt:
+                break
+            logger.warning(f"Bulletin: {len(missing)} cached segments disappeared, rendering them again")
+            for i in missing:
+                if self.discard:
+                    self.discard(paths[i])
+        return [path for path in paths if path and os.path.exists(path)]
+
+    def _sting_pcm(self, sample_rate):
+        stings = self._stings.get(sample_rate)
+        if stings is None:
+            stings = []
+            for path, notes in ((self.intro_sting, INTRO_NOTES), (self.transition_sting, TRANSITION_NOTES)):
+                if path and os.path.isfile(path):
+                    try:
+                        stings.append(load_pcm(path, sample_rate))
+                        continue
+                    except Exception as e:
+                        logger.warning(f"Could not load sting {path}, using a generated chime: {e}")
+                stings.append(chime(sample_rate, notes))
+            stings = self._stings[sample_rate] = tuple(stings)
+        return stings
+
+    def assemble(self, segment_paths, path):
+        """Write intro, segments and transitions as one WAV at path (temp file, then rename)"""
+        with wave.open(segment_paths[0], 'rb') as first:
+            sample_rate = first.getframerate()
+        intro, transition = self._sting_pcm(sample_rate)
+        pause = silence(sample_rate, PAUSE_SECONDS)
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix='.part', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                out.write(wav_header(sample_rate))
+                data_size = 0
+                for chunk in (intro, pause):
+                    out.write(chunk)
+                    data_size += len(chunk)
+                for i, segment_path in enumerate(segment_paths):
+                    if i:
+                        for chunk in (pause, transition, pause):
+                            out.write(chunk)
+                            data_size += len(chunk)
+                    pcm = load_pcm(segment_path, sample_rate)
+                    out.write(pcm)
+                    data_size += len(pcm)
+                out.seek(0)
+                out.write(wav_header(sample_rate, data_size))
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        logger.info(f"Bulletin assembled: {path} ({len(segment_paths)} segments, "
+                    f"{data_size / 2 / sample_rate:.0f}s)")
+        if self.on_written:
+            self.on_written(path)
+        return path
@@ -19,40 +19,118 @@ class Config:
         "https://feeds.washingtonpost.com/rss/world",
         "https://www.theguardian.com/world/rss",
     ]
+    FEED_TIMEOUT = int(os.environ.get('FEED_TIMEOUT', 10))  # seconds per feed
+    FEED_MAX_WORKERS = int(os.environ.get('FEED_MAX_WORKERS', 8))
+    # Per-feed polling: intervals adapt between these bounds (publisher ttl/Cache-Control can lengthen them)
+    FEED_MIN_INTERVAL = int(os.environ.get('FEED_MIN_INTERVAL', 60))  # seconds
+    FEED_MAX_INTERVAL = int(os.environ.get('FEED_MAX_INTERVAL', 3600))
+    FEED_BACKOFF_BASE = int(os.environ.get('FEED_BACKOFF_BASE', 60))  # first retry delay, doubled per failure
+    FEED_MAX_BACKOFF = int(os.environ.get('FEED_MAX_BACKOFF', 3600))
+    FEED_BREAKER_THRESHOLD = int(os.environ.get('FEED_BREAKER_THRESHOLD', 5))  # consecutive failures
+    FEED_BREAKER_COOLDOWN = int(os.environ.get('FEED_BREAKER_COOLDOWN', 1800))  # seconds paused once open
+    
+    # Full article bodies (fetched from each article's link in the background refresher)
+    ARTICLE_BODY_ENABLED = os.environ.get('ARTICLE_BODY_ENABLED', 'False').lower() == 'true'
+    ARTICLE_BODY_TIMEOUT = int(os.environ.get('ARTICLE_BODY_TIMEOUT', 10))  # seconds per page
+    ARTICLE_BODY_MAX_WORKERS = int(os.environ.get('ARTICLE_BODY_MAX_WORKERS', 8))
+    ARTICLE_BODY_PER_HOST = int(os.environ.get('ARTICLE_BODY_PER_HOST', 2))  # concurrent requests per site
+    ARTICLE_BODY_REFETCH_HOURS = int(os.environ.get('ARTICLE_BODY_REFETCH_HOURS', 6))
+    ARTICLE_BODY_MAX_CHARS = int(os.environ.get('ARTICLE_BODY_MAX_CHARS', 20000))
     
     # AI Model settings
     SUMMARIZATION_MODEL = os.environ.get('SUMMARIZATION_MODEL', 'Falconsai/text_summarization')
     SUMMARIZATION_FALLBACK = os.environ.get('SUMMARIZATION_FALLBACK', 'facebook/bart-large-cnn')
+    SUMMARIZATION_BACKEND = os.environ.get('SUMMARIZATION_BACKEND', 'torch')  # torch, int8 or onnx
     
     TTS_MODEL_PRIMARY = os.environ.get('TTS_MODEL_PRIMARY', 'tts_models/multilingual/multi-dataset/xtts_v2')
     TTS_MODEL_FALLBACK = os.environ.get('TTS_MODEL_FALLBACK', 'tts_models/en/ljspeech/tacotron2-DDC')
     
-    # Voice options
+    TTS_LANGUAGE = os.environ.get('TTS_LANGUAGE', 'en')
+    
+    # Voice options: display name and a short reference clip (WAV, ~6-10 s of clean speech),
+    # or a built-in speaker of a multi-speaker model.
+    # Speaker latents for each clip are computed once at warm-up and cached under CACHE_FOLDER/voices.
+    VOICE_FOLDER = os.environ.get('VOICE_FOLDER', 'voices')
     CELEBRITY_VOICES = {
-        "default": "Default Voice",
-        "celebrity1": "Morgan Freeman Style", 
-        "celebrity2": "David Attenborough Style",
-        "celebrity3": "News Anchor Style",
-        "celebrity4": "Radio DJ Style"
+        "default": {"name": "Default Voice", "reference": None,
+                    "speaker": os.environ.get('TTS_DEFAULT_SPEAKER', 'Ana Florence')},
+        "celebrity1": {"name": "Morgan Freeman Style", "reference": os.path.join(VOICE_FOLDER, 'celebrity1.wav')},
+        "celebrity2": {"name": "David Attenborough Style", "reference": os.path.join(VOICE_FOLDER, 'celebrity2.wav')},
+        "celebrity3": {"name": "News Anchor Style", "reference": os.path.join(VOICE_FOLDER, 'celebrity3.wav')},
+        "celebrity4": {"name": "Radio DJ Style", "reference": os.path.join(VOICE_FOLDER, 'celebrity4.wav')}
     }
     
     # Summarization settings
     SUMMARY_MAX_LENGTH = int(os.environ.get('SUMMARY_MAX_LENGTH', 100))
     SUMMARY_MIN_LENGTH = int(os.environ.get('SUMMARY_MIN_LENGTH', 30))
     ARTICLES_PER_FEED = int(os.environ.get('ARTICLES_PER_FEED', 5))
+    DEDUP_ENABLED = os.environ.get('DEDUP_ENABLED', 'True').lower() == 'true'
+    DEDUP_SIMILARITY = float(os.environ.get('DEDUP_SIMILARITY', 0.6))  # estimated Jaccard, 0-1
+    SUMMARY_BATCH_SIZE = int(os.environ.get('SUMMARY_BATCH_SIZE', 8))
+    SUMMARY_CHUNK_TOKENS = int(os.environ.get('SUMMARY_CHUNK_TOKENS', 512))  # 0 disables chunking
     
     # File paths
     STATIC_FOLDER = 'static'
     TEMPLATE_FOLDER = 'templates'
     AUDIO_FOLDER = os.path.join(STATIC_FOLDER, 'audio')
+    CACHE_FOLDER = os.environ.get('CACHE_FOLDER', 'cache')
     
     # Cache settings
     AUDIO_CACHE_ENABLED = os.environ.get('AUDIO_CACHE_ENABLED', 'True').lower() == 'true'
     CACHE_CLEANUP_HOURS = int(os.environ.get('CACHE_CLEANUP_HOURS', 24))
+    AUDIO_CACHE_MAX_MB = int(os.environ.get('AUDIO_CACHE_MAX_MB', 1024))  # whole host, all workers
+    AUDIO_CACHE_COMPACT_INTERVAL = int(os.environ.get('AUDIO_CACHE_COMPACT_INTERVAL', 600))  # seconds
+    AUDIO_CACHE_INDEX_PATH = os.environ.get('AUDIO_CACHE_INDEX_PATH', os.path.join(CACHE_FOLDER, 'audio_index.sqlite3'))
+    AUDIO_DEFAULT_FORMAT = os.environ.get('AUDIO_DEFAULT_FORMAT', 'mp3')  # opus, mp3 or wav
+    SUMMARY_CACHE_ENABLED = os.environ.get('SUMMARY_CACHE_ENABLED', 'True').lower() == 'true'
+    SUMMARY_CACHE_PATH = os.environ.get('SUMMARY_CACHE_PATH', os.path.join(CACHE_FOLDER, 'summaries.sqlite3'))
+    SUMMARY_CACHE_MAX_ENTRIES = int(os.environ.get('SUMMARY_CACHE_MAX_ENTRIES', 5000))
+    SUMMARY_CACHE_TTL_HOURS = int(os.environ.get('SUMMARY_CACHE_TTL_HOURS', 168))  # 1 week
+    ARTICLE_BODY_CACHE_PATH = os.environ.get('ARTICLE_BODY_CACHE_PATH', os.path.join(CACHE_FOLDER, 'bodies.sqlite3'))
+    ARTICLE_STORE_PATH = os.environ.get('ARTICLE_STORE_PATH', os.path.join(CACHE_FOLDER, 'articles.sqlite3'))
+    ARTICLE_STORE_RETENTION_DAYS = int(os.environ.get('ARTICLE_STORE_RETENTION_DAYS', 0))  # 0 keeps all history
     
     # Performance settings
     MODEL_LOADING_TIMEOUT = int(os.environ.get('MODEL_LOADING_TIMEOUT', 300))  # 5 minutes
-    NEWS_REFRESH_INTERVAL = int(os.environ.get('NEWS_REFRESH_INTERVAL', 300))  # 5 minutes
+    BACKGROUND_SERVICES_ENABLED = os.environ.get('BACKGROUND_SERVICES_ENABLED', 'True').lower() == 'true'  # models, refresher, caches
+    MODEL_SERVER_ENABLED = os.environ.get('MODEL_SERVER_ENABLED', 'False').lower() == 'true'
+    MODEL_SERVER_SOCKET = os.environ.get('MODEL_SERVER_SOCKET', os.path.join(CACHE_FOLDER, 'models.sock'))
+    NEWS_REFRESH_INTERVAL = int(os.environ.get('NEWS_REFRESH_INTERVAL', 300))  # longest wait between refreshes; first per-feed interval
+    NEWS_SNAPSHOT_WAIT = int(os.environ.get('NEWS_SNAPSHOT_WAIT', 30))  # first request after startup
+    NEWS_PAGE_SIZE = int(os.environ.get('NEWS_PAGE_SIZE', 20))
+    NEWS_MAX_PAGE_SIZE = int(os.environ.get('NEWS_MAX_PAGE_SIZE', 100))
+    NEWS_COMPRESS_MIN_BYTES = int(os.environ.get('NEWS_COMPRESS_MIN_BYTES', 1024))
+    
+    PRERENDER_ENABLED = os.environ.get('PRERENDER_ENABLED', 'True').lower() == 'true'
+    PRERENDER_TOP_ARTICLES = int(os.environ.get('PRERENDER_TOP_ARTICLES', 10))
+    PRERENDER_TOP_VOICES = int(os.environ.get('PRERENDER_TOP_VOICES', 2))
+    PRERENDER_CPU_BUDGET = float(os.environ.get('PRERENDER_CPU_BUDGET', 0.5))  # share of wall time
+    PRERENDER_STATE_PATH = os.environ.get('PRERENDER_STATE_PATH', os.path.join(CACHE_FOLDER, 'prerender.sqlite3'))  # voice demand, shared by workers
+    
+    # Audio bulletins (/api/bulletin)
+    BULLETIN_ARTICLES = int(os.environ.get('BULLETIN_ARTICLES', 5))  # stories per bulletin by default
+    BULLETIN_MAX_ARTICLES = int(os.environ.get('BULLETIN_MAX_ARTICLES', 15))
+    BULLETIN_RENDER_WORKERS = int(os.environ.get('BULLETIN_RENDER_WORKERS', 4))  # missing segments rendered at once
+    BULLETIN_INTRO_STING = os.environ.get('BULLETIN_INTRO_STING')  # audio file; a generated chime if unset
+    BULLETIN_TRANSITION_STING = os.environ.get('BULLETIN_TRANSITION_STING')
+    
+    # Inference scheduling (host-wide in the model server, else per worker process)
+    INFERENCE_WORKERS = int(os.environ.get('INFERENCE_WORKERS', 1))  # model calls run concurrently
+    INFERENCE_QUEUE_INTERACTIVE = int(os.environ.get('INFERENCE_QUEUE_INTERACTIVE', 8))  # /api/audio; full -> 429
+    INFERENCE_QUEUE_SUMMARIZE = int(os.environ.get('INFERENCE_QUEUE_SUMMARIZE', 4))
+    INFERENCE_QUEUE_PRERENDER = int(os.environ.get('INFERENCE_QUEUE_PRERENDER', 2))
+    TORCH_NUM_THREADS = int(os.environ.get('TORCH_NUM_THREADS', 0))  # 0 keeps torch's default
+    TORCH_INTEROP_THREADS = int(os.environ.get('TORCH_INTEROP_THREADS', 0))
+    
+    # Server-sent events (/api/stream)
+    SSE_HEARTBEAT = int(os.environ.get('SSE_HEARTBEAT', 15))  # seconds between keepalives
+    SSE_HISTORY = int(os.environ.get('SSE_HISTORY', 256))  # events kept for Last-Event-ID replay
+    SSE_AUDIO_POLL_INTERVAL = float(os.environ.get('SSE_AUDIO_POLL_INTERVAL', 2))
+    
+    # Observability
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+    METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(CACHE_FOLDER, 'metrics'))  # shared by all processes; '' for per process
+    METRICS_FLUSH_INTERVAL = int(os.environ.get('METRICS_FLUSH_INTERVAL', 5))  # seconds
     
     # API settings
     API_RATE_LIMIT = os.environ.get('API_RATE_LIMIT', '100 per hour')
@@ -65,6 +143,7 @@ class Config:
         # Create necessary directories
         os.makedirs(cls.AUDIO_FOLDER, exist_ok=True)
         os.makedirs(cls.TEMPLATE_FOLDER, exist_ok=True)
+        os.makedirs(cls.CACHE_FOLDER, exist_ok=True)
 
 class DevelopmentConfig(Config):
     """Development configuration"""
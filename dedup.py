@@ -0,0 +1,111 @@
+"""
+NewsBreeze - Article deduplication
+Merges the same story carried by several feeds before it is summarized and voiced
+"""
+
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {'fbclid', 'gclid', 'cmp', 'at_medium', 'at_campaign', 'ns_mchannel', 'ns_source',
+                   'ns_campaign', 'ns_linkname', 'ocid', 'ref', 'rss', 'src', 'feedtype', 'partner'}
+TAG = re.compile(r'<[^>]+>')
+# Scripts written without spaces between words (kana, CJK ideographs, Thai): each character
+# is a token, so their shingles are character 3-grams; everything else splits on word boundaries
+UNSPACED = '\u0e00-\u0e7f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+WORD = re.compile(f'[{UNSPACED}]|[^\\W_{UNSPACED}]+')
+
+# MinHash signature: NUM_PERM values, LSH over BANDS bands of ROWS rows each.
+# With 16 x 4 the banding catches pairs from roughly 0.5 Jaccard similarity upwards.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+MASKS = [int.from_bytes(hashlib.blake2b(str(i).encode(), digest_size=8).digest(), 'big')
+         for i in range(NUM_PERM)]
+
+
+def canonical_url(url):
+    """Normalize scheme, host and query so trivially different links compare equal"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in ('www.', 'm.', 'amp.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    path = parts.path.rstrip('/') or '/'
+    if path.endswith('/amp'):
+        path = path[:-4] or '/'
+    query = sorted((key, value) for key, value in parse_qsl(parts.query)
+                   if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS)
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def shingles(text, size=3):
+    words = WORD.findall(TAG.sub(' ', text).lower())
+    if len(words) < size:
+        return [' '.join(words)] if words else []
+    return [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def minhash(text):
+    """MinHash signature over 3-gram shingles (XOR-mask permutations of one 64-bit hash).
+
+    None when the text has no tokens at all; such an article can only match by URL.
+    """
+    hashes = [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+              for shingle in set(shingles(text))]
+    if not hashes:
+        return None
+    return tuple(min(value ^ mask for value in hashes) for mask in MASKS)
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures; an empty signature matches nothing"""
+    if a is None or b is None:
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def bands(signature):
+    """LSH band keys; similar signatures are likely to share at least one"""
+    return [(i, signature[i * ROWS:(i + 1) * ROWS]) for i in range(BANDS)]
+
+
+def cluster_articles(articles, threshold=0.6):
+    """Group duplicate articles; returns one representative per cluster with a 'sources' list"""
+    clusters = []  # [{'members': [...], 'signature': tuple}]
+    by_url = {}
+    by_band = {}
+
+    for article in articles:
+        url = canonical_url(article.get('link', ''))
+        signature = minhash(f"{article['title']} {article.get('summary', '')}")
+
+        cluster = by_url.get(url)
+        if cluster is None and signature is not None:
+            for band in bands(signature):
+                for candidate in by_band.get(band, ()):
+                    if similarity(candidate['signature'], signature) >= threshold:
+                        cluster = candidate
+                        break
+                if cluster is not None:
+                    break
+
+        if cluster is None:
+            cluster = {'members': [], 'signature': signature}
+            clusters.append(cluster)
+            for band in bands(signature) if signature is not None else ():
+                by_band.setdefault(band, []).append(cluster)
+        cluster['members'].append(article)
+        by_url.setdefault(url, cluster)
+
+    merged = []
+    for cluster in clusters:
+        members = cluster['members']
+        # The copy with the most text gives the summarizer the most to work with
+        representative = dict(max(members, key=lambda member: len(member.get('summary', ''))))
+        representative['sources'] = [
+            {'source': member['source'], 'link': member['link'], 'title': member['title']}
+            for member in members
+        ]
+        merged.append(representative)
+    return merged
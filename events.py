@@ -0,0 +1,84 @@
+"""
+NewsBreeze - Server-sent events
+One shared ring buffer of pre-encoded events; every client stream reads from it,
+so a publish costs one encode and one notify no matter how many clients are connected
+"""
+
+import logging
+import threading
+from collections import deque
+
+from news_index import dumps
+
+logger = logging.getLogger(__name__)
+
+
+def encode_event(event, payload, event_id=None):
+    """One SSE message; payload is JSON bytes (compact, so it never contains a newline)"""
+    head = f"id: {event_id}\n" if event_id is not None else ''
+    return f"{head}event: {event}\ndata: ".encode() + payload + b"\n\n"
+
+
+class EventHub:
+    """Publish/subscribe for /api/stream with Last-Event-ID replay from a bounded history"""
+
+    def __init__(self, history=256, heartbeat=15):
+        self.heartbeat = heartbeat
+        self.clients = 0
+        self.published = 0
+        self._events = deque(maxlen=history)  # (event_id, encoded message)
+        self._last_id = 0
+        self._changed = threading.Condition()
+
+    def publish(self, event, data):
+        """data is a JSON-serializable value or already-encoded JSON bytes"""
+        payload = data if isinstance(data, bytes) else dumps(data)
+        with self._changed:
+            self._last_id += 1
+            self._events.append((self._last_id, encode_event(event, payload, self._last_id)))
+            self.published += 1
+            self._changed.notify_all()
+
+    def _pending(self, cursor):
+        """Messages after cursor, or None if some were already dropped from the history"""
+        if cursor >= self._last_id:
+            return []
+        if not self._events or self._events[0][0] > cursor + 1:
+            return None
+        return [message for event_id, message in self._events if event_id > cursor]
+
+    def stream(self, last_event_id=None, hello=None):
+        """Generator of SSE bytes for one client: hello, any replay, then live events and heartbeats"""
+        with self._changed:
+            self.clients += 1
+            cursor = self._last_id
+            if last_event_id is not None and last_event_id <= self._last_id:
+                cursor = last_event_id
+
+        try:
+            # Tell EventSource how long to wait before reconnecting
+            yield b"retry: 3000\n\n"
+            if hello is not None:
+                yield encode_event('hello', dumps(hello))
+
+            while True:
+                with self._changed:
+                    if cursor >= self._last_id:
+                        self._changed.wait(self.heartbeat)
+                    pending = self._pending(cursor)
+                    cursor = self._last_id
+
+                if pending is None:
+                    # Too far behind to replay; the client reloads its article list
+                    yield encode_event('reset', b'{}', cursor)
+                elif pending:
+                    yield b''.join(pending)
+                else:
+                    yield b": keepalive\n\n"
+        finally:
+            with self._changed:
+                self.clients -= 1
+
+    def stats(self):
+        with self._changed:
+            return {'clients': self.clients, 'published': self.published, 'last_event_id': self._last_id}
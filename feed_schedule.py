@@ -0,0 +1,201 @@
+"""
+NewsBreeze - Per-feed polling schedule
+Decides when each feed is due: polls about twice per observed update interval, never sooner
+than the publisher asks (ttl, Cache-Control, Retry-After), and backs failing feeds off
+exponentially behind a circuit breaker
+"""
+
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# Publisher hints longer than this are capped, so a typo'd ttl cannot silence a feed for weeks
+MAX_HINT = 24 * 3600
+# Poll this many times per expected update interval
+POLLS_PER_UPDATE = 2
+# Weight of the newest gap in the moving average of update gaps
+GAP_SMOOTHING = 0.5
+# Spread of the randomized delays, so feeds polled together drift apart
+JITTER = 0.1
+
+MAX_AGE = re.compile(r'(?:^|,)\s*(?:s-)?max-age\s*=\s*"?(\d+)', re.IGNORECASE)
+
+
+def max_age_seconds(cache_control):
+    """max-age from a Cache-Control header, or 0"""
+    match = MAX_AGE.search(cache_control or '')
+    return int(match.group(1)) if match else 0
+
+
+def retry_after_seconds(value, now=None):
+    """Retry-After as seconds (it may be a delay or an HTTP date), or 0"""
+    if not value:
+        return 0
+    value = value.strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        return max(0, int(parsedate_to_datetime(value).timestamp() - (now or time.time())))
+    except (TypeError, ValueError):
+        return 0
+
+
+def ttl_seconds(feed):
+    """RSS <ttl> (minutes) of a parsed feed, or 0"""
+    try:
+        return int(feed.feed.get('ttl', 0)) * 60
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+def _jittered(seconds):
+    return seconds * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+class _FeedState:
+    def __init__(self, interval):
+        self.interval = interval
+        self.next_due = 0.0
+        self.last_fetch = None
+        self.last_success = None
+        self.last_change = None
+        self.update_gap = None  # moving average of seconds between observed updates
+        self.ttl = 0  # last <ttl> the feed advertised
+        self.failures = 0  # consecutive
+        self.trips = 0  # consecutive breaker openings
+        self.breaker = 'closed'
+        self.last_error = None
+        self.counts = {'fetches': 0, 'changed': 0, 'unchanged': 0, 'failures': 0, 'skipped': 0}
+
+
+class FeedScheduler:
+    """Per-feed poll intervals, failure backoff and circuit breaker state"""
+
+    def __init__(self, initial_interval=300, min_interval=60, max_interval=3600,
+                 backoff_base=60, max_backoff=3600, breaker_threshold=5, breaker_cooldown=1800):
+        self.initial_interval = initial_interval
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.breaker_threshold = max(1, breaker_threshold)
+        self.breaker_cooldown = breaker_cooldown
+        self._lock = threading.Lock()
+        self._feeds = {}
+
+    def _state(self, url):
+        state = self._feeds.get(url)
+        if state is None:
+            state = self._feeds[url] = _FeedState(self.initial_interval)
+        return state
+
+    def due(self, urls, now=None):
+        """The urls to fetch now; the rest count as skipped. Open breakers let one trial through."""
+        now = now or time.time()
+        due = []
+        with self._lock:
+            for url in urls:
+                state = self._state(url)
+                if now < state.next_due:
+                    state.counts['skipped'] += 1
+                    continue
+                if state.breaker == 'open':
+                    state.breaker = 'half-open'
+                due.append(url)
+        return due
+
+    def due_in(self, urls, now=None):
+        """Seconds until the first of urls is due (0 if one already is)"""
+        now = now or time.time()
+        with self._lock:
+            return max(0.0, min((self._state(url).next_due for url in urls), default=now) - now)
+
+    def record_success(self, url, changed, min_wait=0, ttl=None, now=None):
+        """A fetch (200 or 304) completed; changed says whether it brought new entries"""
+        now = now or time.time()
+        with self._lock:
+            state = self._state(url)
+            state.counts['fetches'] += 1
+            state.counts['changed' if changed else 'unchanged'] += 1
+            state.last_fetch = state.last_success = now
+            state.failures = state.trips = 0
+            state.breaker = 'closed'
+            state.last_error = None
+            if ttl is not None:
+                state.ttl = ttl
+
+            if changed:
+                if state.last_change is not None:
+                    gap = now - state.last_change
+                    state.update_gap = gap if state.update_gap is None else (
+                        GAP_SMOOTHING * gap + (1 - GAP_SMOOTHING) * state.update_gap)
+                state.last_change = now
+
+            if state.last_change is None:
+                interval = self.initial_interval
+            else:
+                # A feed that has been quiet for longer than usual is probably slowing down; one
+                # that has not changed since its first fetch backs off from the initial interval
+                usual = state.update_gap if state.update_gap is not None else self.initial_interval * POLLS_PER_UPDATE
+                expected = max(usual, now - state.last_change)
+                interval = expected / POLLS_PER_UPDATE
+            interval = min(self.max_interval, max(self.min_interval, interval))
+            state.interval = max(interval, min(MAX_HINT, max(min_wait, state.ttl)))
+            state.next_due = now + _jittered(state.interval)
+
+    def record_failure(self, url, error, retry_after=0, now=None):
+        """A fetch failed; returns True when this failure opened the breaker"""
+        now = now or time.time()
+        with self._lock:
+            state = self._state(url)
+            state.counts['fetches'] += 1
+            state.counts['failures'] += 1
+            state.last_fetch = now
+            state.failures += 1
+            state.last_error = str(error)
+
+            opened = state.breaker == 'half-open' or state.failures >= self.breaker_threshold
+            if opened:
+                # Each failed trial doubles the time the breaker stays open
+                delay = min(self.breaker_cooldown * 2 ** state.trips, MAX_HINT)
+                state.trips += 1
+                state.breaker = 'open'
+            else:
+                delay = min(self.max_backoff, self.backoff_base * 2 ** (state.failures - 1))
+            state.next_due = now + max(_jittered(delay), min(MAX_HINT, retry_after))
+            return opened
+
+    def is_failing(self, url):
+        with self._lock:
+            state = self._feeds.get(url)
+            return bool(state and state.failures)
+
+    def health(self, urls=None, now=None):
+        """Per-feed status for /api/status"""
+        now = now or time.time()
+        with self._lock:
+            report = {}
+            for url in urls if urls is not None else list(self._feeds):
+                state = self._state(url)
+                if state.breaker != 'closed':
+                    status = state.breaker
+                elif state.failures:
+                    status = 'backing-off'
+                elif state.last_success is None:
+                    status = 'pending'
+                else:
+                    status = 'healthy'
+                report[url] = {
+                    'status': status,
+                    'interval': round(state.interval),
+                    'next_poll_in': round(max(0.0, state.next_due - now)),
+                    'update_gap': round(state.update_gap) if state.update_gap is not None else None,
+                    'ttl': state.ttl or None,
+                    'last_success_age': round(now - state.last_success) if state.last_success else None,
+                    'consecutive_failures': state.failures,
+                    'last_error': state.last_error,
+                    **state.counts
+                }
+            return report
@@ -0,0 +1,134 @@
+"""
+NewsBreeze - RSS feed fetching
+Concurrent feed downloads over a pooled HTTP session with conditional GETs,
+optionally polling each feed only when its schedule says it is due
+"""
+
+import logging
+import threading
+
+import feedparser
+
+from feed_schedule import max_age_seconds, retry_after_seconds, ttl_seconds
+from metrics import FEED_FETCH_SECONDS, FEED_PARSE_SECONDS
+from pools import HTTPWorkers
+
+logger = logging.getLogger(__name__)
+
+
+def entry_ids(feed):
+    """Identities of a parsed feed's entries, to tell whether a 200 brought anything new"""
+    return {entry.get('id') or entry.get('link') for entry in feed.entries}
+
+
+class FeedFetcher(HTTPWorkers):
+    """Fetch RSS feeds concurrently, reusing connections and HTTP validators.
+
+    With a FeedScheduler, poll() fetches only the feeds that are due and records every
+    outcome (update frequency, publisher hints, failures) into it.
+    """
+
+    def __init__(self, timeout=10, max_workers=8, schedule=None):
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.schedule = schedule
+
+        # One pooled session shared by every worker thread
+        super().__init__(max_workers, 'feed-fetch')
+        self._lock = threading.Lock()
+        # url -> (etag, last_modified, parsed feed) from the last 200 response
+        self._validators = {}
+
+    def fetch_feed(self, url):
+        """Fetch and parse a single feed, returning the cached parse on 304"""
+        with self._lock:
+            etag, modified, cached = self._validators.get(url, (None, None, None))
+
+        headers = {}
+        if cached is not None:
+            if etag:
+                headers['If-None-Match'] = etag
+            if modified:
+                headers['If-Modified-Since'] = modified
+
+        with FEED_FETCH_SECONDS.time(url):
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        min_wait = max_age_seconds(response.headers.get('Cache-Control'))
+
+        if response.status_code == 304 and cached is not None:
+            logger.info(f"Feed not modified: {url}")
+            if self.schedule:
+                self.schedule.record_success(url, changed=False, min_wait=min_wait)
+            return cached
+
+        response.raise_for_status()
+
+        with FEED_PARSE_SECONDS.time(url):
+            feed = feedparser.parse(
+                response.content,
+                response_headers={
+                    'content-location': response.url,
+                    'content-type': response.headers.get('Content-Type', 'application/xml'),
+                }
+            )
+
+        with self._lock:
+            self._validators[url] = (
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+                feed
+            )
+        if self.schedule:
+            changed = cached is None or bool(entry_ids(feed) - entry_ids(cached))
+            self.schedule.record_success(url, changed, min_wait=min_wait, ttl=ttl_seconds(feed))
+        return feed
+
+    def _fetch_safe(self, url):
+        try:
+            logger.info(f"Fetching from: {url}")
+            return self.fetch_feed(url)
+        except Exception as e:
+            if not self.schedule:
+                logger.error(f"Error fetching from {url}: {e}")
+                return None
+
+            # Only the first failure and a breaker opening are errors; retries of a known-bad feed are not
+            response = getattr(e, 'response', None)
+            retry_after = retry_after_seconds(response.headers.get('Retry-After')) if response is not None else 0
+            first = not self.schedule.is_failing(url)
+            if self.schedule.record_failure(url, e, retry_after):
+                logger.error(f"Feed {url} keeps failing, pausing it: {e}")
+            elif first:
+                logger.error(f"Error fetching from {url}, backing off: {e}")
+            else:
+                logger.warning(f"Feed {url} still failing: {e}")
+            return None
+
+    def last_parse(self, url):
+        """The last successfully parsed copy of a feed, or None"""
+        with self._lock:
+            return self._validators.get(url, (None, None, None))[2]
+
+    def poll(self, urls):
+        """Fetch the feeds that are due; the rest (and failures) reuse their last good parse.
+
+        Returns (url, feed) pairs in input order, feed is None for feeds never fetched successfully.
+        """
+        urls = list(urls)
+        due = self.schedule.due(urls) if self.schedule else urls
+        fetched = dict(zip(due, self._executor.map(self._fetch_safe, due)))
+        if len(due) < len(urls):
+            logger.info(f"Polled {len(due)} of {len(urls)} feeds (the rest are not due yet)")
+        return [(url, fetched.get(url) or self.last_parse(url)) for url in urls]
+
+    def due_in(self, urls):
+        """Seconds until the next feed is due for polling"""
+        return self.schedule.due_in(urls) if self.schedule else 0.0
+
+    def health(self, urls=None):
+        return self.schedule.health(urls) if self.schedule else None
+
+    def fetch_all(self, urls):
+        """Fetch feeds in parallel; returns (url, feed) pairs in input order, feed is None on failure"""
+        urls = list(urls)
+        return list(zip(urls, self._executor.map(self._fetch_safe, urls)))
@@ -0,0 +1,288 @@
+"""
+NewsBreeze - Metrics
+Minimal Prometheus text-format histograms, counters and callback gauges.
+Every hook checks one flag first, so instrumentation costs next to nothing when disabled.
+With a shared directory, every process on the host (web workers and the model server)
+writes its series there and /metrics on any worker reports the host-wide totals.
+"""
+
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+PER_CHAR_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)] + list(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _merge(series, exported):
+    """Add one process's exported series (label values -> count or histogram list) into series"""
+    for label_values, value in exported:
+        label_values = tuple(label_values)
+        previous = series.get(label_values)
+        if previous is None:
+            series[label_values] = value
+        elif isinstance(value, list):
+            series[label_values] = [a + b for a, b in zip(previous, value)]
+        else:
+            series[label_values] = previous + value
+
+
+class Registry:
+    """Holds every metric; render() produces the /metrics body"""
+
+    def __init__(self):
+        self.enabled = False
+        self.metrics = []
+        self.directory = None
+        self.flush_interval = 5
+        self._flusher = None
+        self._scrape = threading.local()  # totals of the render in progress, for callbacks using total()
+
+    def configure(self, enabled, directory=None, flush_interval=5):
+        """directory, shared by the processes of one host, makes histograms and per-process
+        counters host-wide: each process writes its own file there, render() adds them up"""
+        self.enabled = enabled
+        self.directory = directory if enabled else None
+        self.flush_interval = flush_interval
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def clear(self):
+        """Remove the files of an earlier run, before the host's processes start"""
+        if not self.directory:
+            return
+        for name in os.listdir(self.directory):
+            if name.startswith('metrics-'):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    def start(self):
+        """Write this process's series to the shared directory every flush_interval and at exit"""
+        if not self.directory or self._flusher:
+            return
+        self._flusher = threading.Thread(target=self._flush_periodically, name='metrics-flush', daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Could not write metrics: {e}")
+
+    def flush(self):
+        """Atomically replace this process's file; files of exited processes stay, so counters never go back"""
+        exported = {metric.name: metric.export() for metric in self.metrics if metric.shared}
+        fd, temp_path = tempfile.mkstemp(suffix='.part', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(exported, f)
+            os.replace(temp_path, os.path.join(self.directory, f"metrics-{os.getpid()}.json"))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def collect(self):
+        """metric name -> series summed over every process's file"""
+        self.flush()
+        totals = {}
+        for name in os.listdir(self.directory):
+            if not (name.startswith('metrics-') and name.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    exported = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for metric_name, series in exported.items():
+                _merge(totals.setdefault(metric_name, {}), series)
+        return totals
+
+    def total(self, name):
+        """Sum over every label set and, with a shared directory, every process of a shared counter"""
+        for metric in self.metrics:
+            if metric.name == name:
+                if self.directory:
+                    totals = getattr(self._scrape, 'totals', None)
+                    if totals is None:
+                        totals = self.collect()
+                    return sum(totals.get(name, {}).values())
+                return sum(value for _, value in metric.export())
+        return None
+
+    def render(self):
+        totals = self.collect() if self.directory else {}
+        self._scrape.totals = totals
+        try:
+            lines = []
+            for metric in self.metrics:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                lines.extend(metric.samples(totals.get(metric.name)))
+        finally:
+            self._scrape.totals = None
+        return '\n'.join(lines) + '\n'
+
+
+class _Timer:
+    def __init__(self, histogram, label_values):
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, *self.label_values)
+        return False
+
+
+class Histogram:
+    kind = 'histogram'
+    shared = True
+
+    def __init__(self, registry, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def observe(self, value, *label_values):
+        if not self.registry.enabled:
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def time(self, *label_values):
+        """Context manager observing the elapsed seconds of its block"""
+        if not self.registry.enabled:
+            return NULL_TIMER
+        return _Timer(self, label_values)
+
+    def export(self):
+        with self._lock:
+            return [[list(labels), list(values)] for labels, values in self._series.items()]
+
+    def samples(self, series=None):
+        """Lines for series (host-wide totals) or, without it, this process's own"""
+        if series is None:
+            with self._lock:
+                series = {labels: list(values) for labels, values in self._series.items()}
+        lines = []
+        for label_values, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), values):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, label_values, [le])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, label_values)} {values[-1]}")
+            lines.append(f"{self.name}_count{_labels(self.labels, label_values)} {cumulative}")
+        return lines
+
+
+class CallbackMetric:
+    """Gauge or counter whose values are read from a callback at scrape time.
+
+    fn() returns a number, or a dict of label-value tuple -> number for labelled metrics.
+    shared=True marks a per-process count (e.g. cache hits), summed across the host's
+    processes; other callbacks are expected to report host-wide values already.
+    """
+
+    def __init__(self, registry, name, help, fn, labels=(), kind='gauge', shared=False):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.labels = tuple(labels)
+        self.kind = kind
+        self.shared = shared
+        registry.register(self)
+
+    def _values(self):
+        try:
+            values = self.fn()
+        except Exception:
+            return {}
+        if not isinstance(values, dict):
+            values = {(): values}
+        return {label_values: value for label_values, value in values.items() if value is not None}
+
+    def export(self):
+        return [[list(labels), value] for labels, value in self._values().items()]
+
+    def samples(self, values=None):
+        if values is None:
+            values = self._values()
+        return [f"{self.name}{_labels(self.labels, label_values)} {_number(value)}"
+                for label_values, value in sorted(values.items())]
+
+
+REGISTRY = Registry()
+
+FEED_FETCH_SECONDS = Histogram(REGISTRY, 'newsbreeze_feed_fetch_seconds',
+                               'Feed download time (including 304 revalidations)', ['feed'])
+FEED_PARSE_SECONDS = Histogram(REGISTRY, 'newsbreeze_feed_parse_seconds', 'Feed parse time', ['feed'])
+SUMMARIZE_SECONDS = Histogram(REGISTRY, 'newsbreeze_summarize_batch_seconds',
+                              'Summarization model time per batch')
+SUMMARIZE_BATCH_SIZE = Histogram(REGISTRY, 'newsbreeze_summarize_batch_size',
+                                 'Texts per summarization batch', buckets=BATCH_BUCKETS)
+TTS_SECONDS = Histogram(REGISTRY, 'newsbreeze_tts_seconds', 'Speech synthesis time per sentence', ['voice'])
+TTS_SECONDS_PER_CHAR = Histogram(REGISTRY, 'newsbreeze_tts_seconds_per_char',
+                                 'Speech synthesis time per input character', ['voice'],
+                                 buckets=PER_CHAR_BUCKETS)
+INFERENCE_WAIT_SECONDS = Histogram(REGISTRY, 'newsbreeze_inference_wait_seconds',
+                                   'Time inference jobs spend queued before a worker picks them up', ['job'])
+REQUEST_SECONDS = Histogram(REGISTRY, 'newsbreeze_request_seconds', 'HTTP request latency',
+                            ['route', 'method', 'status'])
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze - Shared model server
+One process per host owns the summarizer and TTS models and serves the web workers over a Unix socket.
+It also owns the inference scheduler, so admission limits and job priority hold for the whole host.
+"""
+
+import itertools
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing.connection import Connection, Listener, answer_challenge, deliver_challenge
+
+import metrics
+from audio_stream import synthesize_pcm
+from models import default_registry
+from scheduler import InferenceScheduler, QueueFull
+from summarization import count_tokens, max_input_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def _gevent_patched():
+    if 'gevent' not in sys.modules:
+        return False
+    from gevent import monkey
+    return monkey.is_module_patched('socket')
+
+
+def run_blocking(fn, *args, **kwargs):
+    """Run fn on a real OS thread when gunicorn's gevent worker has patched this process.
+
+    Connection pipes read with os.read, which gevent does not make cooperative, so a long
+    summarize/TTS call would otherwise stall every other request and event stream in the worker.
+    """
+    if _gevent_patched():
+        from gevent import get_hub
+        return get_hub().threadpool.apply(fn, args, kwargs)
+    return fn(*args, **kwargs)
+
+
+def connect(address, authkey):
+    """multiprocessing.connection.Client for a Unix socket, usable under gevent too.
+
+    Client() builds on the socket module, and gevent's socket keeps its descriptor
+    non-blocking even after detach(); Connection then reads it with plain os.read and
+    fails with EAGAIN. The unpatched socket type gives a blocking descriptor instead,
+    so the connection must only be used off the hub (see run_blocking).
+    """
+    socket_type = socket.socket
+    if _gevent_patched():
+        from gevent import monkey
+        socket_type = monkey.get_original('socket', 'socket')
+
+    sock = socket_type(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    conn = Connection(sock.detach())
+    try:
+        answer_challenge(conn, authkey)
+        deliver_challenge(conn, authkey)
+    except Exception:
+        conn.close()
+        raise
+    return conn
+
+
+class ModelServerError(Exception):
+    """Raised in the client when the model server reports a failure"""
+
+
+class ModelServer:
+    """Load the models once and answer summarize/tts requests from any number of workers"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.address = settings['MODEL_SERVER_SOCKET']
+        self.authkey = settings['SECRET_KEY'].encode()
+        self.registry = default_registry(settings)
+        self.loaded_at = None
+        # Every worker's model calls queue here, so INFERENCE_WORKERS and the queue limits
+        # apply host-wide and interactive audio goes ahead of any worker's background jobs
+        self.scheduler = InferenceScheduler(
+            workers=settings['INFERENCE_WORKERS'],
+            queue_limits={
+                'interactive': settings['INFERENCE_QUEUE_INTERACTIVE'],
+                'summarize': settings['INFERENCE_QUEUE_SUMMARIZE'],
+                'prerender': settings['INFERENCE_QUEUE_PRERENDER']
+            }
+        )
+        self._tickets = {}  # ticket id -> admission ticket held by some worker
+        self._ticket_ids = itertools.count(1)
+        # The pipelines are not safe to call concurrently; serialize per model
+        self._summarizer_lock = threading.Lock()
+        self._tts_lock = threading.Lock()
+
+    def load_models(self):
+        started = time.time()
+        self.registry.warm_up()
+        self.loaded_at = time.time()
+        logger.info(f"Model server ready in {self.loaded_at - started:.1f}s")
+
+    def status(self):
+        return {
+            'summarizer': self.registry.is_loaded('summarizer'),
+            'summarizer_model': self.registry.model_name('summarizer'),
+            'summarizer_max_tokens': self._summarizer_max_tokens(),
+            'tts': self.registry.is_loaded('tts'),
+            'tts_model': self.registry.model_name('tts'),
+            'models': self.registry.status(),
+            'loading': self.loaded_at is None,
+            'pid': os.getpid()
+        }
+
+    def _model(self, name):
+        # Loads on first use if a request beats the warm-up thread
+        model = self.registry.get(name)
+        if model is None:
+            raise RuntimeError(f"{name} model not loaded")
+        return model
+
+    def _summarizer_max_tokens(self):
+        if not self.registry.is_loaded('summarizer'):
+            return None
+        return max_input_tokens(getattr(self.registry.get('summarizer'), 'tokenizer', None))
+
+    def summarize(self, texts, **kwargs):
+        summarizer = self._model('summarizer')
+        with self._summarizer_lock:
+            return summarizer(texts, **kwargs)
+
+    def count_tokens(self, texts, **kwargs):
+        """Token count per text from the pipeline's tokenizer, None if it has none"""
+        tokenizer = getattr(self._model('summarizer'), 'tokenizer', None)
+        if tokenizer is None:
+            return None
+        # Fast tokenizers are not safe to call while the pipeline is using them
+        with self._summarizer_lock:
+            return count_tokens(tokenizer, texts, **kwargs)
+
+    def synthesize_pcm(self, text, voice=None):
+        tts_model = self._model('tts')
+        voices = self.registry.get('voices')
+        with self._tts_lock:
+            return synthesize_pcm(tts_model, text, voice, voices)
+
+    def admit(self, job_class, block=False):
+        """Id of a new admission ticket (QueueFull when job_class is at its host-wide limit)"""
+        ticket = self.scheduler.admit(job_class, block=block)
+        ticket_id = next(self._ticket_ids)
+        self._tickets[ticket_id] = ticket
+        return ticket_id
+
+    def release(self, ticket):
+        ticket = self._tickets.pop(ticket, None)
+        if ticket is not None:
+            ticket.release()
+
+    def handle(self, op, kwargs, job_class=None):
+        if op == 'status':
+            return self.status()
+        if op == 'inference_stats':
+            return self.scheduler.stats()
+        if op == 'admit':
+            return self.admit(job_class, **kwargs)
+        if op == 'release':
+            return self.release(**kwargs)
+        if op == 'summarize':
+            return self.scheduler.run(job_class or 'summarize', self.summarize, **kwargs)
+        if op == 'synthesize_pcm':
+            return self.scheduler.run(job_class or 'interactive', self.synthesize_pcm, **kwargs)
+        if op == 'count_tokens':
+            return self.count_tokens(**kwargs)
+        raise ValueError(f"Unknown model server op: {op}")
+
+    def _serve_connection(self, conn):
+        admitted = set()
+        with conn:
+            while True:
+                try:
+                    op, job_class, kwargs = conn.recv()
+                except (EOFError, OSError):
+                    break
+                try:
+                    result = self.handle(op, kwargs, job_class)
+                    if op == 'admit':
+                        admitted.add(result)
+                    reply = ('ok', result)
+                except QueueFull as e:
+                    reply = ('busy', (e.job_class, e.retry_after))
+                except Exception as e:
+                    logger.error(f"Model server error in {op}: {e}")
+                    reply = ('error', str(e))
+                try:
+                    conn.send(reply)
+                except (EOFError, OSError):
+                    break
+        # A worker that went away cannot release what it was admitted for
+        for ticket in admitted:
+            self.release(ticket)
+
+    def serve_forever(self):
+        if os.path.exists(self.address):
+            os.remove(self.address)
+        listener = Listener(self.address, family='AF_UNIX', authkey=self.authkey)
+        logger.info(f"Model server listening on {self.address}")
+
+        # Accept connections while the models load so workers can poll status
+        threading.Thread(target=self.load_models, name='model-loader', daemon=True).start()
+        self.scheduler.start()
+        # Model and queue timings are observed here; the workers' /metrics add them in
+        metrics.REGISTRY.configure(self.settings['METRICS_ENABLED'], self.settings['METRICS_DIR'],
+                                   self.settings['METRICS_FLUSH_INTERVAL'])
+        metrics.REGISTRY.start()
+
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    logger.warning(f"Rejected model server connection: {e}")
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        finally:
+            listener.close()
+
+
+class ModelClient:
+    """Thread-safe client for the model server; keeps one connection per calling thread.
+
+    Every call, including opening the connection, runs through run_blocking, so under
+    gevent all socket I/O happens on the hub's threadpool.
+    """
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self._local = threading.local()
+        self._job = threading.local()  # job class of the calling request, see job()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = connect(self.address, self.authkey)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def job(self, job_class):
+        """Tag the calls this thread makes inside the block with job_class"""
+        previous = getattr(self._job, 'job_class', None)
+        self._job.job_class = job_class
+        try:
+            yield
+        finally:
+            self._job.job_class = previous
+
+    def call(self, op, **kwargs):
+        return run_blocking(self._call, op, getattr(self._job, 'job_class', None), kwargs)
+
+    def _call(self, op, job_class, kwargs):
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.send((op, job_class, kwargs))
+                status, result = conn.recv()
+                break
+            except (EOFError, OSError):
+                # Server restarted or connection dropped; reconnect once
+                self._local.conn = None
+                if attempt:
+                    raise
+        if status == 'busy':
+            raise QueueFull(*result)
+        if status == 'error':
+            raise ModelServerError(result)
+        return result
+
+    def status(self):
+        return self.call('status')
+
+
+class RemoteTicket:
+    """An admission ticket held in the model server's scheduler"""
+
+    def __init__(self, client, ticket_id):
+        self.client = client
+        self.ticket_id = ticket_id
+
+    def release(self):
+        ticket_id, self.ticket_id = self.ticket_id, None
+        if ticket_id is None:
+            return
+        try:
+            self.client.call('release', ticket=ticket_id)
+        except (EOFError, OSError, ModelServerError) as e:
+            # A restarted server has forgotten the ticket anyway
+            logger.debug(f"Could not release inference ticket {ticket_id}: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+
+class RemoteScheduler:
+    """Stands in for the InferenceScheduler inside web workers.
+
+    Admission is decided by the model server for the whole host, and run() tags the model
+    calls fn makes with the job class, so the server queues them by priority across workers.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def start(self):
+        pass
+
+    def admit(self, job_class, block=False):
+        with self.client.job(job_class):
+            return RemoteTicket(self.client, self.client.call('admit', block=block))
+
+    def run(self, job_class, fn, *args, **kwargs):
+        with self.client.job(job_class):
+            return fn(*args, **kwargs)
+
+    def stats(self):
+        try:
+            return self.client.call('inference_stats')
+        except (EOFError, OSError, ModelServerError) as e:
+            logger.debug(f"Inference stats unavailable: {e}")
+            return {'workers': None, 'queues': {}}
+
+
+class RemoteSummarizer:
+    """Stands in for the transformers pipeline inside web workers.
+
+    There is no tokenizer on this side: the server reports the model's input limit
+    (model_max_length) and counts tokens for chunking.
+    """
+
+    def __init__(self, client, model_max_length=None):
+        self.client = client
+        self.model_max_length = model_max_length
+
+    def __call__(self, texts, **kwargs):
+        return self.client.call('summarize', texts=texts, **kwargs)
+
+    def count_tokens(self, texts, **kwargs):
+        return self.client.call('count_tokens', texts=texts, **kwargs)
+
+
+class RemoteTTS:
+    """Stands in for the Coqui TTS model inside web workers"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def synthesize_pcm(self, text, voice=None):
+        return self.client.call('synthesize_pcm', text=text, voice=voice)
+
+
+def main():
+    from config import config
+
+    logging.basicConfig(level=logging.INFO)
+    settings = config[os.environ.get('FLASK_CONFIG', 'default')]
+    settings = {key: getattr(settings, key) for key in dir(settings) if key.isupper()}
+    os.makedirs(os.path.dirname(settings['MODEL_SERVER_SOCKET']) or '.', exist_ok=True)
+
+    try:
+        ModelServer(settings).serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
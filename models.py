@@ -0,0 +1,218 @@
+"""
+NewsBreeze - Model loading
+Loads the summarization and TTS models with their configured fallbacks.
+torch/transformers/TTS are only imported inside the loaders, so importing
+this module (or app.py) stays cheap.
+"""
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SUMMARIZATION_BACKENDS = ('torch', 'int8', 'onnx')
+
+_torch_threads_lock = threading.Lock()
+_torch_threads_configured = False
+
+
+def backend_model_name(model_name, backend):
+    """Name recorded with summaries; non-default backends are tagged since their output can drift"""
+    return model_name if backend == 'torch' else f"{model_name}+{backend}"
+
+
+def build_summarization_pipeline(model_name, backend='torch', export_dir=None, **kwargs):
+    """Build a summarization pipeline on the requested backend.
+
+    torch: stock fp32 model. int8: torch dynamic quantization of the Linear layers.
+    onnx: ONNX Runtime encoder-decoder, exported once into export_dir and reused.
+    """
+    from transformers import pipeline
+
+    if backend == 'torch':
+        return pipeline("summarization", model=model_name, **kwargs)
+
+    if backend == 'int8':
+        import torch
+
+        summarizer = pipeline("summarization", model=model_name, **kwargs)
+        summarizer.model = torch.quantization.quantize_dynamic(
+            summarizer.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        return summarizer
+
+    if backend == 'onnx':
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        exported = os.path.join(export_dir, model_name.replace('/', '--')) if export_dir else None
+        if exported and os.path.isdir(exported):
+            model = ORTModelForSeq2SeqLM.from_pretrained(exported)
+        else:
+            logger.info(f"Exporting {model_name} to ONNX...")
+            model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+            if exported:
+                model.save_pretrained(exported)
+                tokenizer.save_pretrained(exported)
+        return pipeline("summarization", model=model, tokenizer=tokenizer, **kwargs)
+
+    raise ValueError(f"Unknown summarization backend: {backend}")
+
+
+def configure_torch_threads(settings):
+    """Apply TORCH_NUM_THREADS / TORCH_INTEROP_THREADS once per process (0 keeps torch's default)"""
+    global _torch_threads_configured
+
+    threads = settings.get('TORCH_NUM_THREADS', 0)
+    interop_threads = settings.get('TORCH_INTEROP_THREADS', 0)
+    with _torch_threads_lock:
+        if _torch_threads_configured or not (threads or interop_threads):
+            return
+        _torch_threads_configured = True
+    try:
+        import torch
+
+        if threads:
+            torch.set_num_threads(threads)
+        if interop_threads:
+            # Only allowed before torch has started any inter-op work
+            torch.set_num_interop_threads(interop_threads)
+        logger.info(f"Torch threads: {torch.get_num_threads()} intra-op, {torch.get_num_interop_threads()} inter-op")
+    except (ImportError, RuntimeError) as e:
+        logger.warning(f"Could not configure torch threads: {e}")
+
+
+def load_summarizer(settings):
+    """Load the summarization pipeline; returns (pipeline, model_name) or (None, None)"""
+    configure_torch_threads(settings)
+    backend = settings['SUMMARIZATION_BACKEND']
+    export_dir = os.path.join(settings['CACHE_FOLDER'], 'onnx')
+
+    logger.info(f"Initializing summarization model ({backend} backend)...")
+    try:
+        summarizer = build_summarization_pipeline(
+            settings['SUMMARIZATION_MODEL'],
+            backend,
+            export_dir,
+            max_length=settings['SUMMARY_MAX_LENGTH'],
+            min_length=settings['SUMMARY_MIN_LENGTH'],
+            do_sample=False
+        )
+        logger.info("Summarization model loaded successfully!")
+        return summarizer, backend_model_name(settings['SUMMARIZATION_MODEL'], backend)
+    except Exception as e:
+        logger.error(f"Error loading primary summarization model: {e}")
+        try:
+            # Fallback to simpler model
+            summarizer = build_summarization_pipeline(settings['SUMMARIZATION_FALLBACK'], backend, export_dir)
+            logger.info("Fallback summarization model loaded!")
+            return summarizer, backend_model_name(settings['SUMMARIZATION_FALLBACK'], backend)
+        except Exception as e2:
+            logger.error(f"Failed to load fallback summarization model: {e2}")
+    return None, None
+
+
+def load_tts(settings):
+    """Load the TTS model; returns (model, model_name) or (None, None)"""
+    configure_torch_threads(settings)
+    from TTS.api import TTS
+
+    logger.info("Initializing TTS model...")
+    try:
+        tts_model = TTS(model_name=settings['TTS_MODEL_PRIMARY'])
+        logger.info("TTS model loaded successfully!")
+        return tts_model, settings['TTS_MODEL_PRIMARY']
+    except Exception as e:
+        logger.error(f"Error loading primary TTS model: {e}")
+        try:
+            # Fallback to simpler TTS
+            tts_model = TTS(model_name=settings['TTS_MODEL_FALLBACK'])
+            logger.info("Fallback TTS model loaded!")
+            return tts_model, settings['TTS_MODEL_FALLBACK']
+        except Exception as e2:
+            logger.error(f"Failed to load fallback TTS model: {e2}")
+    return None, None
+
+
+def load_voices(settings, registry):
+    """Condition every configured voice on the loaded TTS model; returns (VoiceBank, model_name)"""
+    from voices import VoiceBank
+
+    tts_model = registry.get('tts')
+    if tts_model is None:
+        return None, None
+
+    model_name = registry.model_name('tts')
+    bank = VoiceBank(
+        tts_model,
+        model_name,
+        settings['CELEBRITY_VOICES'],
+        os.path.join(settings['CACHE_FOLDER'], 'voices'),
+        language=settings['TTS_LANGUAGE']
+    )
+    return bank.load(), model_name
+
+
+class ModelRegistry:
+    """Loads each registered model once, on first use or from a warm-up hook"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._loaders = {}
+        self._models = {}
+        self._locks = {}
+
+    def register(self, name, loader):
+        """loader(settings) -> (model, model_name) or (None, None)"""
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+
+    def get(self, name):
+        """Return the loaded model, loading it now if nobody has yet; None if loading failed"""
+        entry = self._models.get(name)
+        if entry is None:
+            with self._locks[name]:
+                entry = self._models.get(name)
+                if entry is None:
+                    started = time.time()
+                    model, model_name = self._loaders[name](self.settings)
+                    entry = {'model': model, 'model_name': model_name,
+                             'load_seconds': round(time.time() - started, 2)}
+                    self._models[name] = entry
+        return entry['model']
+
+    def model_name(self, name):
+        entry = self._models.get(name)
+        return entry['model_name'] if entry else None
+
+    def is_loaded(self, name):
+        entry = self._models.get(name)
+        return bool(entry and entry['model'] is not None)
+
+    def warm_up(self, names=None):
+        """Load models ahead of first use (called from a background thread at startup)"""
+        for name in names or list(self._loaders):
+            self.get(name)
+
+    def status(self):
+        return {
+            name: {
+                'loaded': self.is_loaded(name),
+                'model': self.model_name(name),
+                'load_seconds': self._models[name]['load_seconds'] if name in self._models else None
+            }
+            for name in self._loaders
+        }
+
+
+def default_registry(settings):
+    """Registry with the app's summarizer and TTS loaders"""
+    registry = ModelRegistry(settings)
+    registry.register('summarizer', load_summarizer)
+    registry.register('tts', load_tts)
+    # After tts: warm_up() loads in registration order
+    registry.register('voices', lambda settings: load_voices(settings, registry))
+    return registry
@@ -0,0 +1,154 @@
+"""
+NewsBreeze - News snapshot index
+Pre-encoded, newest-first index over a snapshot for paginated and filtered /api/news
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+try:
+    import orjson
+except ImportError:  # optional fast encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+# Fields left out of the default (lean) article representation
+LEAN_EXCLUDE = ('summary', 'guid', 'body')
+
+
+def dumps(value):
+    """Serialize to JSON bytes, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def published_timestamp(article):
+    """Epoch seconds of an article's published date; unparseable dates sort last"""
+    try:
+        return parsedate_to_datetime(article.get('published', '')).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_since(value):
+    """Accept epoch seconds or an ISO 8601 timestamp"""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(f"{key[0]}:{key[1]}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+    negative_ts, article_id = raw.split(':', 1)
+    return (float(negative_ts), article_id)
+
+
+class _Listing:
+    """Positions in newest-first order with their sort keys, for bisecting"""
+
+    def __init__(self):
+        self.positions = []
+        self.keys = []
+
+    def add(self, position, key):
+        self.positions.append(position)
+        self.keys.append(key)
+
+
+class NewsIndex:
+    """Immutable index built once per snapshot; queries are bisects and slices"""
+
+    def __init__(self, articles):
+        self.lean = []
+        self.full = []
+        keyed = []
+        for position, article in enumerate(articles):
+            self.full.append(dumps(article))
+            self.lean.append(dumps({k: v for k, v in article.items() if k not in LEAN_EXCLUDE}))
+            keyed.append(((-published_timestamp(article), article['id']), position))
+        keyed.sort()
+
+        self.all = _Listing()
+        self.by_source = {}
+        for key, position in keyed:
+            self.all.add(position, key)
+            article = articles[position]
+            names = {article['source']} | {s['source'] for s in article.get('sources', ())}
+            for name in names:
+                self.by_source.setdefault(name.lower(), _Listing()).add(position, key)
+
+    def query(self, limit, cursor=None, source=None, since=None):
+        """Return (positions, total_matching, next_cursor)"""
+        listing = self.by_source.get(source.lower(), _Listing()) if source else self.all
+
+        # Newest first, so "published after since" is a prefix of the listing
+        end = bisect_left(listing.keys, (-since, '')) if since is not None else len(listing.keys)
+        start = bisect_right(listing.keys, decode_cursor(cursor)) if cursor else 0
+
+        page = listing.positions[start:min(start + limit, end)]
+        next_cursor = None
+        if start + limit < end and page:
+            next_cursor = encode_cursor(listing.keys[start + len(page) - 1])
+        return page, end, next_cursor
+
+    def encode_page(self, positions, full=False):
+        encoded = self.full if full else self.lean
+        return b'[' + b','.join(encoded[i] for i in positions) + b']'
+
+
+class CompressedBodyCache:
+    """Small LRU of compressed response bodies keyed by (etag, encoding)"""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag, encoding, body):
+        key = (etag, encoding)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        if encoding == 'br':
+            compressed = brotli.compress(body, quality=5)
+        else:
+            compressed = gzip.compress(body, compresslevel=6)
+
+        with self._lock:
+            self._entries[key] = compressed
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compressed
+
+
+def choose_encoding(accept_encodings):
+    """Prefer brotli when available, then gzip, else identity"""
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def make_etag(generation, *parts):
+    digest = hashlib.sha1('\x1f'.join([str(generation)] + [str(part) for part in parts]).encode()).hexdigest()
+    return digest[:32]
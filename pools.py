@@ -0,0 +1,66 @@
+"""
+NewsBreeze - Shared connection pools
+Per-thread SQLite connections for the host-wide stores and pooled HTTP sessions for the fetchers
+"""
+
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'NewsBreeze/1.0 (+https://github.com/Pranav452/NewsBreeze-)'
+
+
+class SQLiteConnections:
+    """Connections to one SQLite file in WAL mode, one per thread.
+
+    sqlite3 connections are not shareable across threads. Connections run in autocommit
+    mode; callers open explicit transactions where they need one.
+    """
+
+    def __init__(self, path, schema=None):
+        self.path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self.connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        if schema:
+            conn.executescript(schema)
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=10000')
+            self._local.conn = conn
+        return conn
+
+
+def pooled_session(pool_size):
+    """requests session keeping up to pool_size connections per host alive"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = USER_AGENT
+    return session
+
+
+class HTTPWorkers:
+    """A pool of fetch threads sharing one pooled HTTP session"""
+
+    def __init__(self, max_workers, thread_name_prefix):
+        self.session = pooled_session(max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+    def close(self):
+        """Shut down the worker pool and release pooled connections"""
+        self._executor.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,225 @@
+"""
+NewsBreeze - Audio pre-rendering
+Background queue that voices the newest articles before anyone presses play
+"""
+
+import fcntl
+import itertools
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from news_index import published_timestamp
+from pools import SQLiteConnections
+
+logger = logging.getLogger(__name__)
+
+# How often the worker rechecks for interactive renders in other processes
+INTERACTIVE_POLL_SECONDS = 0.1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS voice_requests (
+    voice TEXT PRIMARY KEY,
+    requests INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO voice_requests (voice, requests) VALUES ('default', 0);
+CREATE TABLE IF NOT EXISTS interactive (
+    pid INTEGER PRIMARY KEY,
+    active INTEGER NOT NULL
+);
+"""
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class PrerenderQueue:
+    """Priority queue of (article, voice) renders throttled to a CPU budget.
+
+    Voice request counts and interactive renders in progress are kept in a SQLite file
+    shared by every worker on the host, so the one worker that prerenders voices what
+    all of them are asked for and gives way to listeners served by any of them.
+    """
+
+    def __init__(self, render, is_cached, lock_path, state_path, top_articles=10, top_voices=2,
+                 cpu_budget=0.5, on_rendered=None):
+        self.render = render
+        self.is_cached = is_cached
+        self.on_rendered = on_rendered  # called with (article_id, voice, path) after each render
+        self.lock_path = lock_path
+        self.top_articles = top_articles
+        self.top_voices = top_voices
+        self.cpu_budget = min(max(cpu_budget, 0.05), 1.0)
+
+        self.states = {}  # (article_id, voice) -> queued / rendering / failed
+        self.targets = []  # [(article_id, text, voice)] for the current news set
+        self.rendered = 0
+        self.failed = 0
+        self.owner = False
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._lock_file = None
+        self._db = SQLiteConnections(state_path, SCHEMA)
+
+    def record_request(self, voice):
+        try:
+            self._db.connection().execute(
+                'INSERT INTO voice_requests (voice, requests) VALUES (?, 1) '
+                'ON CONFLICT(voice) DO UPDATE SET requests = requests + 1', (voice,))
+        except sqlite3.Error as e:
+            logger.error(f"Prerender state write failed: {e}")
+
+    def popular_voices(self):
+        """The top_voices most requested voices across all workers"""
+        try:
+            rows = self._db.connection().execute(
+                "SELECT voice FROM voice_requests ORDER BY requests DESC, voice = 'default' DESC LIMIT ?",
+                (self.top_voices,)).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Prerender state read failed: {e}")
+            return ['default']
+        return [voice for voice, in rows]
+
+    @contextmanager
+    def interactive(self):
+        """Mark an interactive synthesis in progress; the worker pauses until it finishes"""
+        self._add_interactive(1)
+        try:
+            yield
+        finally:
+            self._add_interactive(-1)
+
+    def _add_interactive(self, delta):
+        try:
+            self._db.connection().execute(
+                'INSERT INTO interactive (pid, active) VALUES (?, ?) '
+                'ON CONFLICT(pid) DO UPDATE SET active = active + excluded.active',
+                (os.getpid(), delta))
+        except sqlite3.Error as e:
+            logger.error(f"Prerender state write failed: {e}")
+
+    def interactive_count(self):
+        """Interactive renders in progress on the host; forgets processes that died mid-render"""
+        try:
+            conn = self._db.connection()
+            rows = conn.execute('SELECT pid, active FROM interactive WHERE active > 0').fetchall()
+            dead = [(pid,) for pid, _ in rows if not process_alive(pid)]
+            if dead:
+                conn.executemany('DELETE FROM interactive WHERE pid = ?', dead)
+        except sqlite3.Error as e:
+            logger.error(f"Prerender state read failed: {e}")
+            return 0
+        return sum(active for pid, active in rows if (pid,) not in dead)
+
+    def schedule(self, articles, prepare_text=lambda text: text):
+        """Queue the newest top_articles for the most requested voices, newest and most popular first"""
+        newest = sorted(articles, key=published_timestamp, reverse=True)[:self.top_articles]
+        voices = self.popular_voices()
+
+        targets = []
+        for article_rank, article in enumerate(newest):
+            text = prepare_text(article['ai_summary'])
+            for voice_rank, voice in enumerate(voices):
+                targets.append((article['id'], text, voice))
+                if not self.owner or self.is_cached(text, voice):
+                    continue
+                key = (article['id'], voice)
+                with self._lock:
+                    if self.states.get(key) in ('queued', 'rendering'):
+                        continue
+                    self.states[key] = 'queued'
+                priority = (article_rank * len(voices) + voice_rank, next(self._sequence))
+                self._queue.put((priority, article['id'], text, voice))
+
+        with self._lock:
+            self.targets = targets
+            current = {(article_id, voice) for article_id, _, voice in targets}
+            # Forget failures for articles that dropped out of the news set
+            self.states = {key: state for key, state in self.states.items()
+                           if key in current or state != 'failed'}
+
+    def start(self):
+        """Run the worker in the one process on this host holding the prerender lock"""
+        try:
+            self._lock_file = open(self.lock_path, 'w')
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            logger.info("Audio prerendering is handled by another worker")
+            if self._lock_file:
+                self._lock_file.close()
+                self._lock_file = None
+            return False
+
+        self.owner = True
+        threading.Thread(target=self._run, name='audio-prerender', daemon=True).start()
+        logger.info(f"Audio prerender worker started (CPU budget {self.cpu_budget:.0%})")
+        return True
+
+    def _run(self):
+        while True:
+            _, article_id, text, voice = self._queue.get()
+            key = (article_id, voice)
+
+            # Give way to listeners waiting on interactive requests in any worker
+            while self.interactive_count():
+                time.sleep(INTERACTIVE_POLL_SECONDS)
+            with self._lock:
+                if self.states.get(key) != 'queued':
+                    continue
+                self.states[key] = 'rendering'
+
+            started = time.time()
+            try:
+                path = self.render(text, voice)
+            except Exception as e:
+                logger.error(f"Prerender failed for {article_id}/{voice}: {e}")
+                path = None
+            elapsed = time.time() - started
+
+            with self._lock:
+                if path:
+                    self.states.pop(key, None)
+                    self.rendered += 1
+                else:
+                    self.states[key] = 'failed'
+                    self.failed += 1
+            if path and self.on_rendered:
+                self.on_rendered(article_id, voice, path)
+
+            # Idle long enough that rendering uses at most cpu_budget of wall time
+            time.sleep(elapsed * (1 - self.cpu_budget) / self.cpu_budget)
+
+    def status(self):
+        with self._lock:
+            targets = list(self.targets)
+            states = dict(self.states)
+            summary = {
+                'worker': self.owner,
+                'queued': self._queue.qsize(),
+                'rendered': self.rendered,
+                'failed': self.failed,
+            }
+        summary['voices'] = self.popular_voices()
+
+        articles = {}
+        for article_id, text, voice in targets:
+            if self.is_cached(text, voice):
+                state = 'ready'
+            else:
+                state = states.get((article_id, voice), 'pending')
+            articles.setdefault(article_id, {})[voice] = state
+        summary['articles'] = articles
+        return summary
@@ -0,0 +1,230 @@
+"""
+NewsBreeze - Background news refresher
+Rebuilds the article set on a timer and publishes it as an immutable snapshot. One worker
+per host is elected to do the work; the others load the snapshot it shares on disk.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# articles is a tuple and index whatever build_index() made of it (pre-serialized
+# pages), so a published snapshot is never mutated and needs no per-request work
+NewsSnapshot = namedtuple('NewsSnapshot', ['generation', 'built_at', 'timestamp', 'articles', 'index'])
+
+
+# Shortest pause between refreshes, however soon next_refresh() says work is due
+MIN_WAIT = 1
+# How often followers check the shared snapshot file (and whether the leader went away)
+FOLLOW_INTERVAL = 1
+
+
+class NewsRefresher:
+    """Run build_articles() every interval seconds (or sooner, see next_refresh) and swap in the result atomically.
+
+    With lock_path and shared_path set, only the process holding the lock builds; it writes
+    each cycle's snapshot to shared_path and every other process follows that file, taking
+    over the lock if the leader exits.
+    """
+
+    def __init__(self, build_articles, interval, build_index=lambda articles: None, next_refresh=None,
+                 lock_path=None, shared_path=None, details=None):
+        self.build_articles = build_articles
+        self.build_index = build_index
+        self.interval = interval
+        # next_refresh() -> seconds until there is new work (e.g. a feed falls due)
+        self.next_refresh = next_refresh
+        self.lock_path = lock_path
+        self.shared_path = shared_path
+        # details() -> JSON-able leader state (e.g. feed health) shared with the followers
+        self._details = details
+        self._shared_details = {}
+        self._shared_mtime = None
+        self.leader = lock_path is None
+        self._snapshot = NewsSnapshot(0, 0.0, None, (), build_index(()))
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._listeners = []
+        self._lock_file = None
+
+    @property
+    def snapshot(self):
+        """The current snapshot; a single attribute read, safe from any thread"""
+        return self._snapshot
+
+    def snapshot_age(self, snapshot=None):
+        snapshot = snapshot or self._snapshot
+        if not snapshot.generation:
+            return None
+        return round(time.time() - snapshot.built_at, 3)
+
+    def add_listener(self, listener):
+        """Call listener(snapshot) after each new snapshot is published"""
+        self._listeners.append(listener)
+
+    def refresh_now(self):
+        """Rebuild synchronously and publish; the previous snapshot stays live on failure"""
+        with self._refresh_lock:
+            started = time.time()
+            try:
+                articles = tuple(self.build_articles())
+                index = self.build_index(articles)
+            except Exception as e:
+                logger.error(f"News refresh failed, keeping generation {self._snapshot.generation}: {e}")
+                self._share(self._snapshot)
+                return self._snapshot
+
+            if self._snapshot.generation and articles == self._snapshot.articles:
+                # Nothing changed (all polls unchanged or 304): keep the generation, so ETags stay valid
+                logger.info(f"News unchanged, keeping snapshot {self._snapshot.generation}")
+                self._share(self._snapshot)
+                return self._snapshot
+
+            snapshot = NewsSnapshot(
+                generation=self._snapshot.generation + 1,
+                built_at=time.time(),
+                timestamp=datetime.now().isoformat(),
+                articles=articles,
+                index=index
+            )
+            logger.info(f"Built news snapshot {snapshot.generation} "
+                        f"({len(articles)} articles in {time.time() - started:.1f}s)")
+            self._share(snapshot)
+        return self._publish(snapshot)
+
+    def _publish(self, snapshot):
+        self._snapshot = snapshot
+        self._ready.set()
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"News snapshot listener failed: {e}")
+        return snapshot
+
+    @property
+    def details(self):
+        """Leader state for status pages: computed here when leading, else as last shared"""
+        if self.leader:
+            return self._details() if self._details else {}
+        return self._shared_details
+
+    def _share(self, snapshot):
+        """Write the snapshot and leader details for the followers (temp file, then rename)"""
+        if not self.shared_path or not snapshot.generation:
+            return
+        try:
+            state = {
+                'generation': snapshot.generation,
+                'built_at': snapshot.built_at,
+                'timestamp': snapshot.timestamp,
+                'articles': snapshot.articles,
+                'details': self._details() if self._details else {}
+            }
+            directory = os.path.dirname(self.shared_path) or '.'
+            fd, temp_path = tempfile.mkstemp(suffix='.part', dir=directory)
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(state, f, separators=(',', ':'))
+                os.replace(temp_path, self.shared_path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+        except Exception as e:
+            logger.error(f"Could not share news snapshot: {e}")
+
+    def _load_shared(self):
+        """Publish the shared snapshot if the file changed; returns True if one was loaded"""
+        try:
+            mtime = os.stat(self.shared_path).st_mtime_ns
+            if mtime == self._shared_mtime:
+                return False
+            with open(self.shared_path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read shared news snapshot: {e}")
+            return False
+
+        self._shared_mtime = mtime
+        self._shared_details = state.get('details') or {}
+        if state['generation'] == self._snapshot.generation and state['built_at'] == self._snapshot.built_at:
+            return True
+        articles = tuple(state['articles'])
+        snapshot = NewsSnapshot(state['generation'], state['built_at'], state['timestamp'],
+                                articles, self.build_index(articles))
+        self._publish(snapshot)
+        return True
+
+    def _try_lead(self):
+        """Take the host-wide refresher lock if no other process holds it"""
+        if self.leader:
+            return True
+        lock_file = open(self.lock_path, 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        self.leader = True
+        return True
+
+    def trigger(self):
+        """Ask the background thread to refresh early (e.g. once models finish loading)"""
+        self._wake.set()
+
+    def wait_ready(self, timeout=None):
+        """Block until the first snapshot has been published"""
+        return self._ready.wait(timeout)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='news-refresher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _wait_seconds(self):
+        if not self.next_refresh:
+            return self.interval
+        try:
+            return min(self.interval, max(MIN_WAIT, self.next_refresh()))
+        except Exception as e:
+            logger.error(f"Could not compute next refresh time: {e}")
+            return self.interval
+
+    def _run(self):
+        if self.lock_path:
+            self._follow()
+        while not self._stop.is_set():
+            self.refresh_now()
+            self._wake.wait(self._wait_seconds())
+            self._wake.clear()
+
+    def _follow(self):
+        """Serve the leader's shared snapshots until this process wins the lock"""
+        if self.shared_path:
+            # Start from the last shared snapshot, so generations keep counting across restarts
+            self._load_shared()
+        while not self._stop.is_set():
+            if self._try_lead():
+                logger.info("News refresher: this worker refreshes the news for the host")
+                return
+            self._load_shared()
+            self._stop.wait(FOLLOW_INTERVAL)
@@ -5,7 +5,9 @@ Startup script with environment detection
 """
 
 import os
+import subprocess
 import sys
+import metrics
 from app import app, logger
 
 def main():
@@ -29,13 +31,24 @@ def main():
         logger.error("Python 3.8 or higher is required!")
         sys.exit(1)
     
+    # Counters left by the processes of a previous run would add into this one's
+    metrics.REGISTRY.clear()
+    
     # Production vs Development
     if env == 'production':
         logger.info("Starting in PRODUCTION mode...")
         try:
             import gunicorn
-            # Use Gunicorn for production
-            os.system(f"gunicorn -w 4 -b {app.config['HOST']}:{app.config['PORT']} app:app")
+            # One model server per host; the gunicorn workers stay light and talk to it
+            os.environ['MODEL_SERVER_ENABLED'] = 'True'
+            model_server = subprocess.Popen([sys.executable, 'model_server.py'])
+            logger.info(f"Started model server (pid {model_server.pid})")
+            try:
+                # Use Gunicorn for production; gevent workers hold /api/stream clients as greenlets
+                os.system(f"gunicorn -w 4 -k gevent --worker-connections 1000 "
+                          f"-b {app.config['HOST']}:{app.config['PORT']} app:app")
+            finally:
+                model_server.terminate()
         except ImportError:
             logger.warning("Gunicorn not found, falling back to Flask dev server")
             app.run(
@@ -0,0 +1,189 @@
+"""
+NewsBreeze - Inference scheduler
+All model calls go through a few worker threads that always take the most urgent job first:
+interactive TTS, then background summarization, then prerendering. Each job class admits a
+bounded number of requests; beyond that new work is rejected straight away with a Retry-After
+estimate instead of piling up behind the model.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+
+from metrics import INFERENCE_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Highest priority first
+JOB_CLASSES = ('interactive', 'summarize', 'prerender')
+# Samples remembered per class for wait statistics and Retry-After
+HISTORY = 256
+MAX_RETRY_AFTER = 60
+
+
+class QueueFull(Exception):
+    """The job class has admitted as many requests as it may; retry_after is a suggested delay in seconds"""
+
+    def __init__(self, job_class, retry_after):
+        super().__init__(f"Inference queue '{job_class}' is full")
+        self.job_class = job_class
+        self.retry_after = retry_after
+
+
+class _Ticket:
+    """An admitted request; holds one of its job class's slots until released"""
+
+    def __init__(self, scheduler, job_class):
+        self.scheduler = scheduler
+        self.job_class = job_class
+        self.admitted_at = time.perf_counter()
+        self.released = False
+
+    def release(self):
+        """Give the slot back (safe to call more than once)"""
+        self.scheduler._release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+
+class _Job:
+    def __init__(self, job_class, fn, args, kwargs):
+        self.job_class = job_class
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.queued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        """Block until a worker has run the job; returns its result or raises its error"""
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class InferenceScheduler:
+    """Priority scheduler run by a fixed pool of worker threads, with admission control per job class.
+
+    A request is admitted once (admit()) and may then run any number of jobs (run()). Jobs
+    should be single model calls (one batch, one sentence), so an urgent job never waits
+    behind more than one unit of background work.
+    """
+
+    def __init__(self, workers=1, queue_limits=None):
+        self.workers = max(1, workers)
+        self.limits = {job_class: 16 for job_class in JOB_CLASSES}
+        self.limits.update(queue_limits or {})
+        self._queues = {job_class: deque() for job_class in JOB_CLASSES}
+        self._admitted = {job_class: 0 for job_class in JOB_CLASSES}
+        self._running = {job_class: 0 for job_class in JOB_CLASSES}
+        self._counts = {job_class: {'completed': 0, 'failed': 0, 'rejected': 0} for job_class in JOB_CLASSES}
+        self._waits = {job_class: deque(maxlen=HISTORY) for job_class in JOB_CLASSES}
+        self._holds = {job_class: deque(maxlen=HISTORY) for job_class in JOB_CLASSES}
+        self._changed = threading.Condition()
+        self._started = False
+
+    def start(self):
+        with self._changed:
+            if self._started:
+                return
+            self._started = True
+        for i in range(self.workers):
+            threading.Thread(target=self._work, name=f'inference-{i}', daemon=True).start()
+        logger.info(f"Inference scheduler started with {self.workers} worker(s), "
+                    f"admission limits {self.limits}")
+
+    def _retry_after(self, job_class):
+        """Seconds until an admitted request of this class has likely finished and freed its slot"""
+        holds = self._holds[job_class]
+        average = sum(holds) / len(holds) if holds else 1.0
+        return min(MAX_RETRY_AFTER, max(1, math.ceil(average / max(1, self._admitted[job_class]))))
+
+    def admit(self, job_class, block=False):
+        """Take a slot for one request; returns a ticket to release (or use with `with`).
+
+        When the class is at its limit this raises QueueFull, or with block=True
+        (background callers) waits for a slot instead.
+        """
+        with self._changed:
+            while self._admitted[job_class] >= self.limits[job_class]:
+                if not block:
+                    self._counts[job_class]['rejected'] += 1
+                    raise QueueFull(job_class, self._retry_after(job_class))
+                self._changed.wait()
+            self._admitted[job_class] += 1
+        return _Ticket(self, job_class)
+
+    def _release(self, ticket):
+        with self._changed:
+            if ticket.released:
+                return
+            ticket.released = True
+            self._admitted[ticket.job_class] -= 1
+            self._holds[ticket.job_class].append(time.perf_counter() - ticket.admitted_at)
+            self._changed.notify_all()
+
+    def run(self, job_class, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs) behind more urgent classes and wait for its result"""
+        self.start()
+        job = _Job(job_class, fn, args, kwargs)
+        with self._changed:
+            self._queues[job_class].append(job)
+            self._changed.notify_all()
+        return job.wait()
+
+    def _next_job(self):
+        with self._changed:
+            while True:
+                for job_class in JOB_CLASSES:
+                    if self._queues[job_class]:
+                        job = self._queues[job_class].popleft()
+                        self._running[job_class] += 1
+                        return job
+                self._changed.wait()
+
+    def _work(self):
+        while True:
+            job = self._next_job()
+            started = time.perf_counter()
+            waited = started - job.queued_at
+            INFERENCE_WAIT_SECONDS.observe(waited, job.job_class)
+            try:
+                job.result = job.fn(*job.args, **job.kwargs)
+            except Exception as e:
+                job.error = e
+
+            with self._changed:
+                self._running[job.job_class] -= 1
+                self._counts[job.job_class]['failed' if job.error is not None else 'completed'] += 1
+                self._waits[job.job_class].append(waited)
+            job.done.set()
+
+    def stats(self):
+        now = time.perf_counter()
+        with self._changed:
+            queues = {}
+            for job_class in JOB_CLASSES:
+                waits = sorted(self._waits[job_class])
+                queue = self._queues[job_class]
+                queues[job_class] = {
+                    'admitted': self._admitted[job_class],
+                    'limit': self.limits[job_class],
+                    'depth': len(queue),
+                    'running': self._running[job_class],
+                    **self._counts[job_class],
+                    'wait_ms_mean': round(sum(waits) / len(waits) * 1000, 1) if waits else None,
+                    'wait_ms_p95': round(waits[max(0, math.ceil(0.95 * len(waits)) - 1)] * 1000, 1) if waits else None,
+                    'oldest_wait_ms': round((now - queue[0].queued_at) * 1000, 1) if queue else None
+                }
+            return {'workers': self.workers, 'queues': queues}
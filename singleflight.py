@@ -0,0 +1,160 @@
+"""
+NewsBreeze - Single-flight request deduplication
+Concurrent callers asking for the same key share one in-flight computation (or stream)
+"""
+
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self, timeout=None):
+        """Wait for the leader and return its result (or raise its error)"""
+        if not self.done.wait(timeout):
+            raise TimeoutError('Timed out waiting for in-flight result')
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """Deduplicate concurrent work by key; followers wait on the leader's result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def begin(self, key):
+        """Return (call, is_leader); the leader must call finish() exactly once"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = _Call()
+            return call, True
+
+    def finish(self, key, result=None, error=None):
+        with self._lock:
+            call = self._calls.pop(key)
+        call.result = result
+        call.error = error
+        call.done.set()
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn once for all concurrent callers with the same key"""
+        call, leader = self.begin(key)
+        if not leader:
+            return call.wait()
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.finish(key, error=e)
+            raise
+        self.finish(key, result=result)
+        return result
+
+    def get(self, key):
+        """The in-flight call for key, or None"""
+        with self._lock:
+            return self._calls.get(key)
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+class _Broadcast:
+    """Chunks of one in-flight stream; every reader gets them all, from the first"""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self._changed = threading.Condition()
+
+    def append(self, chunk):
+        with self._changed:
+            self.chunks.append(chunk)
+            self._changed.notify_all()
+
+    def close(self, error=None):
+        with self._changed:
+            self.done = True
+            self.error = error
+            self._changed.notify_all()
+
+    def __iter__(self):
+        position = 0
+        while True:
+            with self._changed:
+                while position == len(self.chunks) and not self.done:
+                    self._changed.wait()
+                chunks = self.chunks[position:]
+                done, error = self.done, self.error
+            if not chunks and done:
+                if error is not None:
+                    raise error
+                return
+            position += len(chunks)
+            yield from chunks
+
+
+class StreamFlight:
+    """Single-flight for streamed output: the first caller's chunks are teed to every concurrent caller.
+
+    The leader's generator runs on its own thread, so it finishes (and e.g. completes a
+    cache file) even when the client that started it disconnects.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._streams = {}
+
+    def open(self, key, start):
+        """Return (chunk iterator, is_leader); only the leader calls start() -> iterable of chunks.
+
+        An exception from start() (e.g. admission refused) propagates to the leader and
+        to any followers that joined in the meantime.
+        """
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is not None:
+                return iter(stream), False
+            stream = self._streams[key] = _Broadcast()
+
+        try:
+            chunks = start()
+        except Exception as e:
+            self._finish(key, stream, e)
+            raise
+        threading.Thread(target=self._pump, args=(key, stream, chunks), name='stream-flight', daemon=True).start()
+        return iter(stream), True
+
+    def follow(self, key):
+        """Chunk iterator of the in-flight stream for key, or None"""
+        with self._lock:
+            stream = self._streams.get(key)
+        return iter(stream) if stream is not None else None
+
+    def _pump(self, key, stream, chunks):
+        error = None
+        try:
+            for chunk in chunks:
+                stream.append(chunk)
+        except Exception as e:
+            error = e
+        self._finish(key, stream, error)
+
+    def _finish(self, key, stream, error=None):
+        with self._lock:
+            self._streams.pop(key, None)
+        stream.close(error)
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._streams)
@@ -0,0 +1,191 @@
+"""
+NewsBreeze - Batched summarization
+Runs the Hugging Face summarization pipeline over many texts with minimal padding,
+splitting long texts into model-sized windows and merging them map-reduce style
+"""
+
+import logging
+import re
+
+from bs4 import BeautifulSoup
+
+from audio_stream import split_sentences
+from metrics import SUMMARIZE_BATCH_SIZE, SUMMARIZE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Room left in each window for special tokens and task prefixes added by the pipeline
+WINDOW_MARGIN = 16
+# Bound on reduce rounds; each round shrinks the text to about max_length per window
+MAX_REDUCE_DEPTH = 3
+WHITESPACE = re.compile(r'\s+')
+
+
+def strip_html(text):
+    """Plain text of an RSS summary; markup only wastes model tokens"""
+    if '<' in text or '&' in text:
+        text = BeautifulSoup(text, 'html.parser').get_text(' ')
+    return WHITESPACE.sub(' ', text).strip()
+
+
+def count_tokens(tokenizer, texts, **kwargs):
+    """Token count per text from a Hugging Face tokenizer (kwargs as for the tokenizer call)"""
+    return [len(ids) for ids in tokenizer(list(texts), **kwargs)['input_ids']]
+
+
+def max_input_tokens(tokenizer):
+    """The tokenizer's input limit, None if it has none"""
+    model_max = getattr(tokenizer, 'model_max_length', None)
+    # Tokenizers without a limit report a huge sentinel
+    return model_max if model_max and model_max < 1_000_000 else None
+
+
+class BatchSummarizer:
+    """Wrap a summarization pipeline to summarize lists of texts in length-sorted batches"""
+
+    def __init__(self, summarizer, batch_size=8, chunk_tokens=0, schedule=None):
+        self.summarizer = summarizer
+        self.batch_size = max(1, batch_size)
+        # schedule(fn, *args) runs each model call, e.g. on the inference scheduler
+        self.schedule = schedule
+        self.window = self._window(chunk_tokens) if chunk_tokens else 0
+
+    def _window(self, chunk_tokens):
+        """Tokens per chunk: the configured size, capped by the model's input limit"""
+        # The model server proxy reports the limit of the pipeline it stands in for
+        model_max = (getattr(self.summarizer, 'model_max_length', None)
+                     or max_input_tokens(getattr(self.summarizer, 'tokenizer', None)))
+        if model_max:
+            chunk_tokens = min(chunk_tokens, model_max)
+        return max(1, chunk_tokens - WINDOW_MARGIN)
+
+    def _count_tokens(self, texts, **kwargs):
+        """Token counts from the pipeline's tokenizer, wherever it runs; None without one"""
+        if hasattr(self.summarizer, 'count_tokens'):
+            return self.summarizer.count_tokens(list(texts), **kwargs)
+        tokenizer = getattr(self.summarizer, 'tokenizer', None)
+        return count_tokens(tokenizer, texts, **kwargs) if tokenizer is not None else None
+
+    def token_lengths(self, texts):
+        """Token count per text, falling back to word counts without a tokenizer"""
+        try:
+            lengths = self._count_tokens(texts, truncation=True)
+        except Exception as e:
+            logger.warning(f"Tokenizer length pass failed, using word counts: {e}")
+            lengths = None
+        return lengths or [len(text.split()) for text in texts]
+
+    def sentence_lengths(self, sentences):
+        """Untruncated token count per sentence, in one tokenizer call"""
+        try:
+            lengths = self._count_tokens(sentences, add_special_tokens=False)
+        except Exception as e:
+            logger.warning(f"Tokenizer length pass failed, estimating from words: {e}")
+            lengths = None
+        # Subword tokenizers average a little over one token per English word
+        return lengths or [len(sentence.split()) * 4 // 3 + 1 for sentence in sentences]
+
+    def chunk(self, texts):
+        """Split each text on sentence boundaries into windows; returns [[(chunk, tokens), ...], ...]"""
+        split = [split_sentences(text) or [text] for text in texts]
+        lengths = iter(self.sentence_lengths([sentence for sentences in split for sentence in sentences]))
+
+        chunked = []
+        for sentences in split:
+            chunks = []
+            current, current_tokens = [], 0
+            for sentence in sentences:
+                tokens = next(lengths)
+                if current and current_tokens + tokens > self.window:
+                    chunks.append((' '.join(current), current_tokens))
+                    current, current_tokens = [], 0
+                if tokens > self.window:
+                    # A single over-long sentence is cut into word runs of about one window
+                    words = sentence.split()
+                    step = max(1, len(words) * self.window // tokens)
+                    for start in range(0, len(words), step):
+                        piece = words[start:start + step]
+                        chunks.append((' '.join(piece), tokens * len(piece) // len(words)))
+                    continue
+                current.append(sentence)
+                current_tokens += tokens
+            if current:
+                chunks.append((' '.join(current), current_tokens))
+            chunked.append(chunks)
+        return chunked
+
+    def _run(self, texts, max_length, min_length):
+        if self.schedule:
+            return self.schedule(self._call_model, texts, max_length, min_length)
+        return self._call_model(texts, max_length, min_length)
+
+    def _call_model(self, texts, max_length, min_length):
+        SUMMARIZE_BATCH_SIZE.observe(len(texts))
+        with SUMMARIZE_SECONDS.time():
+            outputs = self.summarizer(
+                list(texts),
+                max_length=max_length,
+                min_length=min_length,
+                do_sample=False,
+                truncation=True,
+                batch_size=len(texts)
+            )
+        return [output['summary_text'] for output in outputs]
+
+    def summarize(self, texts, max_length, min_length, depth=0):
+        """Summarize texts; returns results in input order, None where an item failed"""
+        if not self.window or depth >= MAX_REDUCE_DEPTH or not texts:
+            return self._summarize_batches(texts, max_length, min_length)
+
+        # Map: every window of every text goes through one batched pass
+        chunked = self.chunk(texts)
+        windows = [chunk for chunks in chunked for chunk in chunks]
+        partials = iter(self._summarize_batches([text for text, _ in windows], max_length, min_length,
+                                                [tokens for _, tokens in windows]))
+
+        results = [None] * len(texts)
+        merged, merged_positions = [], []
+        for i, chunks in enumerate(chunked):
+            summaries = [next(partials) for _ in chunks]
+            if len(chunks) == 1:
+                results[i] = summaries[0]
+                continue
+            summaries = [summary for summary in summaries if summary]
+            if summaries:
+                merged.append(' '.join(summaries))
+                merged_positions.append(i)
+
+        # Reduce: summarize the joined window summaries (chunking again if still too long)
+        if merged:
+            for i, summary in zip(merged_positions, self.summarize(merged, max_length, min_length, depth + 1)):
+                results[i] = summary
+        return results
+
+    def _summarize_batches(self, texts, max_length, min_length, lengths=None):
+        results = [None] * len(texts)
+        if not texts:
+            return results
+
+        # Neighbouring texts of similar length share a batch, so little padding is wasted
+        lengths = lengths or self.token_lengths(texts)
+        order = sorted(range(len(texts)), key=lengths.__getitem__)
+
+        for start in range(0, len(order), self.batch_size):
+            indices = order[start:start + self.batch_size]
+            batch = [texts[i] for i in indices]
+            try:
+                summaries = self._run(batch, max_length, min_length)
+            except Exception as e:
+                logger.error(f"Batch summarization failed, retrying {len(batch)} items one by one: {e}")
+                summaries = []
+                for text in batch:
+                    try:
+                        summaries.extend(self._run([text], max_length, min_length))
+                    except Exception as item_error:
+                        logger.error(f"Error in summarization: {item_error}")
+                        summaries.append(None)
+
+            for i, summary in zip(indices, summaries):
+                results[i] = summary
+
+        return results
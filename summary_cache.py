@@ -0,0 +1,125 @@
+"""
+NewsBreeze - Persistent summary cache
+Content-addressed SQLite store so repeated articles never hit the summarizer twice
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+
+from pools import SQLiteConnections
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS summaries_last_access ON summaries(last_access);
+"""
+
+# Skip rewriting last_access on hits more often than this (seconds)
+TOUCH_GRANULARITY = 60
+# Run eviction every this many inserts
+EVICT_EVERY = 64
+
+
+def summary_key(text, model, min_length, max_length, chunk_tokens=0):
+    """Hash of everything that determines the summarizer output"""
+    payload = '\x1f'.join([model, str(min_length), str(max_length), str(chunk_tokens), text])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SummaryCache:
+    """SQLite (WAL) summary cache with TTL + LRU eviction, shared by all workers on a host"""
+
+    def __init__(self, path, max_entries=5000, ttl_hours=168):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl_hours * 3600
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._stats_lock = threading.Lock()
+        self._db = SQLiteConnections(path, SCHEMA)
+
+    def get(self, key):
+        """Return the cached summary or None, counting the hit or miss"""
+        now = time.time()
+        try:
+            row = self._db.connection().execute(
+                'SELECT summary, created_at, last_access FROM summaries WHERE key = ?', (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Summary cache read failed: {e}")
+            row = None
+
+        if row is None or now - row[1] > self.ttl:
+            with self._stats_lock:
+                self.misses += 1
+            return None
+
+        if now - row[2] > TOUCH_GRANULARITY:
+            try:
+                self._db.connection().execute('UPDATE summaries SET last_access = ? WHERE key = ?', (now, key))
+            except sqlite3.Error as e:
+                logger.warning(f"Summary cache touch failed: {e}")
+
+        with self._stats_lock:
+            self.hits += 1
+        return row[0]
+
+    def put(self, key, model, summary):
+        now = time.time()
+        try:
+            self._db.connection().execute(
+                'INSERT OR REPLACE INTO summaries (key, model, summary, created_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, model, summary, now, now)
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Summary cache write failed: {e}")
+            return
+
+        with self._stats_lock:
+            self._puts += 1
+            evict = self._puts % EVICT_EVERY == 0
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used beyond max_entries"""
+        try:
+            conn = self._db.connection()
+            expired = conn.execute('DELETE FROM summaries WHERE created_at < ?',
+                                   (time.time() - self.ttl,)).rowcount
+            overflow = conn.execute(
+                'DELETE FROM summaries WHERE key IN ('
+                '  SELECT key FROM summaries ORDER BY last_access DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            ).rowcount
+            if expired or overflow:
+                logger.info(f"Summary cache evicted {expired} expired and {overflow} LRU entries")
+        except sqlite3.Error as e:
+            logger.error(f"Summary cache eviction failed: {e}")
+
+    def stats(self):
+        try:
+            entries = self._db.connection().execute('SELECT COUNT(*) FROM summaries').fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'entries': entries,
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / lookups, 3) if lookups else None
+        }
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze Deduplication Tests
+Checks that story clustering works for non-Latin scripts (run with pytest or directly)
+"""
+
+from dedup import cluster_articles, minhash, similarity
+
+
+def article(link, title, summary, source='Feed'):
+    return {'link': link, 'title': title, 'summary': summary, 'source': source}
+
+
+UNRELATED = [
+    article('https://example.jp/a', '東京都が新しい交通計画を発表', '都内のバス路線を再編し、運賃制度を見直す方針を示した。'),
+    article('https://example.cn/b', '央行宣布下调存款准备金率', '中国人民银行表示，此举将释放长期资金约一万亿元。'),
+    article('https://example.ru/c', 'Шторм обрушился на побережье', 'Спасатели эвакуировали жителей прибрежных районов после наводнения.'),
+    article('https://example.kr/d', '서울시 새 교통 계획 발표', '버스 노선을 개편하고 요금 체계를 바꾸기로 했다.'),
+]
+
+
+def test_unrelated_non_latin_stories_stay_apart():
+    merged = cluster_articles(UNRELATED)
+    assert len(merged) == len(UNRELATED)
+
+
+def test_same_non_latin_story_merges():
+    summary = '中国人民银行表示，此举将释放长期资金约一万亿元，以支持实体经济发展。'
+    merged = cluster_articles([
+        article('https://example.cn/b', '央行宣布下调存款准备金率', summary, source='Feed A'),
+        article('https://other.cn/x', '央行宣布下调存款准备金率', summary + '记者报道。', source='Feed B'),
+    ])
+    assert len(merged) == 1
+    assert {source['source'] for source in merged[0]['sources']} == {'Feed A', 'Feed B'}
+
+
+def test_text_without_tokens_never_matches():
+    assert minhash('<p> … — !!! </p>') is None
+    assert similarity(None, None) == 0.0
+    merged = cluster_articles([
+        article('https://example.com/1', '…', '—'),
+        article('https://example.com/2', '!!!', '???'),
+    ])
+    assert len(merged) == 2
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"   ✅ {name}")
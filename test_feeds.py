@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze Feed Fetching Tests
+Checks concurrent fetching, conditional GETs and isolation of slow or failing feeds
+against the local stub RSS server (run with pytest or directly)
+"""
+
+import time
+
+from benchmarks.stub_feed_server import StubFeedServer
+from feeds import FeedFetcher
+
+DELAY = 0.5
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def test_feeds_are_fetched_concurrently():
+    names = ['alpha', 'beta', 'gamma', 'delta']
+    with StubFeedServer(feeds=names, delays={name: DELAY for name in names}, items=5) as stub:
+        fetcher = FeedFetcher(max_workers=len(names))
+        try:
+            results, elapsed = timed(fetcher.fetch_all, stub.feed_urls())
+        finally:
+            fetcher.close()
+
+    assert [url for url, _ in results] == stub.feed_urls()
+    assert all(len(feed.entries) == 5 for _, feed in results)
+    # Sequential fetching would take len(names) * DELAY
+    assert elapsed < 2 * DELAY
+
+
+def test_not_modified_reuses_cached_parse():
+    with StubFeedServer(feeds=['alpha'], items=5) as stub:
+        url = stub.feed_urls()[0]
+        fetcher = FeedFetcher()
+        try:
+            first = fetcher.fetch_feed(url)
+            second = fetcher.fetch_feed(url)
+            assert stub.not_modified_served == 1
+            assert second is first
+
+            stub.update_feed('alpha', generation=1, items=5)
+            third = fetcher.fetch_feed(url)
+        finally:
+            fetcher.close()
+
+    assert stub.not_modified_served == 1
+    assert third is not first
+    assert third.entries[0].link.endswith('story-1-0')
+
+
+def test_slow_feed_does_not_hold_up_the_others():
+    with StubFeedServer(feeds=['alpha', 'beta', 'slow'], delays={'slow': 3}, items=5) as stub:
+        fetcher = FeedFetcher(timeout=DELAY, max_workers=3)
+        try:
+            results, elapsed = timed(fetcher.fetch_all, stub.feed_urls())
+        finally:
+            fetcher.close()
+
+    feeds = dict(zip(['alpha', 'beta', 'slow'], (feed for _, feed in results)))
+    assert feeds['slow'] is None
+    assert len(feeds['alpha'].entries) == len(feeds['beta'].entries) == 5
+    # Bounded by the timeout of the slow feed, not its delay
+    assert elapsed < 2 * DELAY + 1
+
+
+def test_failing_feed_does_not_hold_up_the_others():
+    with StubFeedServer(feeds=['alpha', 'beta'], items=5) as stub:
+        urls = stub.feed_urls() + [f"{stub.base_url}/feeds/missing.xml"]
+        fetcher = FeedFetcher()
+        try:
+            results = fetcher.fetch_all(urls)
+        finally:
+            fetcher.close()
+
+    assert [feed is None for _, feed in results] == [False, False, True]
+    assert all(len(feed.entries) == 5 for _, feed in results[:2])
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"   ✅ {name}")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze Metrics Tests
+Checks that host-wide metrics add up the per-process files without counting work twice
+(run with pytest or directly; starts a model server with fake models)
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import metrics
+from audio_stream import synthesize_pcm
+from config import config
+from model_server import ModelClient, RemoteTTS
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def start_model_server(directory, socket_path):
+    env = dict(os.environ, FLASK_CONFIG='production', MODEL_SERVER_SOCKET=socket_path,
+               METRICS_ENABLED='True', METRICS_DIR=directory, METRICS_FLUSH_INTERVAL='1')
+    return subprocess.Popen([sys.executable, os.path.join(ROOT, 'benchmarks', 'smoke_production.py'), '--model-server'],
+                            cwd=directory, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_for_tts(client, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if client.status()['tts']:
+                return
+        except (EOFError, OSError):
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Model server did not load TTS in time")
+
+
+def histogram_count(totals, name, label_values):
+    series = totals.get(name, {}).get(label_values)
+    return sum(series[:-1]) if series else 0
+
+
+def test_remote_synthesis_counted_once_across_processes():
+    with tempfile.TemporaryDirectory(prefix='newsbreeze-metrics-') as directory:
+        socket_path = os.path.join(directory, 'models.sock')
+        server = start_model_server(directory, socket_path)
+        metrics.REGISTRY.configure(True, directory, flush_interval=1)
+        try:
+            client = ModelClient(socket_path, config['production'].SECRET_KEY.encode())
+            wait_for_tts(client)
+            synthesize_pcm(RemoteTTS(client), 'Hello there.', 'default')
+
+            # The server writes its file every second; this process writes on collect()
+            time.sleep(2)
+            totals = metrics.REGISTRY.collect()
+            files = [name for name in os.listdir(directory) if name.startswith('metrics-')]
+            assert len(files) == 2
+            assert histogram_count(totals, 'newsbreeze_tts_seconds', ('default',)) == 1
+            assert histogram_count(totals, 'newsbreeze_tts_seconds_per_char', ('default',)) == 1
+        finally:
+            metrics.REGISTRY.configure(False)
+            server.terminate()
+            server.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"   ✅ {name}")
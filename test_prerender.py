@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze Prerender Tests
+Checks that voice demand and interactive renders are seen by every worker sharing the
+prerender state file (run with pytest or directly)
+"""
+
+import os
+import subprocess
+import tempfile
+
+from prerender import PrerenderQueue
+
+
+def worker_queue(directory, top_voices=2):
+    """A queue as one gunicorn worker would build it; workers share the lock and state paths"""
+    return PrerenderQueue(render=lambda text, voice: None, is_cached=lambda text, voice: False,
+                          lock_path=os.path.join(directory, 'prerender.lock'),
+                          state_path=os.path.join(directory, 'prerender.sqlite3'),
+                          top_voices=top_voices)
+
+
+def test_voice_requests_are_counted_across_workers():
+    with tempfile.TemporaryDirectory() as directory:
+        first, second = worker_queue(directory), worker_queue(directory)
+        assert first.popular_voices() == ['default']
+
+        for _ in range(3):
+            first.record_request('celebrity2')
+        second.record_request('celebrity1')
+        second.record_request('celebrity2')
+
+        assert second.popular_voices() == ['celebrity2', 'celebrity1']
+        assert first.status()['voices'] == ['celebrity2', 'celebrity1']
+
+
+def test_interactive_renders_are_seen_across_workers():
+    with tempfile.TemporaryDirectory() as directory:
+        owner, other = worker_queue(directory), worker_queue(directory)
+        assert owner.interactive_count() == 0
+        with other.interactive():
+            with other.interactive():
+                assert owner.interactive_count() == 2
+            assert owner.interactive_count() == 1
+        assert owner.interactive_count() == 0
+
+
+def test_renders_of_dead_workers_are_forgotten():
+    with tempfile.TemporaryDirectory() as directory:
+        queue = worker_queue(directory)
+        child = subprocess.Popen(['true'])
+        child.wait()
+        queue._db.connection().execute('INSERT INTO interactive (pid, active) VALUES (?, 1)', (child.pid,))
+
+        assert queue.interactive_count() == 0
+        assert queue._db.connection().execute('SELECT COUNT(*) FROM interactive').fetchone()[0] == 0
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"   ✅ {name}")
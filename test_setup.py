@@ -143,6 +143,12 @@ def run_basic_import_test():
         test_app = Flask(__name__)
         print("   ✅ Flask app creation OK")
         
+        # The app defers model imports, so this should take well under a second
+        import time
+        start = time.perf_counter()
+        import app
+        print(f"   ✅ App import OK ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        
         return True
     except Exception as e:
         print(f"   ❌ Import test failed: {e}")
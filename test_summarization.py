@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+NewsBreeze Summarization Tests
+Checks that chunking follows the model's tokenizer whether the pipeline is local or behind
+the model server (run with pytest or directly)
+"""
+
+from model_server import RemoteSummarizer
+from summarization import BatchSummarizer, count_tokens
+
+
+class WordPieceTokenizer:
+    """Two tokens per word plus two special tokens, so counts differ from the word estimate"""
+
+    model_max_length = 64
+
+    def __call__(self, texts, truncation=False, add_special_tokens=True):
+        input_ids = []
+        for text in texts:
+            ids = [0] * (2 * len(text.split())) + ([1, 2] if add_special_tokens else [])
+            input_ids.append(ids[:self.model_max_length] if truncation else ids)
+        return {'input_ids': input_ids}
+
+
+class Pipeline:
+    def __init__(self):
+        self.tokenizer = WordPieceTokenizer()
+
+    def __call__(self, texts, **kwargs):
+        return [{'summary_text': text.split('.')[0] + '.'} for text in texts]
+
+
+class ModelServerClient:
+    """Answers RemoteSummarizer calls the way the model server does, from its own pipeline"""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.ops = []
+
+    def call(self, op, texts, **kwargs):
+        self.ops.append(op)
+        if op == 'count_tokens':
+            return count_tokens(self.pipeline.tokenizer, texts, **kwargs)
+        return self.pipeline(texts, **kwargs)
+
+
+SENTENCE = 'The council approved the new transit plan after a long debate.'
+ARTICLE = ' '.join([SENTENCE] * 12)
+
+
+def remote_summarizer():
+    pipeline = Pipeline()
+    client = ModelServerClient(pipeline)
+    return RemoteSummarizer(client, pipeline.tokenizer.model_max_length), client
+
+
+def test_window_is_capped_by_the_model_limit():
+    local = BatchSummarizer(Pipeline(), chunk_tokens=1024)
+    remote = BatchSummarizer(remote_summarizer()[0], chunk_tokens=1024)
+    assert local.window == remote.window < WordPieceTokenizer.model_max_length
+
+
+def test_remote_chunking_uses_server_token_counts():
+    local = BatchSummarizer(Pipeline(), chunk_tokens=1024)
+    summarizer, client = remote_summarizer()
+    remote = BatchSummarizer(summarizer, chunk_tokens=1024)
+
+    chunks = remote.chunk([ARTICLE])
+    assert 'count_tokens' in client.ops
+    assert chunks == local.chunk([ARTICLE])
+    assert len(chunks[0]) > 1
+    assert all(tokens <= remote.window for _, tokens in chunks[0])
+    assert remote.token_lengths([SENTENCE]) == local.token_lengths([SENTENCE]) == [24]
+
+
+def test_remote_summaries_of_long_texts_are_reduced():
+    summarizer, client = remote_summarizer()
+    remote = BatchSummarizer(summarizer, chunk_tokens=1024)
+    assert remote.summarize([ARTICLE, SENTENCE], max_length=60, min_length=5) == [SENTENCE, SENTENCE]
+    assert client.ops[0] == 'count_tokens'
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"   ✅ {name}")
@@ -0,0 +1,117 @@
+"""
+NewsBreeze - Voice styles
+Speaker conditioning for each configured voice, computed once from its reference clip,
+persisted to disk and reused for every synthesis
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VOICE = 'default'
+
+
+def clip_digest(path, model_name):
+    """Identifies a conditioning result: the model plus the exact reference audio"""
+    digest = hashlib.sha1(model_name.encode('utf-8'))
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+class VoiceBank:
+    """Per-voice speaker latents for XTTS; other multi-speaker models get the clip or speaker name per call"""
+
+    def __init__(self, tts_model, model_name, voices, cache_dir, language='en'):
+        self.tts_model = tts_model
+        self.model_name = model_name
+        self.voices = voices
+        self.cache_dir = cache_dir
+        self.language = language
+        self.latents = {}  # voice -> tuple returned by get_conditioning_latents
+        self.references = {}  # voice -> clip path, for models without reusable latents
+        self.speakers = {}  # voice -> built-in speaker name of a multi-speaker model
+        self.loaded_from_disk = 0
+
+        # XTTS exposes conditioning and inference on the underlying model
+        xtts = getattr(getattr(tts_model, 'synthesizer', None), 'tts_model', None)
+        self.xtts = xtts if hasattr(xtts, 'get_conditioning_latents') and hasattr(xtts, 'inference') else None
+
+    def load(self):
+        """Compute or load conditioning for every voice that has a reference clip"""
+        for voice, spec in self.voices.items():
+            reference = spec.get('reference')
+            if not reference:
+                if spec.get('speaker') and getattr(self.tts_model, 'is_multi_speaker', False):
+                    self.speakers[voice] = spec['speaker']
+                continue
+            if not os.path.isfile(reference):
+                logger.warning(f"Reference clip for voice '{voice}' not found: {reference}")
+                continue
+
+            if self.xtts is None:
+                if getattr(self.tts_model, 'is_multi_speaker', False):
+                    self.references[voice] = reference
+                continue
+
+            try:
+                self.latents[voice] = self._load_or_compute(voice, reference)
+            except Exception as e:
+                logger.error(f"Could not condition voice '{voice}': {e}")
+
+        logger.info(f"Voices ready: {len(self.latents)} conditioned ({self.loaded_from_disk} from disk), "
+                    f"{len(self.references)} by reference clip")
+        return self
+
+    def _load_or_compute(self, voice, reference):
+        import torch
+
+        path = os.path.join(self.cache_dir, f"{voice}-{clip_digest(reference, self.model_name)}.pt")
+        if os.path.isfile(path):
+            try:
+                latents = torch.load(path, map_location='cpu')
+                self.loaded_from_disk += 1
+                return tuple(latents)
+            except Exception as e:
+                logger.warning(f"Discarding unreadable voice latents {path}: {e}")
+
+        logger.info(f"Computing speaker latents for voice '{voice}'...")
+        latents = tuple(self.xtts.get_conditioning_latents(audio_path=[reference]))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix='.part', dir=self.cache_dir)
+        os.close(fd)
+        try:
+            torch.save(latents, temp_path)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return latents
+
+    def synthesize(self, text, voice=None):
+        """Float samples for text in the given voice; voices without conditioning fall back to the default"""
+        if voice not in self.latents and voice not in self.references and voice not in self.speakers:
+            voice = DEFAULT_VOICE
+        latents = self.latents.get(voice)
+        if latents is not None:
+            return self.xtts.inference(text, self.language, *latents)['wav']
+        language = self.language if getattr(self.tts_model, 'is_multi_lingual', False) else None
+        if voice in self.references:
+            return self.tts_model.tts(text=text, speaker_wav=self.references[voice], language=language)
+        if voice in self.speakers:
+            return self.tts_model.tts(text=text, speaker=self.speakers[voice], language=language)
+        return self.tts_model.tts(text=text)
+
+    def status(self):
+        return {
+            'conditioned': sorted(self.latents),
+            'by_reference': sorted(self.references),
+            'built_in': sorted(self.speakers),
+            'loaded_from_disk': self.loaded_from_disk
+        }